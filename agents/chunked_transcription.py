@@ -0,0 +1,113 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Transcription of long recordings in parallel: the audio is split at quiet
+points into overlapping chunks (agents/audio_preprocessing.chunk_bounds),
+the chunks are transcribed concurrently on a bounded thread pool, and the
+texts are stitched back together with the words heard twice in each
+overlap removed.
+"""
+
+import re
+import math
+import time
+
+from agents.audio_preprocessing import chunk_bounds, encode
+
+# Speaking rate used to size the stitch window: each cut's overlap spans
+# 2 * overlap_seconds of audio, heard by both neighbouring chunks
+WORDS_PER_SECOND = 3
+MIN_OVERLAP_WORDS = 2
+# Clipped words at the very edge of a chunk that may not match the other side
+MAX_EDGE_WORDS = 1
+
+def _normalize(word):
+    return re.sub(r"[^\w']", "", word.lower())
+
+def overlap_words(overlap_seconds):
+    """The most words the two sides of one cut can share."""
+    return max(MIN_OVERLAP_WORDS, math.ceil(2 * overlap_seconds * WORDS_PER_SECOND) + 1)
+
+def _join(left, right, max_overlap, min_overlap):
+    """
+    Joins two word lists where a suffix of left equals a prefix of right,
+    allowing one clipped word at the end of left or the start of right.
+    Returns None when no such run of at least min_overlap words exists.
+    """
+    left_keys = [_normalize(word) for word in left]
+    right_keys = [_normalize(word) for word in right]
+    for length in range(min(max_overlap, len(left), len(right)), min_overlap - 1, -1):
+        for edge in range(MAX_EDGE_WORDS + 1):
+            for left_edge, right_edge in ((edge, 0), (0, edge)) if edge else ((0, 0),):
+                end = len(left) - left_edge
+                if end - length < 0 or right_edge + length > len(right):
+                    continue
+                if left_keys[end - length:end] == right_keys[right_edge:right_edge + length]:
+                    return left[:end] + right[right_edge + length:]
+    return None
+
+def stitch(texts, max_overlap=overlap_words(1.0), min_overlap=MIN_OVERLAP_WORDS):
+    """
+    Joins chunk transcripts in order. Only the last max_overlap words of
+    one transcript are compared with the first max_overlap words of the
+    next (without case or punctuation); when a suffix of the first equals
+    a prefix of the second, at least min_overlap words long, those words
+    are kept once. A phrase repeated elsewhere in the speech is never
+    matched. Transcripts that don't line up are joined unchanged.
+    """
+    words = []
+    for text in texts:
+        following = text.split()
+        joined = _join(words, following, max_overlap, min_overlap) if words else None
+        words = joined if joined is not None else words + following
+    return " ".join(words)
+
+class ChunkedTranscriber:
+    """
+    Transcribes mono samples chunk by chunk on an executor. transcribe_chunk
+    is called as transcribe_chunk(filename, audio_bytes) and returns the
+    text; the executor bounds how many chunks are in flight at once.
+    """
+    def __init__(self, transcribe_chunk, executor, chunk_seconds=60, overlap_seconds=1.0, audio_format="wav"):
+        self.transcribe_chunk = transcribe_chunk
+        self.executor = executor
+        self.chunk_seconds = chunk_seconds
+        self.overlap_seconds = overlap_seconds
+        self.audio_format = audio_format
+
+    def _run_chunk(self, index, samples, rate, start, end):
+        audio, audio_format = encode(samples[start:end], rate, self.audio_format)
+        started = time.perf_counter()
+        text = self.transcribe_chunk(f"chunk-{index}.{audio_format}", audio)
+        return {
+            "index": index,
+            "start_s": round(start / rate, 3),
+            "end_s": round(end / rate, 3),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 1),
+            "text": text
+        }
+
+    def transcribe(self, samples, rate):
+        """
+        Returns {"text", "chunks", "wall_ms", "serial_ms"}. chunks lists each
+        chunk's span and latency; serial_ms is the sum of the chunk
+        latencies, i.e. what transcribing them one after another would take.
+        Raises the first chunk error.
+        """
+        started = time.perf_counter()
+        bounds = chunk_bounds(samples, rate, self.chunk_seconds, self.overlap_seconds)
+        futures = [
+            self.executor.submit(self._run_chunk, index, samples, rate, start, end)
+            for index, (start, end) in enumerate(bounds)
+        ]
+        chunks = [future.result() for future in futures]
+        text = stitch([chunk["text"] for chunk in chunks], max_overlap=overlap_words(self.overlap_seconds))
+
+        return {
+            "text": text,
+            "chunks": [{key: value for key, value in chunk.items() if key != "text"} for chunk in chunks],
+            "wall_ms": round((time.perf_counter() - started) * 1000, 1),
+            "serial_ms": round(sum(chunk["latency_ms"] for chunk in chunks), 1)
+        }
@@ -7,13 +7,21 @@ class ContextManager:
     Manages the user's dynamic context, like energy and flow state.
     This is a simple in-memory simulation for the MVP.
     """
-    def __init__(self):
-        # Default state
-        self.context = {
-            "energy_level": 80,   # Example starting energy
-            "flow_state": "focused", # Can be 'focused', 'distracted', 'relaxed'
-            "focus_score": 90,    # Example focus
-        }
+    # Default state
+    DEFAULT_CONTEXT = {
+        "energy_level": 80,   # Example starting energy
+        "flow_state": "focused", # Can be 'focused', 'distracted', 'relaxed'
+        "focus_score": 90,    # Example focus
+    }
+
+    def __init__(self, context=None):
+        """
+        context: an existing dict to keep the state in (e.g. one held by the
+        session), so it survives the manager being rebuilt.
+        """
+        self.context = context if context is not None else {}
+        for key, value in self.DEFAULT_CONTEXT.items():
+            self.context.setdefault(key, value)
 
     def get_context(self):
         """
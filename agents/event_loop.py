@@ -0,0 +1,56 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import asyncio
+import threading
+
+_loop = None
+_thread = None
+_lock = threading.Lock()
+
+def get_loop():
+    """
+    Returns the process-wide event loop, starting its thread on first use.
+    The async Gemini and Firestore clients bind their gRPC channels to the
+    loop they first run on, so every coroutine must run on this one loop
+    instead of a fresh asyncio.run() per call.
+    """
+    global _loop, _thread
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            _thread = threading.Thread(target=_loop.run_forever, name="agents-event-loop", daemon=True)
+            _thread.start()
+        return _loop
+
+def run_sync(coro, timeout=None):
+    """
+    Runs a coroutine on the shared loop and blocks until it finishes.
+    Used by the synchronous wrappers around the async pipeline.
+    """
+    loop = get_loop()
+    if threading.current_thread() is _thread:
+        coro.close()
+        raise RuntimeError("run_sync() cannot be called from the event loop thread; await the coroutine instead.")
+    return asyncio.run_coroutine_threadsafe(coro, loop).result(timeout)
+
+async def _next_chunk(async_iterator):
+    return await async_iterator.__anext__()
+
+def iterate_sync(async_iterable):
+    """
+    Iterates an async generator on the shared loop from synchronous code,
+    one item at a time, e.g. to feed a streamed answer to Streamlit.
+    """
+    async_iterator = async_iterable.__aiter__()
+    try:
+        while True:
+            try:
+                yield run_sync(_next_chunk(async_iterator))
+            except StopAsyncIteration:
+                return
+    finally:
+        aclose = getattr(async_iterator, "aclose", None)
+        if aclose is not None:
+            run_sync(aclose())
@@ -0,0 +1,180 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import time
+
+from response_cache import ResponseCache
+
+def _model_name(model):
+    return getattr(model, "model_name", type(model).__name__)
+
+def _cache_key(model, agent_name, prompt, safety_settings):
+    # The system instruction is part of the rendered prompt the model sees
+    system_instruction = getattr(model, "_system_instruction", None)
+    rendered = f"{system_instruction}\n{prompt}" if system_instruction else prompt
+    return ResponseCache.make_key(agent_name, _model_name(model), rendered, safety_settings)
+
+def _token_count(response):
+    try:
+        return response.usage_metadata.total_token_count
+    except Exception as e:
+        return 0
+
+def _lookup(model, agent_name, prompt, safety_settings, response_cache, metadata):
+    """
+    Returns (key, cached_text). cached_text is None on a miss or when no
+    cache is configured.
+    """
+    metadata.update({"agent": agent_name, "cache_hit": False, "cache_tier": None})
+    if response_cache is None:
+        return None, None
+
+    key = _cache_key(model, agent_name, prompt, safety_settings)
+    entry, tier = response_cache.get(key)
+    if entry is None:
+        return key, None
+
+    metadata.update({
+        "cache_hit": True,
+        "cache_tier": tier,
+        "latency_ms": 0,
+        "saved_latency_ms": entry.get("latency_ms", 0),
+        "saved_tokens": entry.get("tokens", 0)
+    })
+    return key, entry["text"]
+
+def _store(key, agent_name, response, start, response_cache, metadata):
+    return _store_text(key, agent_name, response.text, _token_count(response), start, response_cache, metadata)
+
+def _store_text(key, agent_name, text, tokens, start, response_cache, metadata):
+    latency_ms = (time.perf_counter() - start) * 1000
+    metadata.update({"latency_ms": round(latency_ms, 1), "tokens": tokens})
+
+    if response_cache is not None:
+        response_cache.set(key, agent_name, text, latency_ms=latency_ms, tokens=tokens)
+    return text
+
+def generate_text(model, agent_name, prompt, safety_settings, response_cache=None, metadata=None):
+    """
+    Calls model.generate_content through the response cache and returns the
+    text. If a metadata dict is passed, it is filled with cache and latency
+    details for the caller to report.
+    """
+    metadata = {} if metadata is None else metadata
+    key, text = _lookup(model, agent_name, prompt, safety_settings, response_cache, metadata)
+    if text is not None:
+        return text
+
+    start = time.perf_counter()
+    response = model.generate_content(prompt, safety_settings=safety_settings)
+    return _store(key, agent_name, response, start, response_cache, metadata)
+
+async def generate_text_async(model, agent_name, prompt, safety_settings, response_cache=None, metadata=None):
+    """
+    Async variant of generate_text using model.generate_content_async.
+    """
+    metadata = {} if metadata is None else metadata
+    key, text = _lookup(model, agent_name, prompt, safety_settings, response_cache, metadata)
+    if text is not None:
+        return text
+
+    start = time.perf_counter()
+    response = await model.generate_content_async(prompt, safety_settings=safety_settings)
+    return _store(key, agent_name, response, start, response_cache, metadata)
+
+class StreamBlockedError(Exception):
+    """A streamed answer that was blocked or ended without any text."""
+
+# Finish reasons that mean the model stopped without a complete answer
+_BLOCKING_FINISH_REASONS = {"SAFETY", "RECITATION", "BLOCKLIST", "PROHIBITED_CONTENT", "SPII", "OTHER"}
+
+def _chunk_text(chunk):
+    # The closing chunk of a stream may carry only usage/finish data
+    try:
+        return chunk.text
+    except Exception as e:
+        return ""
+
+def _block_reason(chunk):
+    """Why the model blocked this chunk's prompt or answer, or None."""
+    try:
+        reason = getattr(getattr(chunk, "prompt_feedback", None), "block_reason", None)
+        if reason:
+            return getattr(reason, "name", str(reason))
+        for candidate in getattr(chunk, "candidates", None) or []:
+            finish_reason = getattr(candidate, "finish_reason", None)
+            name = getattr(finish_reason, "name", str(finish_reason))
+            if name in _BLOCKING_FINISH_REASONS:
+                return name
+    except Exception as e:
+        pass
+    return None
+
+class _StreamRecorder:
+    """
+    Collects the chunks of one streamed answer, records time-to-first-token
+    and, once the stream ends, caches the full text like generate_text does.
+    A blocked or empty stream is never cached; finish() raises
+    StreamBlockedError for it so the agent reports an error.
+    """
+    def __init__(self, key, agent_name, response_cache, metadata):
+        self.key = key
+        self.agent_name = agent_name
+        self.response_cache = response_cache
+        self.metadata = metadata
+        self.start = time.perf_counter()
+        self.parts = []
+        self.last_chunk = None
+        self.block_reason = None
+
+    def add(self, chunk):
+        self.last_chunk = chunk
+        self.block_reason = self.block_reason or _block_reason(chunk)
+        text = _chunk_text(chunk)
+        if text and not self.parts:
+            self.metadata["ttft_ms"] = round((time.perf_counter() - self.start) * 1000, 1)
+        if text:
+            self.parts.append(text)
+        return text
+
+    def finish(self):
+        if self.block_reason or not self.parts:
+            reason = self.block_reason or "no text returned"
+            self.metadata.update({"latency_ms": round((time.perf_counter() - self.start) * 1000, 1), "blocked": reason})
+            raise StreamBlockedError(f"The model returned no usable answer ({reason}).")
+        tokens = _token_count(self.last_chunk) if self.last_chunk is not None else 0
+        _store_text(self.key, self.agent_name, "".join(self.parts), tokens, self.start, self.response_cache, self.metadata)
+
+async def stream_text_async(model, agent_name, prompt, safety_settings, response_cache=None, metadata=None):
+    """
+    Streaming variant of generate_text_async: yields text chunks from
+    model.generate_content_async(..., stream=True) as they arrive. A cache
+    hit is yielded as a single chunk. metadata additionally gets ttft_ms.
+    """
+    metadata = {} if metadata is None else metadata
+    key, text = _lookup(model, agent_name, prompt, safety_settings, response_cache, metadata)
+    if text is not None:
+        metadata["ttft_ms"] = 0
+        yield text
+        return
+
+    recorder = _StreamRecorder(key, agent_name, response_cache, metadata)
+    response = await model.generate_content_async(prompt, safety_settings=safety_settings, stream=True)
+    async for chunk in response:
+        text = recorder.add(chunk)
+        if text:
+            yield text
+    recorder.finish()
+
+async def with_header_async(header, chunks):
+    """
+    Yields header just before the first chunk, so a call that fails up
+    front produces only the caller's error message, as with handle_task_async.
+    """
+    first = True
+    async for chunk in chunks:
+        if first:
+            first = False
+            yield header
+        yield chunk
@@ -0,0 +1,281 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import os
+import re
+import json
+import math
+import logging
+import random
+import zlib
+import tomllib
+
+logger = logging.getLogger(__name__)
+
+AGENT_LABELS = ["email", "research", "report", "calendar", "notion", "slack", "general"]
+
+DEFAULT_MODEL_PATH = os.path.join("models", "intent_classifier.json")
+
+# Router confidence a logged chat needs before its agent is used as a label
+MIN_LABEL_CONFIDENCE = 0.8
+
+
+class IntentClassifier:
+    """
+    Local, CPU-only intent router used as a fast path in front of the LLM.
+    Requests are turned into hashed word and character n-gram features and
+    scored by a multinomial logistic regression trained from the
+    `agent_used` labels stored in chat_logs, keeping only chats the LLM
+    router was confident about. No network call is made.
+    """
+    def __init__(self, n_features=2 ** 18, confidence_threshold=0.85):
+        self.n_features = n_features
+        self.confidence_threshold = confidence_threshold
+
+        # Sparse weights: label -> {feature_index: weight}
+        self.weights = {label: {} for label in AGENT_LABELS}
+        self.bias = {label: 0.0 for label in AGENT_LABELS}
+        self.trained = False
+
+        # Routing metrics (fast path vs. LLM fallback)
+        self.fast_path_hits = 0
+        self.llm_fallbacks = 0
+
+    def _features(self, text):
+        """
+        Hashes unigrams, bigrams and in-word character trigrams into a sparse,
+        L2-normalized feature vector.
+        """
+        tokens = re.findall(r"[a-z0-9']+", text.lower())
+        grams = list(tokens)
+        grams += [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+        for token in tokens:
+            padded = f"<{token}>"
+            grams += [f"#{padded[i:i + 3]}" for i in range(len(padded) - 2)]
+
+        features = {}
+        for gram in grams:
+            # crc32 is stable across processes, unlike hash()
+            index = zlib.crc32(gram.encode("utf-8")) % self.n_features
+            features[index] = features.get(index, 0.0) + 1.0
+
+        norm = math.sqrt(sum(v * v for v in features.values()))
+        if norm > 0:
+            features = {k: v / norm for k, v in features.items()}
+        return features
+
+    def _scores(self, features):
+        return {
+            label: self.bias[label] + sum(self.weights[label].get(i, 0.0) * v for i, v in features.items())
+            for label in AGENT_LABELS
+        }
+
+    @staticmethod
+    def _softmax(scores):
+        top = max(scores.values())
+        exps = {k: math.exp(v - top) for k, v in scores.items()}
+        total = sum(exps.values())
+        return {k: v / total for k, v in exps.items()}
+
+    def fit(self, texts, labels, epochs=15, learning_rate=0.5, l2=1e-5, seed=13):
+        """
+        Trains the model with plain SGD on the softmax cross-entropy loss.
+        Examples with unknown labels are skipped.
+        """
+        examples = [(self._features(t), l) for t, l in zip(texts, labels) if t and l in AGENT_LABELS]
+        if not examples:
+            return self
+
+        self.weights = {label: {} for label in AGENT_LABELS}
+        self.bias = {label: 0.0 for label in AGENT_LABELS}
+        rng = random.Random(seed)
+
+        for epoch in range(epochs):
+            rng.shuffle(examples)
+            rate = learning_rate / (1 + epoch * 0.1)
+            for features, target in examples:
+                probs = self._softmax(self._scores(features))
+                for label in AGENT_LABELS:
+                    gradient = probs[label] - (1.0 if label == target else 0.0)
+                    if abs(gradient) < 1e-6:
+                        continue
+                    label_weights = self.weights[label]
+                    for index, value in features.items():
+                        w = label_weights.get(index, 0.0)
+                        label_weights[index] = w - rate * (gradient * value + l2 * w)
+                    self.bias[label] -= rate * gradient
+
+        self.trained = True
+        return self
+
+    def predict(self, text):
+        """
+        Returns (label, confidence) for a single request.
+        """
+        if not self.trained or not text:
+            return "general", 0.0
+        probs = self._softmax(self._scores(self._features(text)))
+        label = max(probs, key=probs.get)
+        return label, probs[label]
+
+    def route(self, text):
+        """
+        Returns an intent dict when the prediction clears the confidence
+        threshold, otherwise None so the caller can fall back to the LLM.
+        """
+        label, confidence = self.predict(text)
+        if self.trained and confidence >= self.confidence_threshold:
+            self.fast_path_hits += 1
+            return {
+                "agent": label,
+                "parameters": {},
+                "reasoning": f"Local classifier ({confidence:.2f} confidence).",
+                "source": "classifier",
+                "confidence": round(confidence, 4)
+            }
+
+        self.llm_fallbacks += 1
+        return None
+
+    def get_routing_stats(self):
+        """Returns how often routing was answered without the LLM."""
+        total = self.fast_path_hits + self.llm_fallbacks
+        return {
+            "fast_path_hits": self.fast_path_hits,
+            "llm_fallbacks": self.llm_fallbacks,
+            "hit_rate": (self.fast_path_hits / total) if total else 0.0,
+            "confidence_threshold": self.confidence_threshold,
+            "trained": self.trained
+        }
+
+    def save(self, path=DEFAULT_MODEL_PATH):
+        """Exports the model as JSON (sparse weights only)."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({
+                "n_features": self.n_features,
+                "labels": AGENT_LABELS,
+                "bias": self.bias,
+                "weights": {
+                    label: {str(i): round(w, 6) for i, w in ws.items() if abs(w) > 1e-6}
+                    for label, ws in self.weights.items()
+                }
+            }, f)
+
+    @classmethod
+    def load(cls, path=DEFAULT_MODEL_PATH, confidence_threshold=0.85):
+        """
+        Loads an exported model. Returns an untrained classifier (which always
+        falls back to the LLM) if the file is missing or unreadable.
+        """
+        classifier = cls(confidence_threshold=confidence_threshold)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            classifier.n_features = data["n_features"]
+            classifier.bias = {label: data["bias"].get(label, 0.0) for label in AGENT_LABELS}
+            classifier.weights = {
+                label: {int(i): w for i, w in data["weights"].get(label, {}).items()}
+                for label in AGENT_LABELS
+            }
+            classifier.trained = True
+        except FileNotFoundError:
+            # Nothing trained yet; route with the LLM
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning("Could not load the intent model from %s: %s", path, e)
+        return classifier
+
+
+def _database_config(credentials_path, secrets_path):
+    """
+    The storage config from the [database] section of secrets.toml
+    (Firestore by default), built as streamlit_app.py does: Firebase
+    credentials are only added for the firestore backend, from
+    credentials_path if given, else from [firebase_credentials].
+    """
+    secrets = {}
+    if os.path.exists(secrets_path):
+        with open(secrets_path, "rb") as f:
+            secrets = tomllib.load(f)
+
+    config = dict(secrets.get("database", {}))
+    if config.get("backend", "firestore") == "firestore":
+        if credentials_path:
+            with open(credentials_path) as f:
+                config["credentials"] = json.load(f)
+        else:
+            config["credentials"] = dict(secrets["firebase_credentials"])
+    return config
+
+
+def confident_examples(examples, min_confidence=MIN_LABEL_CONFIDENCE):
+    """
+    The labeled requests whose agent the LLM router picked with at least
+    min_confidence. Fallbacks to the general agent, chats logged before
+    routes were recorded and chats routed by this classifier (so it never
+    learns from its own predictions) are left out.
+    """
+    return [
+        example for example in examples
+        if (example.get("route") or {}).get("source") == "llm"
+        and (example["route"].get("confidence") or 0.0) >= min_confidence
+    ]
+
+
+def main():
+    """
+    Retrains the classifier from chat_logs and exports it. Only chats the
+    LLM router labelled with at least --min-confidence are used (see
+    confident_examples), so uncertain or fallback labels don't become
+    training data.
+    Usage: python -m agents.intent_classifier --output models/intent_classifier.json
+    """
+    import argparse
+    from storage import create_database
+
+    parser = argparse.ArgumentParser(description="Retrain and export the local intent classifier.")
+    parser.add_argument("--output", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--credentials", help="Firebase service account JSON file (firestore backend)")
+    parser.add_argument("--secrets", default=os.path.join(".streamlit", "secrets.toml"))
+    parser.add_argument("--limit", type=int, default=5000)
+    parser.add_argument("--threshold", type=float, default=0.85)
+    parser.add_argument("--min-confidence", type=float, default=MIN_LABEL_CONFIDENCE,
+                        help="Router confidence a chat log needs to be used as a training label")
+    args = parser.parse_args()
+
+    db = create_database(_database_config(args.credentials, args.secrets))
+    labeled = db.get_labeled_requests(limit=args.limit)
+    examples = confident_examples(labeled, args.min_confidence)
+    print(f"{len(examples)} of {len(labeled)} chat logs were routed with confidence >= {args.min_confidence}")
+    if not examples:
+        print("No confidently labeled chat logs found; nothing to train on.")
+        return
+
+    # Hold out every fifth example to report accuracy and fast-path coverage
+    train = [e for i, e in enumerate(examples) if i % 5]
+    holdout = [e for i, e in enumerate(examples) if not i % 5]
+
+    classifier = IntentClassifier(confidence_threshold=args.threshold)
+    classifier.fit([e["input"] for e in train], [e["agent"] for e in train])
+
+    routed = correct = 0
+    for example in holdout:
+        label, confidence = classifier.predict(example["input"])
+        if confidence >= args.threshold:
+            routed += 1
+            correct += label == example["agent"]
+    if holdout:
+        print(f"Holdout: {len(holdout)} examples, fast-path coverage {routed / len(holdout):.1%}, "
+              f"precision {(correct / routed) if routed else 0:.1%}")
+
+    classifier.fit([e["input"] for e in examples], [e["agent"] for e in examples])
+    classifier.save(args.output)
+    print(f"Trained on {len(examples)} examples -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
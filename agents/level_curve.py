@@ -0,0 +1,89 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import bisect
+import threading
+from functools import lru_cache
+
+class LevelCurve:
+    """
+    Precomputed XP thresholds for the exponential level curve.
+    Going from level 1 to 2 costs base_xp and each later step costs
+    int(previous_step * multiplier), truncated at every level exactly as
+    the original per-level loop did, so stored levels stay valid.
+    Cumulative thresholds are built once (and extended on demand), so a
+    lookup is a binary search instead of a loop over every level.
+    """
+    def __init__(self, base_xp=100, multiplier=1.5, initial_levels=64):
+        self.base_xp = base_xp
+        self.multiplier = multiplier
+        self._lock = threading.Lock()
+
+        # steps[i]: XP needed to go from level i+1 to level i+2
+        # thresholds[i]: total XP at which level i+1 is reached
+        self.steps = []
+        self.thresholds = [0]
+        self._extend(initial_levels)
+
+    def _extend(self, levels):
+        with self._lock:
+            while len(self.steps) < levels:
+                step = int(self.steps[-1] * self.multiplier) if self.steps else self.base_xp
+                self.steps.append(step)
+                self.thresholds.append(self.thresholds[-1] + step)
+
+    def _ensure_covers(self, total_xp):
+        while total_xp >= self.thresholds[-1]:
+            self._extend(len(self.steps) + 16)
+
+    def xp_for_level(self, level):
+        """XP needed to go from level-1 to level (0 for level 1)."""
+        if level <= 1:
+            return 0
+        self._extend(level - 1)
+        return self.steps[level - 2]
+
+    def total_xp_for_level(self, level):
+        """Total XP at which the given level is reached."""
+        if level <= 1:
+            return 0
+        self._extend(level - 1)
+        return self.thresholds[level - 1]
+
+    def level_progress(self, total_xp):
+        """
+        Returns (level, xp_into_current_level, xp_needed_for_next_level).
+        """
+        total_xp = max(0, total_xp)
+        self._ensure_covers(total_xp)
+        index = bisect.bisect_right(self.thresholds, total_xp) - 1
+        return index + 1, total_xp - self.thresholds[index], self.steps[index]
+
+    def bulk_level_progress(self, total_xp):
+        """
+        Vectorized level_progress for leaderboards and analytics.
+        Takes any array-like of total XP and returns NumPy arrays
+        (levels, xp_into_level, xp_for_next_level, progress_percent).
+        """
+        import numpy as np
+
+        values = np.maximum(np.asarray(total_xp, dtype=np.int64), 0)
+        if values.size:
+            self._ensure_covers(int(values.max()))
+
+        thresholds = np.asarray(self.thresholds, dtype=np.int64)
+        steps = np.asarray(self.steps, dtype=np.int64)
+
+        index = np.searchsorted(thresholds, values, side="right") - 1
+        xp_into_level = values - thresholds[index]
+        xp_for_next = steps[index]
+        progress_percent = (xp_into_level * 100) // xp_for_next
+
+        return index + 1, xp_into_level, xp_for_next, progress_percent
+
+
+@lru_cache(maxsize=8)
+def get_level_curve(base_xp=100, multiplier=1.5):
+    """Shared curve per configuration, so sessions don't rebuild the table."""
+    return LevelCurve(base_xp=base_xp, multiplier=multiplier)
@@ -0,0 +1,117 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import time
+import threading
+
+from agents.event_loop import run_sync
+
+DEFAULT_MODEL_NAME = 'gemini-2.5-flash-preview-05-20'
+
+_models = {}  # (model_name, system_instruction) -> GenerativeModel
+_api_key = None
+_configured_key = None
+_model_factory = None
+_lock = threading.Lock()
+
+_warm_up_thread = None
+_warm_up_status = {"state": "not_started", "duration_ms": None, "errors": []}
+
+def configure(api_key):
+    """
+    Sets the Gemini API key for the whole process. The SDK itself is
+    imported and configured when the first real model is built.
+    """
+    global _api_key
+    if not api_key:
+        return
+    with _lock:
+        _api_key = api_key
+
+def _genai():
+    # Called with _lock held
+    global _configured_key
+    import google.generativeai as genai
+    if _api_key and _configured_key != _api_key:
+        genai.configure(api_key=_api_key)
+        _configured_key = _api_key
+    return genai
+
+def set_model_factory(factory=None):
+    """
+    Replaces genai.GenerativeModel as the constructor for registry models,
+    e.g. with an offline fake for benchmarks. None restores the default.
+    Drops models built by the previous factory.
+    """
+    global _model_factory
+    with _lock:
+        _model_factory = factory
+        _models.clear()
+
+def get_model(model_name=DEFAULT_MODEL_NAME, system_instruction=None):
+    """
+    Returns the shared GenerativeModel for this name and system instruction,
+    creating it on first use. Sessions reuse these instead of building their
+    own, so their connections are set up once per process.
+    """
+    key = (model_name, system_instruction)
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            factory = _model_factory or _genai().GenerativeModel
+            if system_instruction:
+                model = factory(model_name, system_instruction=system_instruction)
+            else:
+                model = factory(model_name)
+            _models[key] = model
+        return model
+
+def _warm_up(db, model_names):
+    start = time.perf_counter()
+    errors = []
+
+    # count_tokens is a cheap round trip that opens the sync and async
+    # Gemini channels without generating anything
+    for model_name in model_names:
+        model = get_model(model_name)
+        try:
+            model.count_tokens("ping")
+            run_sync(model.count_tokens_async("ping"))
+        except Exception as e:
+            errors.append(f"{model_name}: {str(e)}")
+
+    if db is not None:
+        try:
+            db.warm_up()
+            run_sync(db.warm_up_async())
+        except Exception as e:
+            errors.append(f"firestore: {str(e)}")
+
+    with _lock:
+        _warm_up_status.update({
+            "state": "error" if errors else "done",
+            "duration_ms": round((time.perf_counter() - start) * 1000, 1),
+            "errors": errors
+        })
+
+def start_warm_up(api_key=None, db=None, model_names=(DEFAULT_MODEL_NAME,)):
+    """
+    Opens the Gemini and Firestore connections on a background thread so
+    the first user request doesn't pay for them. Runs once per process;
+    later calls return the same thread.
+    """
+    global _warm_up_thread
+    configure(api_key)
+    with _lock:
+        if _warm_up_thread is None:
+            _warm_up_status["state"] = "running"
+            _warm_up_thread = threading.Thread(
+                target=_warm_up, args=(db, tuple(model_names)), name="model-warm-up", daemon=True
+            )
+            _warm_up_thread.start()
+        return _warm_up_thread
+
+def get_warm_up_status():
+    with _lock:
+        return dict(_warm_up_status, errors=list(_warm_up_status["errors"]))
@@ -2,20 +2,18 @@
 # Email: shreyash.v.chougule1903@gmail.com
 # Project: Multi-Agent AI System (MVP)
 
-import google.generativeai as genai
+from agents.prompt_agent import PromptAgent
 
-class NotionAgent:
-    def __init__(self, model):
-        """
-        Initialize the agent with a Gemini model.
-        """
-        self.model = model
+class NotionAgent(PromptAgent):
+    """
+    Generates a direct response to a notion/notes-related request.
+    """
+    name = "notion"
+    icon = "📝"
+    label = "Notion Agent"
 
-    def handle_task(self, user_request, safety_settings):
-        """
-        Generates a direct response to a notion/notes-related request.
-        """
-        prompt = f"""
+    def _build_prompt(self, user_request):
+        return f"""
         You are a helpful note-taking and knowledge-base assistant. A user has made the following request:
         '{user_request}'
 
@@ -27,14 +25,3 @@ class NotionAgent:
         
         Provide *only* the formatted notes or your clarifying questions.
         """
-        
-        try:
-            response = self.model.generate_content(
-                prompt,
-                safety_settings=safety_settings
-            )
-            
-            # Add a header for clarity in the UI
-            return f"📝 **Notion Agent:**\n\n{response.text}"
-        except Exception as e:
-            return f"❌ Error in Notion Agent: {str(e)}"
\ No newline at end of file
@@ -2,6 +2,9 @@
 # Email: shreyash.v.chougule1903@gmail.com
 # Project: Multi-Agent AI System (MVP)
 
+import math
+import time
+
 class PAEIPersonality:
     """
     Manages the PAEI personality profile based on agent usage.
@@ -9,92 +12,168 @@ class PAEIPersonality:
     A = Administrator (Email, Calendar)
     E = Entrepreneur (Notion, General)
     I = Integrator (Slack)
+
+    Scores are kept incrementally in the user's xp_progress document
+    (paei_scores): each handled request adds to its trait with a
+    server-side increment inside the request's unit of work, so updating
+    them never reads the stored scores. With half_life_days set, a request
+    adds 2 ** (t / half_life) instead of 1, t counted from DECAY_EPOCH
+    (forward decay): older activity loses weight relative to recent
+    activity exactly as if the stored scores were decayed, since only the
+    ratios between traits are ever shown.
     """
-    def __init__(self, db=None, user_id=None):
+    # Start of the forward-decay clock (2024-01-01 UTC). With a 14-day half
+    # life the weights grow about 2 ** 26 a year, well within float range.
+    DECAY_EPOCH = 1704067200
+
+    # Static lookup tables, shared by every instance
+    agent_to_paei = {
+        "research": "P",
+        "report": "P",
+        "email": "A",
+        "calendar": "A",
+        "notion": "E",
+        "general": "E",
+        "slack": "I"
+    }
+    paei_details = {
+        "P": {
+            "name": "Producer",
+            "badge": "🚀",
+            "desc": "You are results-focused and action-oriented. You excel at getting things done."
+        },
+        "A": {
+            "name": "Administrator",
+            "badge": "🗂️",
+            "desc": "You are organized, systematic, and process-oriented. You bring order to chaos."
+        },
+        "E": {
+            "name": "Entrepreneur",
+            "badge": "💡",
+            "desc": "You are a creative, innovative, and strategic thinker. You see the big picture."
+        },
+        "I": {
+            "name": "Integrator",
+            "badge": "🤝",
+            "desc": "You are collaborative and people-focused. You build strong teams and connections."
+        }
+    }
+    recommendations = {
+        "P": [
+            "Delegate smaller tasks to maintain high output.",
+            "Take short breaks to avoid burnout.",
+            "Set clear, achievable daily goals."
+        ],
+        "A": [
+            "Don't be afraid to innovate on existing processes.",
+            "Schedule time for creative thinking.",
+            "Use templates to streamline your administrative tasks."
+        ],
+        "E": [
+            "Collaborate with 'A' types to bring your ideas to life.",
+            "Break down big ideas into smaller, actionable steps.",
+            "Set clear priorities to focus your creative energy."
+        ],
+        "I": [
+            "Use your people skills to unblock team members.",
+            "Facilitate meetings to ensure all voices are heard.",
+            "Organize team-building activities to boost morale."
+        ]
+    }
+
+    def __init__(self, db=None, user_id=None, half_life_days=None):
         self.db = db
         self.user_id = user_id
-        self.agent_to_paei = {
-            "research": "P",
-            "report": "P",
-            "email": "A",
-            "calendar": "A",
-            "notion": "E",
-            "general": "E",
-            "slack": "I"
-        }
-        self.paei_details = {
-            "P": {
-                "name": "Producer",
-                "badge": "🚀",
-                "desc": "You are results-focused and action-oriented. You excel at getting things done."
-            },
-            "A": {
-                "name": "Administrator",
-                "badge": "🗂️",
-                "desc": "You are organized, systematic, and process-oriented. You bring order to chaos."
-            },
-            "E": {
-                "name": "Entrepreneur",
-                "badge": "💡",
-                "desc": "You are a creative, innovative, and strategic thinker. You see the big picture."
-            },
-            "I": {
-                "name": "Integrator",
-                "badge": "🤝",
-                "desc": "You are collaborative and people-focused. You build strong teams and connections."
-            }
-        }
-        self.recommendations = {
-            "P": [
-                "Delegate smaller tasks to maintain high output.",
-                "Take short breaks to avoid burnout.",
-                "Set clear, achievable daily goals."
-            ],
-            "A": [
-                "Don't be afraid to innovate on existing processes.",
-                "Schedule time for creative thinking.",
-                "Use templates to streamline your administrative tasks."
-            ],
-            "E": [
-                "Collaborate with 'A' types to bring your ideas to life.",
-                "Break down big ideas into smaller, actionable steps.",
-                "Set clear priorities to focus your creative energy."
-            ],
-            "I": [
-                "Use your people skills to unblock team members.",
-                "Facilitate meetings to ensure all voices are heard.",
-                "Organize team-building activities to boost morale."
-            ]
-        }
+        self.half_life_days = half_life_days
+        # Set once stored scores have been seen; until then each update
+        # checks for them and preloads the agent metrics that seed them
+        self._scores_stored = False
 
-    def get_personality_profile(self):
+    def _weight(self, now):
+        """What one request adds to its trait at time now."""
+        if not self.half_life_days:
+            return 1
+        half_life_seconds = self.half_life_days * 86400
+        return math.exp(math.log(2) * (now - self.DECAY_EPOCH) / half_life_seconds)
+
+    def _scores_from_metrics(self, agent_metrics=None):
         """
-        Calculates the user's PAEI profile from database metrics.
+        Raw trait scores from the per-agent call counts. Used to seed the
+        stored scores for users who predate them.
         """
-        scores = {"P": 0, "A": 0, "E": 0, "I": 0}
-        total_calls = 0
-        
-        if self.db and self.user_id:
+        if agent_metrics is None:
             agent_metrics = self.db.get_agent_metrics(self.user_id)
-            if not agent_metrics:
-                return self._default_profile() # Return default if no history
-
-            for metric in agent_metrics:
-                agent_name = metric.get("agent")
-                call_count = metric.get("calls", 0)
-                trait = self.agent_to_paei.get(agent_name)
-                
-                if trait:
-                    scores[trait] += call_count
-                    total_calls += call_count
-        else:
+        scores = {"P": 0, "A": 0, "E": 0, "I": 0}
+        for metric in agent_metrics or []:
+            trait = self.agent_to_paei.get(metric.get("agent"))
+            if trait:
+                scores[trait] += metric.get("calls", 0)
+        return scores
+
+    def score_increments(self, agent_name, now=None, seed_metrics=None):
+        """
+        O(1) update: the amounts to add to the stored paei_scores for one
+        request to agent_name, as {"paei_scores": {trait: amount}}. When
+        seed_metrics (the already loaded agent metrics) is given, the
+        scores are not stored yet and are seeded from them in the same
+        increment. Never reads the database.
+        """
+        weight = self._weight(time.time() if now is None else now)
+        increments = {}
+        if seed_metrics is not None:
+            increments = {k: v * weight for k, v in self._scores_from_metrics(seed_metrics).items()}
+        trait = self.agent_to_paei.get(agent_name)
+        if trait:
+            increments[trait] = increments.get(trait, 0) + weight
+        return {"paei_scores": increments}
+
+    def stage_update(self, unit_of_work, agent_name):
+        """
+        Adds this request's score increments to the unit of work. Until
+        stored scores have been seen, the xp_progress record is checked for
+        them here, before the commit, and if there are none the agent
+        metrics that seed them are loaded too.
+        """
+        seed_metrics = None
+        if not self._scores_stored and self.db and self.user_id:
+            if self.db.get_xp_progress(self.user_id).get("paei_scores") is not None:
+                self._scores_stored = True
+            else:
+                seed_metrics = self.db.get_agent_metrics(self.user_id) or []
+
+        increments = self.score_increments(agent_name, seed_metrics=seed_metrics)
+        if increments["paei_scores"]:
+            unit_of_work.increment_user_stats(increments)
+        return unit_of_work
+
+    def _load_scores(self, xp_progress=None, agent_metrics=None):
+        if not (self.db and self.user_id):
+            return None
+        if xp_progress is None:
+            xp_progress = self.db.get_xp_progress(self.user_id) or {}
+        if xp_progress.get("paei_scores") is not None:
+            # Forward-decayed weights give the same percentages as scores
+            # decayed up to now
+            return xp_progress["paei_scores"]
+        return self._scores_from_metrics(agent_metrics)
+
+    def get_personality_profile(self, xp_progress=None, agent_metrics=None):
+        """
+        Calculates the user's PAEI profile from the stored scores. Already
+        loaded xp_progress / agent_metrics records can be passed in.
+        """
+        return self._build_profile(self._load_scores(xp_progress, agent_metrics))
+
+    def _build_profile(self, scores):
+        if not scores:
             return self._default_profile()
 
-        if total_calls == 0:
+        total = sum(scores.get(k, 0) for k in ("P", "A", "E", "I"))
+        if total <= 0:
             return self._default_profile()
 
         # Calculate percentages
-        percent_scores = {k: (v / total_calls) * 100 for k, v in scores.items()}
+        percent_scores = {k: (scores.get(k, 0) / total) * 100 for k in ("P", "A", "E", "I")}
         
         # Find dominant trait
         dominant_trait = max(percent_scores, key=percent_scores.get)
@@ -121,14 +200,22 @@ class PAEIPersonality:
             "dominant_trait_short": "I"
         }
 
+    def get_personality_summary(self, xp_progress=None, agent_metrics=None):
+        """
+        Profile, badge and recommendations from a single profile computation.
+        """
+        profile = self.get_personality_profile(xp_progress, agent_metrics)
+        trait_short = profile["dominant_trait_short"]
+        return {
+            "profile": profile,
+            "badge": self.paei_details[trait_short]["badge"],
+            "recommendations": self.recommendations[trait_short]
+        }
+
     def get_personality_badge(self):
         """Gets the emoji badge for the dominant trait."""
-        profile = self.get_personality_profile()
-        trait_short = profile["dominant_trait_short"]
-        return self.paei_details[trait_short]["badge"]
+        return self.get_personality_summary()["badge"]
 
     def get_personality_recommendations(self):
         """Gets personalized recommendations based on the dominant trait."""
-        profile = self.get_personality_profile()
-        trait_short = profile["dominant_trait_short"]
-        return self.recommendations[trait_short]
\ No newline at end of file
+        return self.get_personality_summary()["recommendations"]
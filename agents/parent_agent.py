@@ -3,111 +3,405 @@
 # Project: Multi-Agent AI System (MVP)
 
 import os
+import re
 import json
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
+import asyncio
+import time
+import threading
+from collections import namedtuple
+from types import MappingProxyType
 
 from agents.context_manager import ContextManager
 from agents.xp_agent import XPAgent
-from agents.email_agent import EmailAgent
-from agents.research_agent import ResearchAgent
 from agents.report_agent import ReportAgent
 from agents.paei_personality import PAEIPersonality
-from agents.calendar_agent import CalendarAgent
-from agents.notion_agent import NotionAgent
-from agents.slack_agent import SlackAgent
+from agents.intent_classifier import DEFAULT_MODEL_PATH
+from agents.shared_resources import SharedResources
+from agents.generation import generate_text_async, stream_text_async, with_header_async
+from agents.event_loop import run_sync, iterate_sync
+from agents.model_registry import get_model
+import chat_log
+from write_behind import WriteBehindQueue, get_shared_queue
+
+# What the Streamlit tabs render on one page load (see ParentAgent.get_dashboard)
+Dashboard = namedtuple(
+    'Dashboard', ['xp_stats', 'context', 'chat_history', 'agent_metrics', 'task_history', 'personality']
+)
+
+class _SharedAgent:
+    """Class attribute that resolves a sub-agent from the SharedResources on first use."""
+    def __init__(self, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return instance.resources.get_agent(self.name)
 
 class ParentAgent:
-    def __init__(self, db=None, user_id=None, google_api_key=None):
-        if google_api_key:
-            genai.configure(api_key=google_api_key)
-        
-        self.model = genai.GenerativeModel('gemini-2.5-flash-preview-05-20')
+    email_agent = _SharedAgent("email")
+    research_agent = _SharedAgent("research")
+    calendar_agent = _SharedAgent("calendar")
+    notion_agent = _SharedAgent("notion")
+    slack_agent = _SharedAgent("slack")
+
+    # Shown when the general agent can't produce an answer
+    GENERAL_FALLBACK = "I can help with various tasks like sending emails, researching topics, or generating reports. What would you like to do?"
+
+    # XP task type per agent; anything else counts as "simple"
+    AGENT_TASK_TYPES = {
+        "email": "email",
+        "research": "research",
+        "report": "report",
+        "calendar": "complex",
+        "notion": "complex",
+        "slack": "email"
+    }
+
+    def __init__(self, db=None, user_id=None, google_api_key=None,
+                 intent_model_path=DEFAULT_MODEL_PATH, intent_confidence_threshold=0.85,
+                 intent_cache_size=256, intent_cache_ttl=3600, response_cache=None,
+                 write_behind=True, paei_half_life_days=None, resources=None, context=None,
+                 xp_baseline=None):
+        """
+        resources: a SharedResources to reuse across sessions; when None the
+        agent builds its own from the model/cache arguments above.
+        context: dict the session's context is kept in (updated in place).
+        xp_baseline: XP totals already known for this user, to skip a read.
+        """
+        if resources is None:
+            resources = SharedResources(
+                google_api_key=google_api_key,
+                response_cache=response_cache,
+                intent_model_path=intent_model_path,
+                intent_confidence_threshold=intent_confidence_threshold,
+                intent_cache_size=intent_cache_size,
+                intent_cache_ttl=intent_cache_ttl
+            )
+        self.resources = resources
+        self.intent_cache = resources.intent_cache
         
+        # --- Per-user state ---
         self.db = db
         self.user_id = user_id
         
-        self.context_manager = ContextManager()
-        self.xp_agent = XPAgent(db=db, user_id=user_id)
-        
-        self.email_agent = EmailAgent(model=self.model)
-        self.research_agent = ResearchAgent(model=self.model)
-        self.report_agent = ReportAgent(model=self.model, db=db, user_id=user_id)
-        
-        self.paei_personality = PAEIPersonality(db=db, user_id=user_id)
-        
-        self.calendar_agent = CalendarAgent(model=self.model)
-        self.notion_agent = NotionAgent(model=self.model)
-        self.slack_agent = SlackAgent(model=self.model)
+        # Cache/latency details of the most recent request
+        self.last_response_metadata = {}
         
-        # Set safety settings to be less restrictive
-        self.safety_settings = {
-            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-        }
+        # Post-response writes go through a background queue unless disabled.
+        # Pass True for the shared process-wide queue, or a WriteBehindQueue.
+        if isinstance(write_behind, WriteBehindQueue):
+            self.write_behind = write_behind
+        else:
+            self.write_behind = get_shared_queue() if write_behind else None
+        # Chat logs answered but not yet written, so history stays consistent
+        self._pending_chats = []
+        self._pending_lock = threading.Lock()
         
-        # Generation config to ensure JSON output where needed
-        self.json_generation_config = genai.GenerationConfig(
-            response_mime_type="application/json"
-        )
+        self.context_manager = ContextManager(context)
+        self.xp_agent = XPAgent(db=db, user_id=user_id, baseline=xp_baseline)
+        self._report_agent = None
+        self.paei_personality = PAEIPersonality(db=db, user_id=user_id, half_life_days=paei_half_life_days)
+
+    # Shared pieces are resolved through the resources, which build them lazily
+    @property
+    def model(self):
+        return self.resources.model
+
+    @property
+    def response_cache(self):
+        return self.resources.response_cache
+
+    @property
+    def intent_classifier(self):
+        return self.resources.intent_classifier
+
+    @property
+    def safety_settings(self):
+        return self.resources.safety_settings
+
+    @property
+    def json_generation_config(self):
+        return self.resources.json_generation_config
+
+    @property
+    def report_agent(self):
+        if self._report_agent is None:
+            self._report_agent = ReportAgent(model=self.model, db=self.db, user_id=self.user_id)
+        return self._report_agent
 
     def handle_request(self, user_input):
+        """
+        Synchronous entry point; a thin wrapper over handle_request_async.
+        """
+        return run_sync(self.handle_request_async(user_input))
+
+    async def handle_request_async(self, user_input):
         try:
             # Get the context *before* the task (used for intent)
             context = self.context_manager.get_context()
+            metadata = {}
+            self.last_response_metadata = metadata
             
-            intent = self._analyze_intent(user_input, context)
+            intent = await self._route_intent_async(user_input, context)
+            agent = self._resolve_agent(intent)
+            metadata["route"] = self._route_metadata(intent)
             
-            # Handle potential failure in intent analysis
-            if intent.get("agent") is None or "Error" in intent.get("reasoning", ""):
-                result = self._handle_general(user_input)
-                intent["agent"] = "general"
-                xp_earned = self.xp_agent.calculate_xp_for_task("simple")
-            
-            elif intent["agent"] == "email":
-                result = self._handle_email(user_input)
-                xp_earned = self.xp_agent.calculate_xp_for_task("email")
-            elif intent["agent"] == "research":
-                result = self._handle_research(user_input)
-                xp_earned = self.xp_agent.calculate_xp_for_task("research")
-            elif intent["agent"] == "report":
-                result = self._handle_report() 
-                xp_earned = self.xp_agent.calculate_xp_for_task("report")
-            elif intent["agent"] == "calendar":
-                result = self._handle_calendar(user_input)
-                xp_earned = self.xp_agent.calculate_xp_for_task("complex")
-            elif intent["agent"] == "notion":
-                result = self._handle_notion(user_input)
-                xp_earned = self.xp_agent.calculate_xp_for_task("complex")
-            elif intent["agent"] == "slack":
-                result = self._handle_slack(user_input)
-                xp_earned = self.xp_agent.calculate_xp_for_task("email")
+            if agent == "email":
+                result = await self._handle_email_async(user_input, metadata)
+            elif agent == "research":
+                result = await self._handle_research_async(user_input, metadata)
+            elif agent == "report":
+                result = await self._handle_report_async()
+            elif agent == "calendar":
+                result = await self._handle_calendar_async(user_input, metadata)
+            elif agent == "notion":
+                result = await self._handle_notion_async(user_input, metadata)
+            elif agent == "slack":
+                result = await self._handle_slack_async(user_input, metadata)
             else: 
-                result = self._handle_general(user_input)
-                xp_earned = self.xp_agent.calculate_xp_for_task("simple")
+                result = await self._handle_general_async(user_input, metadata)
+            
+            return await self._finish_request_async(user_input, agent, result, metadata)
             
-            xp_info = self.xp_agent.add_xp(xp_earned, intent["agent"])
+        except Exception as e:
+            return f"❌ Error: {str(e)}\n\nPlease try again or rephrase your request."
+
+    def stream_request(self, user_input):
+        """
+        Synchronous streaming entry point: yields the answer in chunks as the
+        agent generates it, then the XP footer. Suits st.write_stream.
+        """
+        return iterate_sync(self.stream_request_async(user_input))
+
+    async def stream_request_async(self, user_input):
+        """
+        Streaming variant of handle_request_async. The footer, XP and DB
+        writes are produced from the collected chunks once the stream ends,
+        so no second model call is needed.
+        """
+        start = time.perf_counter()
+        try:
+            context = self.context_manager.get_context()
+            metadata = {}
+            self.last_response_metadata = metadata
             
-            # Now, update the context *after* the task is done
-            self.context_manager.update_context(intent["agent"])
-            # Get the *new* context to display in the response
-            updated_context = self.context_manager.get_context()
+            intent = await self._route_intent_async(user_input, context)
+            agent = self._resolve_agent(intent)
+            metadata["route"] = self._route_metadata(intent)
             
-            response = self._compile_response(result, xp_info, updated_context) # <-- Uses new context
+            if agent == "email":
+                chunks = self.email_agent.stream_task_async(user_input, self.safety_settings, metadata)
+            elif agent == "research":
+                chunks = self.research_agent.stream_task_async(user_input, self.safety_settings, metadata)
+            elif agent == "report":
+                # Built from stats, not the LLM; it arrives as one chunk
+                chunks = self._single_chunk(self._handle_report_async())
+            elif agent == "calendar":
+                chunks = self.calendar_agent.stream_task_async(user_input, self.safety_settings, metadata)
+            elif agent == "notion":
+                chunks = self.notion_agent.stream_task_async(user_input, self.safety_settings, metadata)
+            elif agent == "slack":
+                chunks = self.slack_agent.stream_task_async(user_input, self.safety_settings, metadata)
+            else:
+                chunks = self._stream_general_async(user_input, metadata)
             
-            if self.db and self.user_id:
-                self.db.log_chat(self.user_id, user_input, response, intent["agent"])
-                self.db.update_agent_metrics(self.user_id, intent["agent"], xp_earned)
+            parts = []
+            async for chunk in chunks:
+                if not parts:
+                    # What the user waits for, routing included
+                    metadata["first_chunk_ms"] = round((time.perf_counter() - start) * 1000, 1)
+                parts.append(chunk)
+                yield chunk
             
-            return response
+            result = "".join(parts)
+            response = await self._finish_request_async(user_input, agent, result, metadata)
+            yield response[len(result):]
             
         except Exception as e:
-            return f"❌ Error: {str(e)}\n\nPlease try again or rephrase your request."
+            yield f"❌ Error: {str(e)}\n\nPlease try again or rephrase your request."
+
+    async def _single_chunk(self, coro):
+        yield await coro
+
+    def _resolve_agent(self, intent):
+        """
+        The agent that handles a routed intent; failed intent analysis
+        falls back to the general assistant.
+        """
+        if intent.get("agent") is None or "Error" in intent.get("reasoning", ""):
+            intent["agent"] = "general"
+            intent["source"] = "fallback"
+            intent["confidence"] = 0.0
+        return intent["agent"]
+
+    def _route_metadata(self, intent):
+        """
+        How the request was routed, stored with the chat log: "source" is
+        "llm", "classifier" or "fallback" and "confidence" the router's
+        confidence in the agent (None if it gave none). The intent
+        classifier is retrained only on confident LLM routes.
+        """
+        return {"source": intent.get("source", "llm"), "confidence": intent.get("confidence")}
+
+    async def _finish_request_async(self, user_input, agent, result, metadata):
+        """
+        Awards XP, updates the context and persists the request once the
+        agent's answer is complete. Returns the answer with its XP footer.
+        """
+        xp_earned = self.xp_agent.calculate_xp_for_task(self.AGENT_TASK_TYPES.get(agent, "simple"))
+        
+        # Optimistic values; the real write happens after the answer is ready.
+        # The first reservation may read the DB, so keep it off the loop.
+        xp_info = await asyncio.to_thread(self.xp_agent.reserve_xp, xp_earned)
+        
+        # Now, update the context *after* the task is done
+        self.context_manager.update_context(agent)
+        # Get the *new* context to display in the response
+        updated_context = self.context_manager.get_context()
+        
+        response = self._compile_response(result, xp_info, updated_context) # <-- Uses new context
+        
+        if self._uses_write_behind():
+            pending_chat = {
+                "input": user_input, "response": response, "agent": agent, "timestamp": None,
+                "client_log_id": chat_log.new_log_id()
+            }
+            with self._pending_lock:
+                self._pending_chats.append(pending_chat)
+            # submit() may block briefly when the queue is full, so keep it off the event loop
+            await asyncio.to_thread(
+                self.write_behind.submit,
+                self._persist_request, pending_chat, xp_earned, metadata, xp_info['tasks_completed']
+            )
+        elif self.db and self.user_id:
+            # Building it may read the records that seed the PAEI scores
+            unit_of_work = await asyncio.to_thread(
+                self._build_unit_of_work, user_input, response, agent, xp_earned, metadata,
+                task_number=xp_info['tasks_completed']
+            )
+            committed = None
+            try:
+                committed = (await unit_of_work.commit_async())["aggregates"].get("xp_progress")
+            finally:
+                self.xp_agent.settle_xp(xp_earned, committed)
+        
+        return response
+
+    def _uses_write_behind(self):
+        return self.write_behind is not None and self.db is not None and self.user_id is not None
 
-    def _analyze_intent(self, user_input, context):
-        prompt = f"""Analyze this user request and determine which agent should handle it:
+    def _build_unit_of_work(self, user_input, response, agent, xp_earned, metadata, client_log_id=None,
+                            task_number=None):
+        """
+        All writes for one handled request, committed together.
+        """
+        unit_of_work = self.db.unit_of_work(self.user_id)
+        self.xp_agent.stage_xp(unit_of_work, xp_earned, agent, task_number=task_number)
+        unit_of_work.log_chat(user_input, response, agent, metadata=metadata, client_log_id=client_log_id)
+        unit_of_work.update_agent_metrics(agent, xp_earned)
+        unit_of_work.update_rollups(agent, xp_earned, latency_ms=(metadata or {}).get("latency_ms"))
+        self.paei_personality.stage_update(unit_of_work, agent)
+        return unit_of_work
+
+    def _persist_request(self, pending_chat, xp_earned, metadata, task_number=None):
+        """
+        Runs on the write-behind worker: commits the XP, chat log and agent
+        metrics writes for one handled request in a single batch.
+        """
+        unit_of_work = self._build_unit_of_work(
+            pending_chat["input"], pending_chat["response"], pending_chat["agent"], xp_earned, metadata,
+            client_log_id=pending_chat["client_log_id"], task_number=task_number
+        )
+        committed = None
+        try:
+            committed = unit_of_work.commit()["aggregates"].get("xp_progress")
+        finally:
+            self.xp_agent.settle_xp(xp_earned, committed)
+            with self._pending_lock:
+                if pending_chat in self._pending_chats:
+                    self._pending_chats.remove(pending_chat)
+
+    def flush_writes(self, timeout=None):
+        """Waits for queued writes to reach the database."""
+        if self.write_behind is None:
+            return True
+        return self.write_behind.flush(timeout)
+
+    def get_chat_history(self, limit=10, start_after=None, end_before=None):
+        """
+        Chat history with entries still in the write-behind queue merged in,
+        newest first. Pass start_after (the oldest "timestamp" already shown)
+        to page further back; older pages come from the database only.
+        """
+        history = self.get_chat_page(limit, start_after=start_after, end_before=end_before)
+        if start_after is not None:
+            return history
+        return self._merge_pending_chats(history, limit)
+
+    def get_chat_page(self, limit=10, start_after=None, end_before=None):
+        """One page of stored chat history, without write-behind entries."""
+        if not (self.db and self.user_id):
+            return []
+        return self.db.get_chat_history(self.user_id, limit=limit, start_after=start_after, end_before=end_before)
+
+    def get_chat_body(self, entry):
+        """
+        Full request and response for a history entry. Stored entries are
+        summaries, so the body is read on demand; queued ones carry it.
+        """
+        if "response" in entry:
+            return {"input": entry["input"], "response": entry["response"]}
+        if not (self.db and self.user_id):
+            return None
+        return self.db.get_chat_body(self.user_id, entry.get("id"))
+
+    def with_pending_chats(self, history):
+        """Prepends queued chats to already-loaded history, without truncating it."""
+        return self._merge_pending_chats(history, None)
+
+    def _merge_pending_chats(self, history, limit):
+        with self._pending_lock:
+            pending = list(reversed(self._pending_chats))
+        
+        # Skip entries whose write landed between the two reads above;
+        # they carry the same client_log_id as the queued chat
+        pending_keys = {chat_log.entry_key(p) for p in pending}
+        history = [h for h in history if chat_log.entry_key(h) not in pending_keys]
+        return (pending + history)[:limit]
+
+    async def _route_intent_async(self, user_input, context):
+        """
+        Checks the intent cache, then the local classifier, and only calls
+        the LLM when neither can answer.
+        """
+        cache_key = self._intent_cache_key(user_input, context)
+        cached = self.intent_cache.get(cache_key)
+        if cached is not None:
+            return dict(cached)  # Callers mutate the intent dict
+        
+        intent = self.intent_classifier.route(user_input)
+        if intent is not None:
+            return intent
+        
+        intent = await self._analyze_intent_async(user_input, context)
+        # Don't cache failures, so the next request retries the LLM
+        if "Error" not in intent.get("reasoning", ""):
+            self.intent_cache.set(cache_key, dict(intent))
+        return intent
+
+    def _intent_cache_key(self, user_input, context):
+        """
+        Normalizes case, whitespace and punctuation, and buckets the context
+        fields the intent prompt depends on.
+        """
+        text = re.sub(r"[^\w\s]", " ", user_input.lower())
+        text = " ".join(text.split())
+        energy_bucket = context['energy_level'] // 20
+        return (text, energy_bucket, context['flow_state'])
+
+    def _build_intent_prompt(self, user_input, context):
+        return f"""Analyze this user request and determine which agent should handle it:
 User Input: "{user_input}"
 Context: Energy Level {context['energy_level']}/1G0, Flow State: {context['flow_state']}
 
@@ -123,23 +417,35 @@ Agents available:
 Respond in JSON format with:
 - "agent": the agent name to use
 - "parameters": any extracted details (like recipient, subject, query, etc.)
-- "reasoning": brief explanation of why this agent was chosen"""
+- "reasoning": brief explanation of why this agent was chosen
+- "confidence": how sure you are that this agent is right, from 0.0 to 1.0"""
+
+    def _parse_intent(self, text):
+        clean_json = text.strip().replace("```json", "").replace("```", "")
+        intent_data = json.loads(clean_json)
+        
+        intent_data["source"] = "llm"
+        try:
+            intent_data["confidence"] = min(1.0, max(0.0, float(intent_data["confidence"])))
+        except (KeyError, TypeError, ValueError):
+            intent_data["confidence"] = None
+
+        if "agent" not in intent_data or intent_data["agent"] not in ["email", "research", "report", "calendar", "notion", "slack", "general"]:
+            intent_data["agent"] = "general"
+            intent_data["reasoning"] = "LLM returned invalid or no agent, defaulting to general."
+            intent_data["source"] = "fallback"
+            intent_data["confidence"] = 0.0
 
+        return intent_data
+
+    async def _analyze_intent_async(self, user_input, context):
         try:
-            response = self.model.generate_content(
-                prompt,
+            response = await self.model.generate_content_async(
+                self._build_intent_prompt(user_input, context),
                 generation_config=self.json_generation_config,
                 safety_settings=self.safety_settings
             )
-            
-            clean_json = response.text.strip().replace("```json", "").replace("```", "")
-            intent_data = json.loads(clean_json)
-            
-            if "agent" not in intent_data or intent_data["agent"] not in ["email", "research", "report", "calendar", "notion", "slack", "general"]:
-                intent_data["agent"] = "general"
-                intent_data["reasoning"] = "LLM returned invalid or no agent, defaulting to general."
-
-            return intent_data
+            return self._parse_intent(response.text)
         except Exception as e:
             return {
                 "agent": "general",
@@ -147,40 +453,49 @@ Respond in JSON format with:
                 "reasoning": f"Error in intent analysis: {str(e)}"
             }
 
-    def _handle_email(self, user_input):
-        return self.email_agent.handle_task(user_input, self.safety_settings)
+    async def _handle_email_async(self, user_input, metadata=None):
+        return await self.email_agent.handle_task_async(user_input, self.safety_settings, metadata)
 
-    def _handle_research(self, user_input):
-        return self.research_agent.handle_task(user_input, self.safety_settings)
+    async def _handle_research_async(self, user_input, metadata=None):
+        return await self.research_agent.handle_task_async(user_input, self.safety_settings, metadata)
 
-    def _handle_report(self):
-        return self.report_agent.generate_xp_report(self.xp_agent, self.context_manager)
+    async def _handle_report_async(self):
+        return await self.report_agent.generate_xp_report_async(self.xp_agent, self.context_manager)
     
-    def _handle_calendar(self, user_input):
-        return self.calendar_agent.handle_task(user_input, self.safety_settings)
+    async def _handle_calendar_async(self, user_input, metadata=None):
+        return await self.calendar_agent.handle_task_async(user_input, self.safety_settings, metadata)
 
-    def _handle_notion(self, user_input):
-        return self.notion_agent.handle_task(user_input, self.safety_settings)
+    async def _handle_notion_async(self, user_input, metadata=None):
+        return await self.notion_agent.handle_task_async(user_input, self.safety_settings, metadata)
 
-    def _handle_slack(self, user_input):
-        return self.slack_agent.handle_task(user_input, self.safety_settings)
+    async def _handle_slack_async(self, user_input, metadata=None):
+        return await self.slack_agent.handle_task_async(user_input, self.safety_settings, metadata)
 
-    def _handle_general(self, user_input):
+    def _general_model(self):
         system_prompt = "You are a helpful AI assistant. Provide clear, concise, and friendly responses."
-        
+        return get_model(system_instruction=system_prompt)
+
+    async def _handle_general_async(self, user_input, metadata=None):
         try:
-            chat_model = genai.GenerativeModel(
-                'gemini-2.5-flash-preview-05-20',
-                system_instruction=system_prompt
-            )
-            response = chat_model.generate_content(
-                user_input,
-                safety_settings=self.safety_settings
+            chat_model = self._general_model()
+            text = await generate_text_async(
+                chat_model, "general", user_input, self.safety_settings,
+                response_cache=self.response_cache, metadata=metadata
             )
             
-            return f"💬 **Response:**\n\n{response.text}"
+            return f"💬 **Response:**\n\n{text}"
         except Exception as e:
-            return f"I can help with various tasks like sending emails, researching topics, or generating reports. What would you like to do?"
+            return self.GENERAL_FALLBACK
+
+    async def _stream_general_async(self, user_input, metadata=None):
+        try:
+            async for chunk in with_header_async("💬 **Response:**\n\n", stream_text_async(
+                self._general_model(), "general", user_input, self.safety_settings,
+                response_cache=self.response_cache, metadata=metadata
+            )):
+                yield chunk
+        except Exception as e:
+            yield self.GENERAL_FALLBACK
 
     def _compile_response(self, result, xp_info, context):
         response = f"{result}\n\n"
@@ -193,15 +508,67 @@ Respond in JSON format with:
         
         return response
     
+    def get_dashboard(self, chat_limit=10, task_limit=50):
+        """
+        Everything the Streamlit tabs render, loaded with one concurrent
+        database snapshot. Returns a read-only Dashboard; XP stats and chat
+        history include writes still in the write-behind queue.
+        """
+        snapshot = None
+        if self.db is not None:
+            snapshot = self.db.get_dashboard_snapshot(self.user_id, chat_limit=chat_limit, task_limit=task_limit)
+        xp_progress = snapshot.xp_progress if snapshot else None
+        agent_metrics = snapshot.agent_metrics if snapshot else ()
+        chat_history = list(snapshot.chat_history) if snapshot else []
+        
+        return Dashboard(
+            xp_stats=MappingProxyType(self.xp_agent.get_stats(progress=xp_progress)),
+            context=MappingProxyType(dict(self.context_manager.get_context())),
+            chat_history=tuple(self._merge_pending_chats(chat_history, chat_limit)),
+            agent_metrics=agent_metrics,
+            task_history=snapshot.task_history if snapshot else (),
+            personality=MappingProxyType(self.paei_personality.get_personality_summary(xp_progress, agent_metrics))
+        )
+
+    def get_activity(self, bucket="day", count=30):
+        """
+        Per-bucket calls, XP, tasks and latency for the last `count` hours or
+        days, oldest first, read from the stored rollups.
+        """
+        if not (self.db and self.user_id):
+            return []
+        return self.db.get_rollups(self.user_id, bucket=bucket, count=count)
+
     def get_xp_stats(self):
         return self.xp_agent.get_stats()
     
     def get_context(self):
         return self.context_manager.get_context()
     
+    def get_routing_stats(self):
+        return self.intent_classifier.get_routing_stats()
+    
+    def get_response_cache_stats(self):
+        return self.response_cache.get_stats()
+    
+    def get_last_response_metadata(self):
+        return self.last_response_metadata
+    
+    def get_write_behind_stats(self):
+        return self.write_behind.get_stats() if self.write_behind is not None else {}
+    
+    def get_intent_cache_stats(self):
+        return self.intent_cache.get_stats()
+    
+    def set_intent_cache_size(self, maxsize):
+        self.intent_cache.resize(maxsize)
+    
     def get_personality_profile(self):
         return self.paei_personality.get_personality_profile()
     
+    def get_personality_summary(self):
+        return self.paei_personality.get_personality_summary()
+
     def get_personality_recommendations(self):
         return self.paei_personality.get_personality_recommendations()
     
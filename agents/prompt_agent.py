@@ -0,0 +1,75 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+from agents.generation import generate_text, generate_text_async, stream_text_async, with_header_async
+
+class PromptAgent:
+    """
+    Base for the sub-agents that answer a request with a single prompt to
+    the model (email, research, calendar, notion, slack). Subclasses set
+    name (the response cache namespace), icon and label, and build the
+    prompt; answering, streaming and error reporting are shared.
+    """
+    name = None
+    icon = None
+    label = None
+
+    def __init__(self, model, response_cache=None):
+        """
+        Initialize the agent with a Gemini model and an optional response cache.
+        """
+        self.model = model
+        self.response_cache = response_cache
+
+    def _build_prompt(self, user_request):
+        raise NotImplementedError
+
+    @property
+    def header(self):
+        # Shown above the answer in the UI
+        return f"{self.icon} **{self.label}:**\n\n"
+
+    def _error(self, e):
+        return f"❌ Error in {self.label}: {str(e)}"
+
+    def handle_task(self, user_request, safety_settings, metadata=None):
+        """
+        Generates a direct response to the request.
+        """
+        try:
+            text = generate_text(
+                self.model, self.name, self._build_prompt(user_request), safety_settings,
+                response_cache=self.response_cache, metadata=metadata
+            )
+            return f"{self.header}{text}"
+        except Exception as e:
+            return self._error(e)
+
+    async def handle_task_async(self, user_request, safety_settings, metadata=None):
+        """
+        Async variant of handle_task.
+        """
+        try:
+            text = await generate_text_async(
+                self.model, self.name, self._build_prompt(user_request), safety_settings,
+                response_cache=self.response_cache, metadata=metadata
+            )
+            return f"{self.header}{text}"
+        except Exception as e:
+            return self._error(e)
+
+    async def stream_task_async(self, user_request, safety_settings, metadata=None):
+        """
+        Streaming variant of handle_task_async: yields the header, then the
+        answer as the model generates it, or only the error message if the
+        model fails or blocks the answer.
+        """
+        try:
+            async for chunk in with_header_async(self.header, stream_text_async(
+                self.model, self.name, self._build_prompt(user_request), safety_settings,
+                response_cache=self.response_cache, metadata=metadata
+            )):
+                yield chunk
+        except Exception as e:
+            yield self._error(e)
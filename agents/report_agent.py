@@ -2,6 +2,8 @@
 # Email: shreyash.v.chougule1903@gmail.com
 # Project: Multi-Agent AI System (MVP)
 
+import asyncio
+
 class ReportAgent:
     def __init__(self, model, db=None, user_id=None):
         """
@@ -18,25 +20,48 @@ class ReportAgent:
         """
         try:
             xp_stats = xp_agent.get_stats()
-            context = context_manager.get_context()
+            agent_metrics = None
+            if self.db and self.user_id:
+                agent_metrics = self.db.get_agent_metrics(self.user_id)
             
-            report = f"📊 **Your Performance Report**\n\n"
-            report += f"Here's a snapshot of your recent activity:\n\n"
-            report += f"- **Level:** {xp_stats['level']}\n"
-            report += f"- **Total XP:** {xp_stats['total_xp']}\n"
-            report += f"- **Tasks Completed:** {xp_stats['tasks_completed']}\n"
-            report += f"- **Current Energy:** {context['energy_level']}/100\n"
-            report += f"- **Current Flow State:** {context['flow_state'].capitalize()}\n\n"
+            return self._format_report(xp_stats, context_manager.get_context(), agent_metrics)
             
+        except Exception as e:
+            return f"❌ Error generating report: {str(e)}"
+
+    async def generate_xp_report_async(self, xp_agent, context_manager):
+        """
+        Async variant of generate_xp_report. Stats and metrics are read concurrently.
+        """
+        try:
             if self.db and self.user_id:
-                agent_metrics = self.db.get_agent_metrics(self.user_id)
-                if agent_metrics:
-                    most_used = agent_metrics[0]
-                    report += f"**Your Top Agent:** `{most_used['agent']}` (called {most_used['calls']} times)."
-                else:
-                    report += "Start completing tasks to see your agent analytics!"
+                xp_stats, agent_metrics = await asyncio.gather(
+                    xp_agent.get_stats_async(),
+                    self.db.get_agent_metrics_async(self.user_id)
+                )
+            else:
+                xp_stats, agent_metrics = await xp_agent.get_stats_async(), None
             
-            return report
+            return self._format_report(xp_stats, context_manager.get_context(), agent_metrics)
             
         except Exception as e:
-            return f"❌ Error generating report: {str(e)}"
\ No newline at end of file
+            return f"❌ Error generating report: {str(e)}"
+
+    def _format_report(self, xp_stats, context, agent_metrics):
+        report = f"📊 **Your Performance Report**\n\n"
+        report += f"Here's a snapshot of your recent activity:\n\n"
+        report += f"- **Level:** {xp_stats['level']}\n"
+        report += f"- **Total XP:** {xp_stats['total_xp']}\n"
+        report += f"- **Tasks Completed:** {xp_stats['tasks_completed']}\n"
+        report += f"- **Current Energy:** {context['energy_level']}/100\n"
+        report += f"- **Current Flow State:** {context['flow_state'].capitalize()}\n\n"
+        
+        # None means there is no database to read metrics from
+        if agent_metrics is not None:
+            if agent_metrics:
+                most_used = agent_metrics[0]
+                report += f"**Your Top Agent:** `{most_used['agent']}` (called {most_used['calls']} times)."
+            else:
+                report += "Start completing tasks to see your agent analytics!"
+        
+        return report
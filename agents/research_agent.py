@@ -2,20 +2,18 @@
 # Email: shreyash.v.chougule1903@gmail.com
 # Project: Multi-Agent AI System (MVP)
 
-import google.generativeai as genai
+from agents.prompt_agent import PromptAgent
 
-class ResearchAgent:
-    def __init__(self, model):
-        """
-        Initialize the agent with a Gemini model.
-        """
-        self.model = model
+class ResearchAgent(PromptAgent):
+    """
+    Generates a direct response to a research-related request.
+    """
+    name = "research"
+    icon = "🔍"
+    label = "Research Agent"
 
-    def handle_task(self, user_request, safety_settings):
-        """
-        Generates a direct response to a research-related request.
-        """
-        prompt = f"""
+    def _build_prompt(self, user_request):
+        return f"""
         You are an autonomous research assistant. Your goal is to EXECUTE the user's request, not ask for clarification.
 
         User Request: '{user_request}'
@@ -28,14 +26,3 @@ class ResearchAgent:
         **Do not ask for more information.** Just perform the task.
         Provide *only* the research findings.
         """
-        
-        try:
-            response = self.model.generate_content(
-                prompt,
-                safety_settings=safety_settings
-            )
-            
-            # Add a header for clarity in the UI
-            return f"🔍 **Research Agent:**\n\n{response.text}"
-        except Exception as e:
-            return f"❌ Error in Research Agent: {str(e)}"
\ No newline at end of file
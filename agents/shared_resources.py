@@ -0,0 +1,110 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import importlib
+import threading
+
+from agents.intent_classifier import IntentClassifier, DEFAULT_MODEL_PATH
+from agents.model_registry import configure, get_model
+from cache import LRUCache
+from response_cache import ResponseCache
+
+# Stateless sub-agents by name: (module, class). Each is imported and built
+# the first time a request routes to it.
+AGENT_REGISTRY = {
+    "email": ("agents.email_agent", "EmailAgent"),
+    "research": ("agents.research_agent", "ResearchAgent"),
+    "calendar": ("agents.calendar_agent", "CalendarAgent"),
+    "notion": ("agents.notion_agent", "NotionAgent"),
+    "slack": ("agents.slack_agent", "SlackAgent")
+}
+
+class SharedResources:
+    """
+    The stateless parts of a ParentAgent: the model handle, the sub-agents
+    that hold no user data, the intent router and its cache, and the
+    generation settings. One instance can serve every session in the
+    process, so a session only pays for its own user-specific state.
+
+    Everything except the intent cache is built on first use, so importing
+    and constructing this costs nothing until a request needs the pieces.
+    """
+    def __init__(self, google_api_key=None, response_cache=None,
+                 intent_model_path=DEFAULT_MODEL_PATH, intent_confidence_threshold=0.85,
+                 intent_cache_size=256, intent_cache_ttl=3600):
+        configure(google_api_key)
+
+        self.intent_model_path = intent_model_path
+        self.intent_confidence_threshold = intent_confidence_threshold
+        self._response_cache = response_cache
+        self._agents = {}
+        self._lazy = {}
+        self._lock = threading.RLock()
+
+        # LLM intent results, keyed on normalized input + coarse context
+        self.intent_cache = LRUCache(maxsize=intent_cache_size, ttl=intent_cache_ttl)
+
+    def _get_or_build(self, name, build):
+        with self._lock:
+            if name not in self._lazy:
+                self._lazy[name] = build()
+            return self._lazy[name]
+
+    @property
+    def model(self):
+        # Shared across sessions (see agents/model_registry.py)
+        return get_model()
+
+    @property
+    def response_cache(self):
+        """Shared two-tier cache for generated responses."""
+        if self._response_cache is None:
+            self._response_cache = self._get_or_build("response_cache", ResponseCache)
+        return self._response_cache
+
+    @property
+    def intent_classifier(self):
+        """Local fast-path router; falls back to the LLM when unsure or untrained."""
+        def build():
+            return IntentClassifier.load(
+                self.intent_model_path,
+                confidence_threshold=self.intent_confidence_threshold
+            )
+        return self._get_or_build("intent_classifier", build)
+
+    @property
+    def safety_settings(self):
+        """Less restrictive safety settings for every generation call."""
+        def build():
+            from google.generativeai.types import HarmCategory, HarmBlockThreshold
+            return {
+                HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+                HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+            }
+        return self._get_or_build("safety_settings", build)
+
+    @property
+    def json_generation_config(self):
+        """Generation config to ensure JSON output where needed."""
+        def build():
+            import google.generativeai as genai
+            return genai.GenerationConfig(response_mime_type="application/json")
+        return self._get_or_build("json_generation_config", build)
+
+    def get_agent(self, name):
+        """Returns the shared sub-agent registered under name, building it on first use."""
+        with self._lock:
+            agent = self._agents.get(name)
+            if agent is None:
+                module_name, class_name = AGENT_REGISTRY[name]
+                agent_class = getattr(importlib.import_module(module_name), class_name)
+                agent = agent_class(model=self.model, response_cache=self.response_cache)
+                self._agents[name] = agent
+            return agent
+
+    def loaded_agents(self):
+        with self._lock:
+            return sorted(self._agents)
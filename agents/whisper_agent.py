@@ -3,33 +3,151 @@
 # Project: Multi-Agent AI System (MVP)
 
 import os
-from openai import OpenAI
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from transcription_cache import TranscriptionCache
 
 class WhisperAgent:
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, preprocess=True, audio_format="wav", transcription_cache=None,
+                 transcriber=None, chunk_seconds=60, max_workers=4):
         """
         Initialize the WhisperAgent with an OpenAI API key.
+        With preprocess on, recordings are downmixed, resampled to 16 kHz
+        and silence-trimmed in memory before upload (see
+        agents/audio_preprocessing.py). Transcripts are cached by audio
+        content; pass a TranscriptionCache with a path to keep them on disk.
+
+        Recordings longer than chunk_seconds are split into overlapping
+        chunks and transcribed up to max_workers at a time (see
+        agents/chunked_transcription.py). transcriber(filename, audio_bytes)
+        replaces the Whisper API call, e.g. with benchmarks.fakes.FakeTranscriber.
         """
-        if api_key is None:
-            raise ValueError("OpenAI API key is required for WhisperAgent")
-        
-        # Initialize the OpenAI client *only* for transcription
-        self.client = OpenAI(api_key=api_key)
+        self.client = None
+        if transcriber is None:
+            if api_key is None:
+                raise ValueError("OpenAI API key is required for WhisperAgent")
+
+            # Initialize the OpenAI client *only* for transcription.
+            # Imported here so text-only sessions never load the SDK.
+            from openai import OpenAI
+            self.client = OpenAI(api_key=api_key)
+            transcriber = self._whisper_transcribe
+        self.transcriber = transcriber
+        self.chunk_seconds = chunk_seconds
+        self.max_workers = max_workers
+        self._chunk_executor = None
 
-    def transcribe_audio(self, audio_file_path):
+        self.preprocess = preprocess
+        self.audio_format = audio_format
+        self.transcription_cache = transcription_cache if transcription_cache is not None else TranscriptionCache()
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "input_bytes": 0, "output_bytes": 0, "bytes_saved": 0, "skipped_silent": 0}
+
+    def transcribe_audio(self, audio):
         """
-        Transcribes audio using the Whisper-1 model.
+        Transcribes audio using the Whisper-1 model. audio is either raw
+        recorded bytes or a path to an audio file. The result carries the
+        preprocessing figures (bytes saved etc.) under "preprocessing",
+        "cached" (None, "memory" or "disk") when the same recording was
+        transcribed before, and for chunked recordings the per-chunk
+        latencies and wall time under "chunks".
         """
         try:
-            with open(audio_file_path, "rb") as audio_file:
-                transcription = self.client.audio.transcriptions.create(
-                    model="whisper-1", 
-                    file=audio_file
-                )
-            
+            if isinstance(audio, (bytes, bytearray)):
+                data = bytes(audio)
+                filename = "audio.wav"
+            else:
+                with open(audio, "rb") as audio_file:
+                    data = audio_file.read()
+                filename = os.path.basename(audio)
+
+            # Keyed on the recording as received, so a hit skips preprocessing too
+            cache_key = self.transcription_cache.make_key(
+                data, options={"preprocess": self.preprocess, "format": self.audio_format}
+            )
+            entry, tier = self.transcription_cache.get(cache_key)
+            if entry is not None:
+                return {"status": "success", "transcription": entry["text"], "preprocessing": None, "cached": tier, "chunks": None}
+
+            prepared = None
+            if self.preprocess:
+                from agents.audio_preprocessing import preprocess_audio
+                prepared = preprocess_audio(data, audio_format=self.audio_format)
+                data = prepared["audio"]
+                # Passed-through audio keeps its own name, e.g. an .mp3 path
+                filename = prepared["filename"] or filename
+                self._record(prepared)
+                if not prepared["speech"]:
+                    return {"status": "error", "message": "No speech detected in the recording.", "preprocessing": self._report(prepared)}
+
+            audio_seconds = None
+            if prepared and prepared["duration_s"] is not None:
+                audio_seconds = prepared["duration_s"] - prepared["trimmed_s"]
+
+            started = time.perf_counter()
+            chunks = None
+            if audio_seconds is not None and audio_seconds > self.chunk_seconds:
+                chunks = self._transcribe_chunked(prepared["samples"], prepared["sample_rate"])
+                text = chunks.pop("text")
+            else:
+                text = self.transcriber(filename, data)
+            latency_ms = (time.perf_counter() - started) * 1000
+
+            self.transcription_cache.set(cache_key, text, audio_seconds=audio_seconds, latency_ms=latency_ms)
+
             return {
                 "status": "success",
-                "transcription": transcription.text
+                "transcription": text,
+                "preprocessing": self._report(prepared),
+                "cached": None,
+                "chunks": chunks
             }
         except Exception as e:
-            return {"status": "error", "message": str(e)}
\ No newline at end of file
+            return {"status": "error", "message": str(e)}
+
+    def _whisper_transcribe(self, filename, audio_bytes):
+        transcription = self.client.audio.transcriptions.create(
+            model="whisper-1",
+            file=(filename, audio_bytes)
+        )
+        return transcription.text
+
+    def _chunk_pool(self):
+        # Shared by every session, so it also bounds concurrent Whisper calls
+        with self._lock:
+            if self._chunk_executor is None:
+                self._chunk_executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="whisper-chunk")
+            return self._chunk_executor
+
+    def _transcribe_chunked(self, samples, rate):
+        from agents.chunked_transcription import ChunkedTranscriber
+        transcriber = ChunkedTranscriber(
+            self.transcriber, self._chunk_pool(),
+            chunk_seconds=self.chunk_seconds, audio_format=self.audio_format
+        )
+        return transcriber.transcribe(samples, rate)
+
+    def _report(self, prepared):
+        if prepared is None:
+            return None
+        return {key: value for key, value in prepared.items() if key not in ("audio", "samples")}
+
+    def _record(self, prepared):
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["input_bytes"] += prepared["input_bytes"]
+            self._stats["output_bytes"] += prepared["output_bytes"]
+            self._stats["bytes_saved"] += prepared["bytes_saved"]
+            if not prepared["speech"]:
+                self._stats["skipped_silent"] += 1
+
+    def get_cache_stats(self):
+        """Whisper calls, seconds of audio and latency avoided by the transcription cache."""
+        return self.transcription_cache.get_stats()
+
+    def get_preprocessing_stats(self):
+        """Upload bytes saved by preprocessing since startup, across all sessions."""
+        with self._lock:
+            return dict(self._stats)
@@ -2,14 +2,20 @@
 # Email: shreyash.v.chougule1903@gmail.com
 # Project: Multi-Agent AI System (MVP)
 
-import math
+import threading
+
+from agents.level_curve import get_level_curve
 
 class XPAgent:
     """
     Manages all logic for experience points (XP), leveling, and tasks.
     It communicates with the database but contains no AI model itself.
     """
-    def __init__(self, db=None, user_id=None):
+    def __init__(self, db=None, user_id=None, baseline=None):
+        """
+        baseline: {"total_xp", "tasks_completed"} already known to be in the
+        DB (e.g. cached by the session), so the first reservation skips a read.
+        """
         self.db = db
         self.user_id = user_id
         
@@ -26,47 +32,169 @@ class XPAgent:
             "report": 75,     # e.g., generating a report
             "complex": 100    # e.g., calendar, notion
         }
+        
+        # Optimistic overlay for XP whose write is still queued (read-your-writes)
+        self._lock = threading.Lock()
+        self._confirmed = None  # Last raw totals known to be in the DB
+        if baseline is not None:
+            self._confirmed = {"total_xp": baseline['total_xp'], "tasks_completed": baseline['tasks_completed']}
+        self._pending_xp = 0
+        self._pending_tasks = 0
+
+    @property
+    def level_curve(self):
+        """Shared precomputed curve for the current base XP and multiplier."""
+        return get_level_curve(self.base_xp, self.level_multiplier)
 
     def get_xp_for_level(self, level):
         """
-        Calculates the total XP needed to reach a specific level.
-        Formula: base_xp * (multiplier ^ (level - 1))
+        Calculates the XP needed to go from the previous level to this one.
+        Each step is int(previous_step * multiplier), starting at base_xp.
+        """
+        return self.level_curve.xp_for_level(level)
+
+    def get_total_xp_for_level(self, level):
+        """
+        Calculates the total XP at which a specific level is reached.
         """
-        if level <= 1:
-            return 0
-        return int(self.base_xp * math.pow(self.level_multiplier, level - 2))
+        return self.level_curve.total_xp_for_level(level)
 
     def get_current_level_progress(self, total_xp):
         """
         Calculates the user's current level based on their total XP.
         """
-        level = 1
-        xp_needed = self.base_xp
-        
-        while total_xp >= xp_needed:
-            total_xp -= xp_needed
-            level += 1
-            xp_needed = int(xp_needed * self.level_multiplier)
-            
-        return level, total_xp, xp_needed # level, xp_into_current_level, xp_needed_for_next_level
+        return self.level_curve.level_progress(total_xp) # level, xp_into_current_level, xp_needed_for_next_level
 
-    def get_stats(self):
+    def get_bulk_level_progress(self, total_xp_values):
+        """
+        Vectorized level lookup for many users at once (leaderboards,
+        analytics). Returns NumPy arrays:
+        (levels, xp_into_level, xp_for_next_level, progress_percent).
+        """
+        return self.level_curve.bulk_level_progress(total_xp_values)
+
+    def get_stats(self, progress=None):
         """
         Fetches current stats from the DB and calculates progress.
+        An xp_progress record that was already loaded (e.g. from a dashboard
+        snapshot) can be passed to skip the read.
         """
         if not self.db or not self.user_id:
-            return {
-                "level": 1, "total_xp": 0, "tasks_completed": 0,
-                "xp_to_next_level": self.base_xp, "progress_percent": 0
-            }
+            return self._default_stats()
+        
+        pending = self._pending_stats()
+        if pending is not None:
+            return pending
             
-        stats = self.db.get_xp_progress(self.user_id)
+        return self._read_stats(progress=progress)
+
+    def _pending_stats(self):
+        """
+        The optimistic stats while XP writes are still queued, so reads see
+        the user's own writes; None when nothing is pending.
+        """
+        with self._lock:
+            if self._pending_tasks:
+                return self._build_stats(self._optimistic_record())
+        return None
+
+    def _read_stats(self, confirm=True, progress=None):
+        stats = self.db.get_xp_progress(self.user_id) if progress is None else progress
+        if confirm:
+            self._confirm(stats)
+        return self._build_stats(stats)
+
+    def _confirm(self, stats):
+        with self._lock:
+            self._confirmed = {"total_xp": stats['total_xp'], "tasks_completed": stats['tasks_completed']}
+
+    def get_baseline(self):
+        """The confirmed XP totals, or None before the first read."""
+        with self._lock:
+            return dict(self._confirmed) if self._confirmed is not None else None
+
+    def _optimistic_record(self):
+        return {
+            "total_xp": self._confirmed['total_xp'] + self._pending_xp,
+            "tasks_completed": self._confirmed['tasks_completed'] + self._pending_tasks
+        }
+
+    def reserve_xp(self, xp_earned):
+        """
+        Applies XP locally ahead of its queued write and returns the stats the
+        user will have once it is written. Until settle_xp is called,
+        get_stats returns these optimistic values instead of reading the DB.
+        """
+        if not self.db or not self.user_id:
+            stats = self._default_stats()
+            stats['xp_earned'] = xp_earned
+            return stats
         
+        if self._confirmed is None:
+            self._read_stats()
+        
+        with self._lock:
+            self._pending_xp += xp_earned
+            self._pending_tasks += 1
+            record = self._optimistic_record()
+        
+        stats = self._build_stats(record)
+        stats['xp_earned'] = xp_earned
+        return stats
+
+    def stage_xp(self, unit_of_work, xp_earned, task_type, task_number=None):
+        """
+        Adds this task's XP update and history entry to a Database unit of work.
+        task_number is the task count reserve_xp returned for it.
+        """
+        return unit_of_work.add_xp(xp_earned, task_type, level_for_xp=self.get_level_for_xp, task_number=task_number)
+
+    def get_level_for_xp(self, total_xp):
+        level, _, _ = self.get_current_level_progress(total_xp)
+        return level
+
+    def settle_xp(self, xp_earned, new_stats=None):
+        """
+        Removes a reserved task from the overlay once its write has run.
+        new_stats (the xp_progress aggregate of the committed unit of work)
+        becomes the new confirmed baseline.
+        """
+        with self._lock:
+            self._pending_xp -= xp_earned
+            self._pending_tasks -= 1
+            if new_stats is not None:
+                self._confirmed = {"total_xp": new_stats['total_xp'], "tasks_completed": new_stats['tasks_completed']}
+
+    async def get_stats_async(self):
+        """
+        Async variant of get_stats, with the same overlay of queued XP.
+        """
+        if not self.db or not self.user_id:
+            return self._default_stats()
+            
+        pending = self._pending_stats()
+        if pending is not None:
+            return pending
+
+        stats = await self.db.get_xp_progress_async(self.user_id)
+        self._confirm(stats)
+        return self._build_stats(stats)
+
+    def _default_stats(self):
+        return {
+            "level": 1, "total_xp": 0, "tasks_completed": 0,
+            "xp_to_next_level": self.base_xp, "progress_percent": 0
+        }
+
+    def _build_stats(self, stats):
+        """
+        Derives level and progress from a raw xp_progress record.
+        """
         level, xp_in_level, xp_for_next = self.get_current_level_progress(stats['total_xp'])
         
         progress_percent = 0
         if xp_for_next > 0:
-            progress_percent = math.floor((xp_in_level / xp_for_next) * 100)
+            progress_percent = (xp_in_level * 100) // xp_for_next
             
         return {
             "level": level,
@@ -81,44 +209,3 @@ class XPAgent:
         Returns the appropriate XP for a given task type.
         """
         return self.task_xp_rewards.get(task_type, self.task_xp_rewards['simple'])
-
-    def add_xp(self, xp_earned, task_type):
-        """
-        Adds XP to the user, updates their stats, and logs the task.
-        """
-        if not self.db or not self.user_id:
-            return self.get_stats()
-            
-        # 1. Get current stats from DB
-        current_stats = self.db.get_xp_progress(self.user_id)
-        
-        # 2. Calculate new totals
-        new_total_xp = current_stats.get('total_xp', 0) + xp_earned
-        new_tasks_completed = current_stats.get('tasks_completed', 0) + 1
-        
-        # 3. Calculate new level
-        new_level, _, _ = self.get_current_level_progress(new_total_xp)
-        
-        # 4. Update the database
-        self.db.update_xp_progress(
-            self.user_id, 
-            new_total_xp, 
-            new_level, 
-            new_tasks_completed
-        )
-        
-        # 5. Add the specific task to history
-        self.db.add_task_to_history(
-            self.user_id,
-            task_type,
-            xp_earned,
-            new_tasks_completed
-        )
-        
-        # 6. Get the new stats
-        new_stats = self.get_stats()
-        
-        # 7. Add the 'xp_earned' to the stats to be returned
-        new_stats['xp_earned'] = xp_earned
-        
-        return new_stats
\ No newline at end of file
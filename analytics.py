@@ -0,0 +1,144 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Chart data for the Analytics, XP and PAEI tabs, computed with pandas/NumPy
+in one pass, plus a cache of the built Plotly figures. Figures are keyed
+on a data version (user, tasks completed, total XP and the newest agent
+update), so a rerun with unchanged data reuses the serialized figure
+instead of rebuilding it. pandas and Plotly are imported on first use.
+"""
+
+from cache import LRUCache
+from rollups import COUNTERS
+
+def data_version(user_id, xp_stats, agent_metrics):
+    """
+    Changes whenever a request is recorded for the user: every handled
+    request bumps tasks_completed and the agent's last_used time.
+    """
+    last_used = [m['last_used'] for m in agent_metrics if m.get('last_used') is not None]
+    return (user_id, xp_stats['tasks_completed'], xp_stats['total_xp'], max(last_used, default=None))
+
+def agent_frame(agent_metrics):
+    """Per-agent totals with the average XP per call, most used first."""
+    import numpy as np
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(
+        [dict(m) for m in agent_metrics], columns=['agent', 'calls', 'xp_generated', 'last_used']
+    )
+    frame[['calls', 'xp_generated']] = frame[['calls', 'xp_generated']].fillna(0)
+    calls = frame['calls'].to_numpy(dtype=float)
+    xp = frame['xp_generated'].to_numpy(dtype=float)
+    frame['avg_xp'] = np.round(np.divide(xp, calls, out=np.zeros_like(xp), where=calls > 0), 1)
+    return frame.sort_values('calls', ascending=False, kind='stable').reset_index(drop=True)
+
+def activity_frame(activity):
+    """Long-format rollup counters, one row per (bucket start, agent)."""
+    import pandas as pd
+
+    return pd.DataFrame.from_records(
+        [dict(counters, start=rollup['start'], agent=agent)
+         for rollup in activity for agent, counters in rollup['agents'].items()],
+        columns=['start', 'agent'] + list(COUNTERS)
+    ).fillna(0)
+
+def latency_frame(activity):
+    """Average latency per bucket across all agents; buckets without timings are dropped."""
+    import pandas as pd
+
+    frame = pd.DataFrame.from_records(
+        [{'start': r['start'], 'sum': r.get('latency_ms_sum', 0), 'count': r.get('latency_count', 0)}
+         for r in activity],
+        columns=['start', 'sum', 'count']
+    )
+    frame = frame[frame['count'] > 0]
+    return frame.assign(avg_latency_ms=(frame['sum'] / frame['count']).round(1))[['start', 'avg_latency_ms']]
+
+def xp_curve_frame(daily, total_xp):
+    """
+    Cumulative XP per day from daily rollups. The curve ends at the current
+    total, so it starts at the total minus the XP gained in the range.
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame({
+        'Date': [rollup['start'] for rollup in daily],
+        'XP Earned': [rollup['xp'] for rollup in daily]
+    })
+    frame['Cumulative XP'] = total_xp - frame['XP Earned'].sum() + frame['XP Earned'].cumsum()
+    return frame
+
+# --- Figures ---
+
+def usage_pie(frame):
+    import plotly.express as px
+    return px.pie(frame, values='calls', names='agent', title="Agent Calls by Type")
+
+def xp_bar(frame):
+    import plotly.graph_objects as go
+    figure = go.Figure(data=[go.Bar(x=frame['agent'], y=frame['xp_generated'], marker_color='lightblue')])
+    figure.update_layout(
+        title="Total XP Generated per Agent",
+        xaxis_title="Agent Type",
+        yaxis_title="XP Generated"
+    )
+    return figure
+
+def calls_over_time(frame, title):
+    import plotly.express as px
+    return px.bar(
+        frame, x='start', y='calls', color='agent', title=title,
+        labels={'start': "Time", 'calls': "Calls", 'agent': "Agent"}
+    )
+
+def latency_over_time(frame):
+    import plotly.express as px
+    return px.line(
+        frame, x='start', y='avg_latency_ms', title="Average Response Latency", markers=True,
+        labels={'start': "Time", 'avg_latency_ms': "Avg Latency (ms)"}
+    )
+
+def xp_curve(frame):
+    import plotly.express as px
+    return px.line(frame, x='Date', y='Cumulative XP', title="XP Growth Curve", markers=True)
+
+def paei_radar(scores):
+    import plotly.graph_objects as go
+    figure = go.Figure()
+    figure.add_trace(go.Scatterpolar(
+        r=list(scores.values()),
+        theta=list(scores.keys()),
+        fill='toself',
+        name='Your Profile'
+    ))
+    figure.update_layout(
+        polar=dict(radialaxis=dict(visible=True, range=[0, 50])),
+        showlegend=False,
+        height=400
+    )
+    return figure
+
+class FigureCache:
+    """
+    Process-wide cache of built figures as plain dicts (the serialized
+    form st.plotly_chart accepts). Keys combine the chart name, a data
+    version and any view options, so stale figures are never looked up
+    again and simply age out of the LRU.
+    """
+    def __init__(self, maxsize=512, ttl=3600):
+        self._cache = LRUCache(maxsize=maxsize, ttl=ttl)
+
+    def get_or_build(self, key, build):
+        """Returns the cached figure for key, or calls build() and caches its result."""
+        figure = self._cache.get(key)
+        if figure is None:
+            figure = build()
+            figure = figure.to_dict() if hasattr(figure, 'to_dict') else figure
+            self._cache.set(key, figure)
+        return figure
+
+    def get_stats(self):
+        return self._cache.get_stats()
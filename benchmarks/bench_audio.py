@@ -0,0 +1,57 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Upload size and preprocessing time for WhisperAgent recordings, on a
+synthetic stereo 44.1 kHz 16-bit WAV (what st_audiorec produces): a
+voiced tone burst with silence and low noise before and after it.
+Usage: python -m benchmarks.bench_audio [--seconds 8] [--silence 1.5]
+"""
+
+import io
+import wave
+import argparse
+import timeit
+
+import numpy as np
+
+from agents.audio_preprocessing import preprocess_audio, encode_wav
+
+def synthetic_recording(seconds, silence, rate=44100, seed=7):
+    """Stereo WAV bytes: `silence` s of noise, speech-like harmonics, then noise."""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * rate)
+    t = np.arange(total) / rate
+    voiced = (t >= silence) & (t < seconds - silence)
+    # 140 Hz fundamental with harmonics, amplitude-modulated like syllables
+    speech = sum(np.sin(2 * np.pi * 140 * k * t) / k for k in range(1, 6))
+    speech *= 0.3 * (0.6 + 0.4 * np.sin(2 * np.pi * 4 * t))
+    mono = np.where(voiced, speech, 0) + rng.normal(0, 2e-4, total)
+    stereo = np.stack([mono, mono * 0.9], axis=1).astype(np.float32)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(2)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes((np.clip(stereo, -1, 1) * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seconds", type=float, default=8.0)
+    parser.add_argument("--silence", type=float, default=1.5, help="Seconds of silence at each end")
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    recording = synthetic_recording(args.seconds, args.silence)
+    for label, options in (("mono 16 kHz", {"trim": False}), ("mono 16 kHz + trim", {"trim": True})):
+        result = preprocess_audio(recording, **options)
+        seconds = timeit.timeit(lambda: preprocess_audio(recording, **options), number=args.runs)
+        print(f"{label:<20} {result['input_bytes'] / 1024:>8.0f} KB -> {result['output_bytes'] / 1024:>6.0f} KB "
+              f"({result['output_bytes'] / result['input_bytes']:.1%}), "
+              f"trimmed {result['trimmed_s']:.2f}s, {seconds * 1000 / args.runs:.1f} ms/recording")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Compares the precomputed level curve against the original per-level loop.
+Usage: python -m benchmarks.bench_level_curve [--users 100000]
+"""
+
+import random
+import argparse
+import timeit
+
+from agents.level_curve import LevelCurve
+
+def legacy_level_progress(total_xp, base_xp=100, multiplier=1.5):
+    """The original XPAgent.get_current_level_progress loop, kept for comparison."""
+    level = 1
+    xp_needed = base_xp
+    while total_xp >= xp_needed:
+        total_xp -= xp_needed
+        level += 1
+        xp_needed = int(xp_needed * multiplier)
+    return level, total_xp, xp_needed
+
+def _report(name, seconds, count):
+    print(f"{name:<28} {seconds * 1e9 / count:>10.1f} ns/lookup  ({seconds:.3f}s for {count:,})")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--max-xp", type=int, default=250000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    values = [rng.randint(0, args.max_xp) for _ in range(args.users)]
+    curve = LevelCurve()
+
+    legacy = timeit.timeit(lambda: [legacy_level_progress(v) for v in values], number=1)
+    _report("legacy loop", legacy, len(values))
+
+    scalar = timeit.timeit(lambda: [curve.level_progress(v) for v in values], number=1)
+    _report("binary search", scalar, len(values))
+
+    try:
+        import numpy as np
+    except ImportError:
+        print("numpy not installed; skipping the bulk benchmark")
+        return
+
+    array = np.asarray(values)
+    bulk = timeit.timeit(lambda: curve.bulk_level_progress(array), number=1)
+    _report("numpy bulk", bulk, len(values))
+
+    # The curve compounds its steps like the loop, so every level should agree
+    levels = curve.bulk_level_progress(array)[0]
+    mismatches = sum(1 for v, level in zip(values, levels) if legacy_level_progress(v)[0] != level)
+    print(f"level mismatches vs legacy loop: {mismatches:,} of {len(values):,}")
+
+if __name__ == "__main__":
+    main()
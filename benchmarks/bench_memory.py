@@ -0,0 +1,102 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Bytes of Python heap per Streamlit session, measured with tracemalloc
+against the fake Gemini model and the in-memory database.
+
+  standalone  - a self-contained ParentAgent per session (the old layout)
+  shared      - a ParentAgent built on process-wide SharedResources
+  evicted     - only the SessionState left after the agent was evicted
+
+Usage:
+  python -m benchmarks.bench_memory [--sessions 200]
+"""
+
+import os
+import gc
+import argparse
+import tempfile
+import tracemalloc
+
+from agents import model_registry
+from agents.parent_agent import ParentAgent
+from agents.shared_resources import SharedResources
+from response_cache import ResponseCache
+from sessions import SessionState, SessionRegistry
+from benchmarks.fakes import InMemoryDatabase, fake_model_factory
+
+def _bytes_per_session(build, sessions):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        kept = [build(number) for number in range(sessions)]
+        gc.collect()
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del kept
+    return int((after - before) / sessions)
+
+def _warm(agent):
+    # One dashboard load, as every rerun does, so lazily built state exists
+    agent.get_dashboard(chat_limit=0)
+    return agent
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=200)
+    args = parser.parse_args()
+
+    model_registry.set_model_factory(fake_model_factory(latency=0))
+    db = InMemoryDatabase()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        intent_model_path = os.path.join(cache_dir, "no_intent_model.json")
+        response_cache = ResponseCache(path=os.path.join(cache_dir, "responses.sqlite3"))
+
+        def standalone(number):
+            return _warm(ParentAgent(
+                db=db, user_id=f"standalone-{number}", intent_model_path=intent_model_path,
+                response_cache=ResponseCache(path=os.path.join(cache_dir, "responses.sqlite3")),
+                write_behind=False
+            ))
+
+        resources = SharedResources(response_cache=response_cache, intent_model_path=intent_model_path)
+
+        def build_agent(state):
+            return ParentAgent(
+                db=db, user_id=state.user_id, resources=resources, context=state.context,
+                xp_baseline=state.stats, write_behind=False
+            )
+
+        registry = SessionRegistry(build_agent, max_sessions=args.sessions * 2)
+
+        def shared(number):
+            state = SessionState(f"shared-{number}", user_id=f"shared-{number}")
+            agent = _warm(registry.get_agent(state))
+            registry.save(state, agent)
+            return state
+
+        def evicted(number):
+            state = shared(number)
+            registry.evict(state.session_id)
+            return state
+
+        results = {
+            "standalone": _bytes_per_session(standalone, args.sessions),
+            "shared": _bytes_per_session(shared, args.sessions),
+            "evicted": _bytes_per_session(evicted, args.sessions)
+        }
+
+    model_registry.set_model_factory(None)
+
+    print(f"{'layout':<12} {'bytes/session':>14}")
+    for name, value in results.items():
+        print(f"{name:<12} {value:>14,}")
+    print(f"\nshared vs standalone: {results['shared'] / results['standalone']:.1%} of the memory per session")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Cold-start benchmarks, each run in a fresh interpreter:
+
+  import.<module>  cumulative import time from `python -X importtime`
+  first_render     import + shared resources + session agent + first
+                   dashboard load, i.e. what the first Streamlit run pays
+  rerun            a later rerun in the same process (agent from the
+                   session registry + dashboard load)
+
+Rendering uses the fake Gemini model and the in-memory database, so no
+keys or network are needed; imports are of the real modules.
+
+Usage:
+  python -m benchmarks.bench_startup [--runs 5] [--save PATH] [--compare PATH]
+"""
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from benchmarks.harness import (
+    summarize, build_report, save_report, load_report,
+    compare_reports, print_results, print_comparison
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_TARGETS = (
+    "agents.parent_agent",
+    "agents.shared_resources",
+    "storage",
+    "sessions",
+    "pagination"
+)
+
+# Runs in the child interpreter; prints timings in ms as JSON
+RENDER_SCRIPT = """
+import json, time
+start = time.perf_counter()
+from agents import model_registry
+from agents.parent_agent import ParentAgent
+from agents.shared_resources import SharedResources
+from sessions import SessionState, SessionRegistry
+from benchmarks.fakes import InMemoryDatabase, fake_model_factory
+imported = time.perf_counter()
+
+model_registry.set_model_factory(fake_model_factory(latency=0))
+db = InMemoryDatabase()
+db.seed_user("startup", agent_calls={"research": 4, "email": 2}, tasks=20, chats=10)
+resources = SharedResources(intent_model_path="__no_intent_model__.json")
+registry = SessionRegistry(lambda state: ParentAgent(
+    db=db, user_id=state.user_id, resources=resources, context=state.context,
+    xp_baseline=state.stats, write_behind=False
+))
+state = SessionState("startup", user_id="startup")
+
+def render():
+    agent = registry.get_agent(state)
+    agent.get_dashboard(chat_limit=0)
+    registry.save(state, agent)
+
+render()
+rendered = time.perf_counter()
+render()
+rerun = time.perf_counter()
+
+print(json.dumps({
+    "imports": (imported - start) * 1000,
+    "first_render": (rendered - start) * 1000,
+    "rerun": (rerun - rendered) * 1000
+}))
+"""
+
+def _importtime(module):
+    """(self_ms, cumulative_ms, name) rows of `python -X importtime -c "import module"`."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, timeout=120, cwd=ROOT
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{completed.stderr[-2000:]}")
+
+    # Lines look like: "import time:  self [us] | cumulative | imported package"
+    rows = []
+    for line in completed.stderr.splitlines():
+        parts = line[len("import time:"):].split("|")
+        if line.startswith("import time:") and len(parts) == 3 and parts[0].strip().isdigit():
+            rows.append((int(parts[0]) / 1000, int(parts[1]) / 1000, parts[2].strip()))
+    return rows
+
+def import_time_ms(module):
+    """Cumulative import time of module in a fresh interpreter."""
+    for _, cumulative_ms, name in _importtime(module):
+        if name == module:
+            return cumulative_ms
+    raise RuntimeError(f"no -X importtime entry for {module}")
+
+def heaviest_imports(module, top=8):
+    """The modules contributing the most self time when importing module."""
+    rows = sorted(((self_ms, name) for self_ms, _, name in _importtime(module)), reverse=True)
+    return rows[:top]
+
+def render_times_ms():
+    completed = subprocess.run(
+        [sys.executable, "-c", RENDER_SCRIPT], capture_output=True, text=True, timeout=120, cwd=ROOT
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"render script failed:\n{completed.stderr[-2000:]}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--save", default=None, help="Write results to this JSON baseline")
+    parser.add_argument("--compare", default=None, help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0, help="Ignore latency changes smaller than this")
+    args = parser.parse_args()
+
+    samples = {}
+    for module in IMPORT_TARGETS:
+        samples[f"import.{module}"] = [import_time_ms(module) for _ in range(args.runs)]
+    for _ in range(args.runs):
+        for name, value in render_times_ms().items():
+            samples.setdefault(f"startup.{name}", []).append(value)
+
+    results = {name: summarize(values) for name, values in samples.items()}
+    print_results(results)
+
+    print("\nheaviest imports under agents.parent_agent (self ms):")
+    for self_ms, name in heaviest_imports("agents.parent_agent"):
+        print(f"  {self_ms:>8.2f}  {name}")
+
+    report = build_report(results, {"runs": args.runs, "python": sys.executable})
+    if args.save:
+        save_report(report, args.save)
+        print(f"\nsaved baseline to {args.save}")
+
+    if args.compare:
+        baseline = load_report(args.compare)
+        rows, regressions = compare_reports(
+            report, baseline, threshold=args.threshold, min_delta_ms=args.min_delta_ms
+        )
+        print_comparison(rows, regressions, baseline)
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Offline micro-benchmarks for the request and dashboard paths, run against
+the fake Gemini model and the in-memory database (no keys or network).
+Reports p50/p95/p99 latency and allocations per operation. Every
+handle_request response is checked to be a real answer; the run exits
+non-zero if one is error or fallback text.
+
+Usage:
+  python -m benchmarks.bench_suite [--save benchmarks/baselines/<name>.json]
+                                   [--compare benchmarks/baselines/<name>.json]
+"""
+
+import os
+import random
+import argparse
+import tempfile
+import itertools
+
+from agents import model_registry
+from agents.parent_agent import ParentAgent
+from agents.paei_personality import PAEIPersonality
+from agents.xp_agent import XPAgent
+from response_cache import ResponseCache
+from benchmarks.fakes import InMemoryDatabase, fake_model_factory
+from benchmarks.harness import (
+    measure, build_report, save_report, load_report,
+    compare_reports, print_results, print_comparison
+)
+
+PROMPTS = (
+    "send an email to the team about the release",
+    "research the latest multi-agent frameworks",
+    "generate my performance report",
+    "schedule a meeting with design on friday",
+    "create a notion page for sprint notes",
+    "post a slack message to the team channel",
+    "what is a good way to stay focused"
+)
+
+INTENT_OUTPUTS = (
+    '{"agent": "research", "parameters": {"query": "agent frameworks"}, "reasoning": "lookup"}',
+    '```json\n{"agent": "email", "parameters": {"recipient": "team"}, "reasoning": "email"}\n```',
+    '{"agent": "weather", "parameters": {}, "reasoning": "unknown agent"}'
+)
+
+SEEDED_AGENT_CALLS = {"research": 40, "report": 8, "email": 25, "calendar": 12, "notion": 9, "general": 30, "slack": 6}
+
+# Separates the agent's answer from the XP footer in a compiled response
+FOOTER_SEPARATOR = "\n\n---\n"
+
+class ResponseCheckError(Exception):
+    """A benchmarked request returned error or fallback text instead of an answer."""
+
+def check_response(response):
+    """
+    Raises ResponseCheckError unless response is a complete answer: no
+    error message, not the general-agent fallback, and some text after
+    the agent header. Returns the response.
+    """
+    if FOOTER_SEPARATOR not in response:
+        raise ResponseCheckError(f"request failed: {response[:160]!r}")
+    answer = response.split(FOOTER_SEPARATOR, 1)[0]
+    if answer.startswith("❌"):
+        raise ResponseCheckError(f"agent error: {answer[:160]!r}")
+    if answer.strip() == ParentAgent.GENERAL_FALLBACK:
+        raise ResponseCheckError("general-agent fallback text")
+    if not answer.split(":**\n\n", 1)[-1].strip():
+        raise ResponseCheckError(f"empty answer: {answer!r}")
+    return response
+
+def _parent_agent(db, user_id, cache_dir):
+    return ParentAgent(
+        db=db,
+        user_id=user_id,
+        intent_model_path=os.path.join(cache_dir, "no_intent_model.json"),  # Always route via the LLM
+        response_cache=ResponseCache(path=os.path.join(cache_dir, f"{user_id}.sqlite3")),
+        write_behind=False
+    )
+
+def bench_handle_request(args, cache_dir):
+    db = InMemoryDatabase(latency=args.db_latency)
+    agent = _parent_agent(db, "bench-uncached", cache_dir)
+    counter = itertools.count()
+
+    def run():
+        # Unique inputs miss the intent and response caches
+        number = next(counter)
+        return check_response(agent.handle_request(f"{PROMPTS[number % len(PROMPTS)]} #{number}"))
+    return run
+
+def bench_handle_request_cached(args, cache_dir):
+    db = InMemoryDatabase(latency=args.db_latency)
+    agent = _parent_agent(db, "bench-cached", cache_dir)
+    return lambda: check_response(agent.handle_request(PROMPTS[1]))
+
+def bench_parse_intent(args, cache_dir):
+    agent = _parent_agent(None, None, cache_dir)
+    outputs = INTENT_OUTPUTS * 100
+    return lambda: [agent._parse_intent(text) for text in outputs]
+
+def bench_level_progress(args, cache_dir):
+    xp_agent = XPAgent()
+    rng = random.Random(7)
+    values = [rng.randint(0, 250000) for _ in range(1000)]
+    return lambda: [xp_agent.get_current_level_progress(value) for value in values]
+
+def bench_paei_summary(args, cache_dir):
+    db = InMemoryDatabase(latency=args.db_latency)
+    db.seed_user("bench-paei", agent_calls=SEEDED_AGENT_CALLS)
+    personality = PAEIPersonality(db=db, user_id="bench-paei")
+    return personality.get_personality_summary
+
+def bench_paei_update(args, cache_dir):
+    personality = PAEIPersonality(half_life_days=14)
+    agents = list(SEEDED_AGENT_CALLS) * 150
+    return lambda: [personality.score_increments(agent, now=86400) for agent in agents]
+
+def bench_dashboard(args, cache_dir):
+    db = InMemoryDatabase(latency=args.db_latency)
+    db.seed_user("bench-dashboard", agent_calls=SEEDED_AGENT_CALLS, tasks=200, chats=50)
+    agent = _parent_agent(db, "bench-dashboard", cache_dir)
+    return agent.get_dashboard
+
+BENCHMARKS = {
+    "parent.handle_request": bench_handle_request,
+    "parent.handle_request.cached": bench_handle_request_cached,
+    "parent.parse_intent_x300": bench_parse_intent,
+    "xp.level_progress_x1000": bench_level_progress,
+    "paei.summary": bench_paei_summary,
+    "paei.score_increments_x1050": bench_paei_update,
+    "parent.get_dashboard": bench_dashboard
+}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--only", default=None, help="Run benchmarks whose name contains this text")
+    parser.add_argument("--llm-latency", type=float, default=0.02, help="Fake Gemini latency per call (s)")
+    parser.add_argument("--db-latency", type=float, default=0.002, help="Fake Firestore latency per round trip (s)")
+    parser.add_argument("--response-chars", type=int, default=1200)
+    parser.add_argument("--save", default=None, help="Write results to this JSON baseline")
+    parser.add_argument("--compare", default=None, help="Compare against this JSON baseline")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.05, help="Ignore latency changes smaller than this")
+    args = parser.parse_args()
+
+    model_registry.set_model_factory(fake_model_factory(
+        latency=args.llm_latency, ttft=args.llm_latency / 4, response_chars=args.response_chars
+    ))
+
+    results = {}
+    failures = {}
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, build in BENCHMARKS.items():
+            if args.only and args.only not in name:
+                continue
+            # Slow end-to-end paths get fewer iterations
+            iterations = args.iterations if not name.startswith("parent.handle_request") else max(20, args.iterations // 4)
+            try:
+                results[name] = measure(build(args, cache_dir), iterations=iterations,
+                                        alloc_iterations=min(50, iterations))
+            except ResponseCheckError as e:
+                failures[name] = str(e)
+
+    model_registry.set_model_factory(None)
+    print_results(results)
+    if failures:
+        # Timings of a path that returned errors would be meaningless
+        print("\nFAILED (responses were not real answers):")
+        for name, error in failures.items():
+            print(f"  {name}: {error}")
+        raise SystemExit(1)
+
+    config = {key: getattr(args, key) for key in ("iterations", "llm_latency", "db_latency", "response_chars")}
+    report = build_report(results, config)
+    if args.save:
+        save_report(report, args.save)
+        print(f"\nsaved baseline to {args.save}")
+
+    if args.compare:
+        baseline = load_report(args.compare)
+        rows, regressions = compare_reports(
+            report, baseline, threshold=args.threshold, min_delta_ms=args.min_delta_ms
+        )
+        print_comparison(rows, regressions, baseline)
+        if regressions:
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Wall time of WhisperAgent on a long synthetic dictation, transcribed by
+FakeTranscriber (latency grows with the audio length):
+
+  single    one request for the whole recording (the old path)
+  serial    overlapping chunks, one at a time
+  parallel  the same chunks on a bounded thread pool
+
+Also checks that the stitched transcript matches the dictated words.
+Usage: python -m benchmarks.bench_transcription [--words 600] [--chunk-seconds 30] [--workers 4]
+"""
+
+import time
+import random
+import argparse
+
+from agents.whisper_agent import WhisperAgent
+from benchmarks.fakes import FakeTranscriber, synthetic_dictation, _WORDS
+
+def _run(recording, chunk_seconds, workers, fake_options):
+    fake = FakeTranscriber(**fake_options)
+    agent = WhisperAgent(transcriber=fake, chunk_seconds=chunk_seconds, max_workers=workers)
+    started = time.perf_counter()
+    result = agent.transcribe_audio(recording)
+    return result, (time.perf_counter() - started) * 1000, fake.calls
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, default=600, help="Dictated words (~0.55s each)")
+    parser.add_argument("--chunk-seconds", type=float, default=30)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--base-latency", type=float, default=0.3, help="Fake seconds per request")
+    parser.add_argument("--latency-per-second", type=float, default=0.03, help="Fake seconds per audio second")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    words = [rng.choice(_WORDS) for _ in range(args.words)]
+    recording = synthetic_dictation(words)
+    fake_options = {"base_latency": args.base_latency, "latency_per_second": args.latency_per_second}
+
+    runs = {
+        "single": (float("inf"), 1),
+        "serial": (args.chunk_seconds, 1),
+        "parallel": (args.chunk_seconds, args.workers)
+    }
+    print(f"{'path':<10} {'calls':>5} {'wall ms':>10} {'sum of chunks ms':>17}  transcript")
+    wall = {}
+    for name, (chunk_seconds, workers) in runs.items():
+        result, wall[name], calls = _run(recording, chunk_seconds, workers, fake_options)
+        chunks = result.get("chunks")
+        serial_ms = chunks["serial_ms"] if chunks else wall[name]
+        matches = result.get("transcription", "").split() == words
+        print(f"{name:<10} {calls:>5} {wall[name]:>10.0f} {serial_ms:>17.0f}  {'matches' if matches else 'DIFFERS'}")
+        if name == "parallel" and chunks:
+            latencies = ", ".join(f"{chunk['latency_ms']:.0f}" for chunk in chunks["chunks"])
+            print(f"\nper-chunk latency ms: {latencies}")
+
+    print(f"parallel vs single: {wall['single'] / wall['parallel']:.2f}x faster")
+
+if __name__ == "__main__":
+    main()
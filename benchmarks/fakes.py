@@ -0,0 +1,524 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Offline stand-ins for Gemini, Whisper and Firestore, so the benchmarks run
+without API keys or network access. Latencies are simulated with sleeps.
+"""
+
+import copy
+import json
+import time
+import uuid
+import random
+import asyncio
+import datetime
+import threading
+from types import SimpleNamespace
+
+import chat_log
+import rollups
+from snapshot import build_snapshot
+
+INTENT_KEYWORDS = {
+    "email": ("email", "mail", "reply"),
+    "research": ("research", "search", "find", "latest"),
+    "report": ("report", "performance", "summary"),
+    "calendar": ("schedule", "meeting", "calendar"),
+    "notion": ("note", "notion", "page"),
+    "slack": ("slack", "message", "team")
+}
+
+_WORDS = ("agent", "model", "latency", "system", "request", "task", "cache",
+          "response", "stream", "user", "profile", "level", "progress", "data")
+
+class FakeResponse:
+    """Mimics a GenerateContentResponse (or one streamed chunk)."""
+    def __init__(self, text, tokens=None):
+        self.text = text
+        self.usage_metadata = SimpleNamespace(total_token_count=tokens if tokens is not None else len(text) // 4)
+
+class _AsyncChunks:
+    def __init__(self, chunks, delays):
+        self._chunks = chunks
+        self._delays = delays
+
+    async def _iterate(self):
+        for chunk, delay in zip(self._chunks, self._delays):
+            await asyncio.sleep(delay)
+            yield chunk
+
+    def __aiter__(self):
+        return self._iterate()
+
+class FakeGenerativeModel:
+    """
+    Gemini stand-in with configurable latency and response size. JSON
+    requests (intent analysis) get an agent picked by keyword; everything
+    else gets response_chars of filler text, streamed in chunk_chars pieces.
+    """
+    def __init__(self, model_name="fake-gemini", system_instruction=None,
+                 latency=0.05, ttft=0.02, response_chars=1200, chunk_chars=200, seed=7):
+        self.model_name = f"models/{model_name}"
+        self._system_instruction = system_instruction
+        self.latency = latency
+        self.ttft = min(ttft, latency)
+        self.response_chars = response_chars
+        self.chunk_chars = chunk_chars
+        self._rng = random.Random(seed)
+        self.calls = 0
+
+    def _text(self):
+        words = []
+        length = 0
+        while length < self.response_chars:
+            word = self._rng.choice(_WORDS)
+            words.append(word)
+            length += len(word) + 1
+        return " ".join(words)[:self.response_chars]
+
+    def _intent(self, prompt):
+        # Only look at the user input line, not the agent list in the prompt
+        line = next((l for l in prompt.splitlines() if l.startswith("User Input:")), prompt).lower()
+        agent = next((a for a, words in INTENT_KEYWORDS.items() if any(w in line for w in words)), None)
+        if agent is None:
+            return json.dumps({"agent": "general", "parameters": {}, "reasoning": "no keyword", "confidence": 0.5})
+        return json.dumps({"agent": agent, "parameters": {}, "reasoning": "keyword match", "confidence": 0.9})
+
+    def _chunks(self, text):
+        size = max(1, self.chunk_chars)
+        pieces = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        chunks = [FakeResponse(piece, tokens=0) for piece in pieces]
+        chunks[-1].usage_metadata.total_token_count = len(text) // 4
+        rest = (self.latency - self.ttft) / max(1, len(chunks) - 1)
+        return chunks, [self.ttft] + [rest] * (len(chunks) - 1)
+
+    def generate_content(self, prompt, generation_config=None, safety_settings=None, stream=False):
+        self.calls += 1
+        if generation_config is not None:
+            time.sleep(self.latency)
+            return FakeResponse(self._intent(prompt))
+        if stream:
+            chunks, delays = self._chunks(self._text())
+            def iterate():
+                for chunk, delay in zip(chunks, delays):
+                    time.sleep(delay)
+                    yield chunk
+            return iterate()
+        time.sleep(self.latency)
+        return FakeResponse(self._text())
+
+    async def generate_content_async(self, prompt, generation_config=None, safety_settings=None, stream=False):
+        self.calls += 1
+        if generation_config is not None:
+            await asyncio.sleep(self.latency)
+            return FakeResponse(self._intent(prompt))
+        if stream:
+            return _AsyncChunks(*self._chunks(self._text()))
+        await asyncio.sleep(self.latency)
+        return FakeResponse(self._text())
+
+    def count_tokens(self, contents):
+        return SimpleNamespace(total_tokens=len(str(contents)) // 4)
+
+    async def count_tokens_async(self, contents):
+        return self.count_tokens(contents)
+
+def fake_model_factory(**options):
+    """A model_registry.set_model_factory() factory building FakeGenerativeModels."""
+    def factory(model_name, system_instruction=None):
+        return FakeGenerativeModel(model_name, system_instruction=system_instruction, **options)
+    return factory
+
+
+# Each fake "spoken" word is a tone at its own pitch, so FakeTranscriber can
+# recover the words from any slice of the audio
+_WORD_BASE_HZ = 200
+_WORD_STEP_HZ = 60
+
+def synthetic_dictation(words, rate=44100, channels=2, word_seconds=0.4, gap_seconds=0.15, lead_seconds=0.5):
+    """WAV bytes of `words` (drawn from _WORDS) spoken as tones separated by short pauses."""
+    import io
+    import wave
+    import numpy as np
+
+    rng = np.random.default_rng(7)
+    pieces = [np.zeros(int(lead_seconds * rate))]
+    t = np.arange(int(word_seconds * rate)) / rate
+    envelope = np.sin(np.pi * t / word_seconds) ** 0.5
+    for word in words:
+        frequency = _WORD_BASE_HZ + _WORD_STEP_HZ * _WORDS.index(word)
+        pieces.append(0.3 * envelope * np.sin(2 * np.pi * frequency * t))
+        pieces.append(np.zeros(int(gap_seconds * rate)))
+    pieces.append(np.zeros(int(lead_seconds * rate)))
+    mono = np.concatenate(pieces) + rng.normal(0, 2e-4, sum(len(piece) for piece in pieces))
+    frames = np.repeat(mono[:, None], channels, axis=1)
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(channels)
+        writer.setsampwidth(2)
+        writer.setframerate(rate)
+        writer.writeframes((np.clip(frames, -1, 1) * 32767).astype("<i2").tobytes())
+    return buffer.getvalue()
+
+class FakeTranscriber:
+    """
+    Stand-in for the Whisper API with WhisperAgent's transcriber signature.
+    It "hears" the tone words of synthetic_dictation: every voiced stretch
+    of the audio becomes the word with the nearest pitch, and fragments too
+    short to recognise are dropped, as Whisper drops clipped syllables.
+    Each call sleeps base_latency plus latency_per_second per second of
+    audio, like a real transcription round trip.
+    """
+    def __init__(self, base_latency=0.3, latency_per_second=0.05, min_word_seconds=0.06):
+        self.base_latency = base_latency
+        self.latency_per_second = latency_per_second
+        self.min_word_seconds = min_word_seconds
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, filename, audio_bytes):
+        import numpy as np
+        from agents.audio_preprocessing import decode_wav, to_mono, frame_rms
+
+        samples, rate = decode_wav(audio_bytes)
+        mono = to_mono(samples)
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.base_latency + self.latency_per_second * len(mono) / rate)
+
+        frame = int(rate * 0.01)
+        voiced = frame_rms(mono, frame) > 0.02
+        # Start/end frame of each voiced run
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], voiced.astype(np.int8), [0]))))
+        words = []
+        for start, end in zip(edges[::2], edges[1::2]):
+            if (end - start) * frame < self.min_word_seconds * rate:
+                continue
+            segment = mono[start * frame:end * frame]
+            spectrum = np.abs(np.fft.rfft(segment * np.hanning(len(segment))))
+            frequency = np.argmax(spectrum) * rate / len(segment)
+            index = int(round((frequency - _WORD_BASE_HZ) / _WORD_STEP_HZ))
+            words.append(_WORDS[min(max(index, 0), len(_WORDS) - 1)])
+        return " ".join(words)
+
+
+class InMemoryDatabase:
+    """
+    Dict-backed Database with the same method surface the agents and the
+    Streamlit app use. Each read or commit sleeps for `latency` seconds to
+    stand in for a Firestore round trip; the reads of a dashboard snapshot
+    overlap, as they do in Database.get_dashboard_snapshot.
+    """
+    def __init__(self, latency=0.0):
+        self.available = True
+        self.latency = latency
+        self._lock = threading.RLock()
+        self._sessions = {}  # session_id -> user_id
+        self._xp = {}        # user_id -> xp_progress dict
+        self._tasks = {}     # user_id -> task rows, oldest first
+        self._chats = {}     # user_id -> chat summaries, oldest first
+        self._chat_bodies = {}  # log_id -> (user_id, stored body)
+        self._routes = {}    # log_id -> how the chat was routed (metadata["route"])
+        self._metrics = {}   # (user_id, agent) -> metrics row
+        self._rollups = {}   # (user_id, bucket, start) -> rollup dict
+
+    def _wait(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+    async def _wait_async(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+    @staticmethod
+    def _now():
+        return datetime.datetime.now()
+
+    def seed_user(self, user_id, agent_calls=None, tasks=0, chats=0, xp_per_task=25):
+        """Fills a user with history, for benchmarks that need existing data."""
+        agent_calls = agent_calls or {}
+        with self._lock:
+            progress = self._progress(user_id)
+            for number in range(1, tasks + 1):
+                self._tasks.setdefault(user_id, []).append({
+                    "type": "simple", "xp": xp_per_task, "task_number": number, "created_at": self._now()
+                })
+            progress.update({"total_xp": tasks * xp_per_task, "tasks_completed": tasks})
+            for number in range(chats):
+                self._log_chat(user_id, f"request {number}", "answer", "general")
+            for agent, calls in agent_calls.items():
+                self._metrics[(user_id, agent)] = {
+                    "agent": agent, "calls": calls, "xp_generated": calls * xp_per_task, "last_used": self._now()
+                }
+
+    # --- Setup ---
+
+    def init_tables(self):
+        pass
+
+    def warm_up(self):
+        self._wait()
+
+    async def warm_up_async(self):
+        await self._wait_async()
+
+    def get_or_create_user(self, session_id):
+        with self._lock:
+            if session_id not in self._sessions:
+                user_id = uuid.uuid4().hex
+                self._sessions[session_id] = user_id
+                self._xp[user_id] = {"total_xp": 0, "level": 1, "tasks_completed": 0}
+            return self._sessions[session_id]
+
+    def invalidate_user_cache(self, user_id, *kinds):
+        pass
+
+    def get_cache_stats(self):
+        return {}
+
+    # --- Reads ---
+
+    def _progress(self, user_id):
+        return self._xp.setdefault(user_id, {"total_xp": 0, "level": 1, "tasks_completed": 0})
+
+    def _read_xp_progress(self, user_id):
+        with self._lock:
+            return dict(self._progress(user_id))
+
+    @staticmethod
+    def _page(rows, key, limit, start_after, end_before):
+        rows = [row for row in reversed(rows)
+                if (start_after is None or row[key] < start_after)
+                and (end_before is None or row[key] > end_before)]
+        return [dict(row) for row in rows[:limit]]
+
+    def _read_task_history(self, user_id, limit, start_after=None, end_before=None):
+        with self._lock:
+            return self._page(self._tasks.get(user_id, []), "created_at", limit, start_after, end_before)
+
+    def _read_chat_history(self, user_id, limit, start_after=None, end_before=None):
+        with self._lock:
+            return self._page(self._chats.get(user_id, []), "timestamp", limit, start_after, end_before)
+
+    def _read_agent_metrics(self, user_id):
+        with self._lock:
+            rows = [dict(row) for (uid, agent), row in self._metrics.items() if uid == user_id]
+        rows.sort(key=lambda x: x['calls'], reverse=True)
+        return rows
+
+    def get_xp_progress(self, user_id):
+        self._wait()
+        return self._read_xp_progress(user_id)
+
+    async def get_xp_progress_async(self, user_id):
+        await self._wait_async()
+        return self._read_xp_progress(user_id)
+
+    def get_task_history(self, user_id, limit=50, start_after=None, end_before=None):
+        self._wait()
+        return self._read_task_history(user_id, limit, start_after, end_before)
+
+    def get_chat_history(self, user_id, limit=20, start_after=None, end_before=None):
+        self._wait()
+        return self._read_chat_history(user_id, limit, start_after, end_before)
+
+    def get_agent_metrics(self, user_id):
+        self._wait()
+        return self._read_agent_metrics(user_id)
+
+    async def get_agent_metrics_async(self, user_id):
+        await self._wait_async()
+        return self._read_agent_metrics(user_id)
+
+    def get_rollups(self, user_id, bucket="day", count=30):
+        self._wait()
+        start = rollups.range_start(bucket, count)
+        with self._lock:
+            rows = [copy.deepcopy(rollup) for (uid, kind, moment), rollup in self._rollups.items()
+                    if uid == user_id and kind == bucket and moment >= start]
+        return rollups.fill_range(rows, bucket, count)
+
+    def _add_rollup(self, user_id, agent_name, deltas):
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for bucket in rollups.BUCKETS:
+            start = rollups.bucket_start(now, bucket)
+            rollup = self._rollups.setdefault((user_id, bucket, start), rollups.empty_rollup(start, bucket))
+            rollups.add_to_rollup(rollup, agent_name, deltas)
+
+    def get_labeled_requests(self, limit=5000):
+        self._wait()
+        with self._lock:
+            rows = [(self._chat_bodies[row["id"]][1]["user_input"], row["agent"], self._routes.get(row["id"]))
+                    for chats in self._chats.values() for row in chats]
+        return [{"input": user_input, "agent": agent, "route": route} for user_input, agent, route in rows[:limit]]
+
+    def get_chat_body(self, user_id, log_id):
+        self._wait()
+        with self._lock:
+            owner, body = self._chat_bodies.get(log_id, (None, None))
+        return chat_log.body_entry(body) if owner == user_id else None
+
+    def get_dashboard_snapshot(self, user_id, chat_limit=10, task_limit=50):
+        self._wait()
+        return build_snapshot(
+            user_id,
+            xp_progress=self._read_xp_progress(user_id),
+            agent_metrics=self._read_agent_metrics(user_id),
+            chat_history=self._read_chat_history(user_id, chat_limit),
+            task_history=self._read_task_history(user_id, task_limit)
+        )
+
+    # --- Writes ---
+
+    def update_xp_progress(self, user_id, total_xp, level, tasks_completed):
+        self._wait()
+        with self._lock:
+            self._progress(user_id).update({"total_xp": total_xp, "level": level, "tasks_completed": tasks_completed})
+
+    def _add_task(self, user_id, task_type, xp_earned, task_number):
+        with self._lock:
+            self._tasks.setdefault(user_id, []).append({
+                "type": task_type, "xp": xp_earned, "task_number": task_number, "created_at": self._now()
+            })
+
+    def add_task_to_history(self, user_id, task_type, xp_earned, task_number):
+        self._wait()
+        self._add_task(user_id, task_type, xp_earned, task_number)
+
+    def _log_chat(self, user_id, user_input, agent_response, agent_used, client_log_id=None, metadata=None):
+        summary, body = chat_log.build_records(user_input, agent_response, agent_used, client_log_id)
+        summary["created_at"] = self._now()
+        log_id = client_log_id or uuid.uuid4().hex
+        with self._lock:
+            self._chats.setdefault(user_id, []).append(chat_log.summary_entry(log_id, summary))
+            self._chat_bodies[log_id] = (user_id, body)
+            if metadata and metadata.get("route"):
+                self._routes[log_id] = metadata["route"]
+        return log_id
+
+    def log_chat(self, user_id, user_input, agent_response, agent_used, metadata=None, client_log_id=None):
+        self._wait()
+        self._log_chat(user_id, user_input, agent_response, agent_used, client_log_id, metadata)
+
+    def _update_metrics(self, user_id, agent_name, calls, xp_earned):
+        with self._lock:
+            row = self._metrics.setdefault((user_id, agent_name), {
+                "agent": agent_name, "calls": 0, "xp_generated": 0, "last_used": None
+            })
+            row["calls"] += calls
+            row["xp_generated"] += xp_earned
+            row["last_used"] = self._now()
+            return {"call_count": row["calls"], "total_xp_generated": row["xp_generated"]}
+
+    def update_agent_metrics(self, user_id, agent_name, xp_earned):
+        self._wait()
+        self._update_metrics(user_id, agent_name, 1, xp_earned)
+
+    def clear_user_data(self, user_id, progress=None):
+        self._wait()
+        with self._lock:
+            self._xp.pop(user_id, None)
+            self._tasks.pop(user_id, None)
+            for row in self._chats.pop(user_id, []):
+                self._chat_bodies.pop(row["id"], None)
+                self._routes.pop(row["id"], None)
+            for key in [key for key in self._metrics if key[0] == user_id]:
+                del self._metrics[key]
+            for key in [key for key in self._rollups if key[0] == user_id]:
+                del self._rollups[key]
+        return {"user_id": user_id, "deleted": {}, "complete": True, "failures": {}}
+
+    def sweep_orphans(self, limit=None):
+        return {"resumed": 0, "purged": 0, "failed": 0}
+
+    def start_orphan_sweeper(self, interval=3600):
+        return None
+
+    def unit_of_work(self, user_id):
+        return InMemoryUnitOfWork(self, user_id)
+
+
+class InMemoryUnitOfWork:
+    """UnitOfWork counterpart for InMemoryDatabase; commits under one lock."""
+    def __init__(self, database, user_id):
+        self.database = database
+        self.user_id = user_id
+        self._tasks = []
+        self._level_for_xp = None
+        self._chats = []
+        self._metrics = {}
+        self._rollups = []
+        self._stat_increments = {}
+
+    def add_xp(self, xp_earned, task_type, level_for_xp=None, task_number=None):
+        self._tasks.append((xp_earned, task_type))
+        if level_for_xp is not None:
+            self._level_for_xp = level_for_xp
+        return self
+
+    def log_chat(self, user_input, agent_response, agent_used, metadata=None, client_log_id=None):
+        self._chats.append((user_input, agent_response, agent_used, client_log_id, metadata))
+        return self
+
+    def update_agent_metrics(self, agent_name, xp_earned):
+        calls_and_xp = self._metrics.setdefault(agent_name, [0, 0])
+        calls_and_xp[0] += 1
+        calls_and_xp[1] += xp_earned
+        return self
+
+    def update_rollups(self, agent_name, xp_earned, tasks=1, latency_ms=None):
+        self._rollups.append((agent_name, rollups.increments(agent_name, xp_earned, tasks, latency_ms)))
+        return self
+
+    def increment_user_stats(self, increments):
+        for field, amounts in increments.items():
+            totals = self._stat_increments.setdefault(field, {})
+            for key, amount in amounts.items():
+                totals[key] = totals.get(key, 0) + amount
+        return self
+
+    def _apply(self):
+        db = self.database
+        result = {"ids": {"task_history": [], "chat_logs": []}, "aggregates": {}}
+        with db._lock:
+            progress = db._progress(self.user_id)
+            if self._tasks:
+                for xp_earned, task_type in self._tasks:
+                    progress["total_xp"] += xp_earned
+                    progress["tasks_completed"] += 1
+                    db._add_task(self.user_id, task_type, xp_earned, progress["tasks_completed"])
+                if self._level_for_xp:
+                    progress["level"] = self._level_for_xp(progress["total_xp"])
+                result["aggregates"]["xp_progress"] = {
+                    "total_xp": progress["total_xp"], "level": progress["level"],
+                    "tasks_completed": progress["tasks_completed"]
+                }
+            for field, amounts in self._stat_increments.items():
+                values = dict(progress.get(field) or {})
+                for key, amount in amounts.items():
+                    values[key] = values.get(key, 0) + amount
+                progress[field] = values
+                result["aggregates"].setdefault("user_stats", {})[field] = values
+            for user_input, agent_response, agent_used, client_log_id, metadata in self._chats:
+                result["ids"]["chat_logs"].append(
+                    db._log_chat(self.user_id, user_input, agent_response, agent_used, client_log_id, metadata)
+                )
+            if self._metrics:
+                result["aggregates"]["agent_metrics"] = {
+                    agent_name: db._update_metrics(self.user_id, agent_name, calls, xp_earned)
+                    for agent_name, (calls, xp_earned) in self._metrics.items()
+                }
+            for agent_name, deltas in self._rollups:
+                db._add_rollup(self.user_id, agent_name, deltas)
+        return result
+
+    def commit(self):
+        self.database._wait()
+        return self._apply()
+
+    async def commit_async(self):
+        await self.database._wait_async()
+        return self._apply()
@@ -0,0 +1,141 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Timing, allocation and baseline helpers shared by the benchmark scripts.
+"""
+
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+import tracemalloc
+
+def _percentile(sorted_samples, percent):
+    # Nearest-rank percentile
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, int(round(percent / 100 * len(sorted_samples))))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+def summarize(samples):
+    """Latency percentiles (ms) for a list of samples in milliseconds."""
+    samples = sorted(samples)
+    return {
+        "iterations": len(samples),
+        "mean_ms": round(sum(samples) / len(samples), 4),
+        "p50_ms": round(_percentile(samples, 50), 4),
+        "p95_ms": round(_percentile(samples, 95), 4),
+        "p99_ms": round(_percentile(samples, 99), 4),
+        "max_ms": round(samples[-1], 4)
+    }
+
+def measure(fn, iterations=200, warmup=10, alloc_iterations=50):
+    """
+    Runs fn() repeatedly and returns latency percentiles (ms) and allocation
+    figures (bytes). Allocations are measured in a separate pass so the
+    tracemalloc overhead doesn't skew the timings.
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        samples.append((time.perf_counter_ns() - start) / 1e6)
+
+    peaks = []
+    tracemalloc.start()
+    try:
+        initial, _ = tracemalloc.get_traced_memory()
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+        final, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    peaks.sort()
+
+    result = summarize(samples)
+    result.update({
+        "alloc_peak_bytes": int(_percentile(peaks, 50)),
+        "alloc_retained_bytes_per_op": int((final - initial) / max(1, alloc_iterations))
+    })
+    return result
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip() or None
+    except Exception as e:
+        return None
+
+def build_report(results, config=None):
+    return {
+        "meta": {
+            "git_commit": _git_commit(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "config": config or {}
+        },
+        "results": results
+    }
+
+def save_report(report, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+def load_report(path):
+    with open(path) as f:
+        return json.load(f)
+
+COMPARED_METRICS = ("p50_ms", "p95_ms", "p99_ms", "alloc_peak_bytes")
+
+def compare_reports(current, baseline, threshold=0.10, min_delta_ms=0.05):
+    """
+    Returns rows (benchmark, metric, baseline, current, change) for every
+    shared benchmark, and the subset that got worse by more than threshold.
+    Latency changes under min_delta_ms are timer noise, never regressions.
+    """
+    rows = []
+    regressions = []
+    for name, result in current["results"].items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        for metric in COMPARED_METRICS:
+            old, new = previous.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            row = (name, metric, old, new, change)
+            rows.append(row)
+            noise = metric.endswith("_ms") and abs(new - old) < min_delta_ms
+            if change > threshold and not noise:
+                regressions.append(row)
+    return rows, regressions
+
+def print_results(results):
+    print(f"{'benchmark':<34} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'peak KiB':>10}")
+    for name, result in results.items():
+        print(f"{name:<34} {result['p50_ms']:>10.3f} {result['p95_ms']:>10.3f} "
+              f"{result['p99_ms']:>10.3f} {result.get('alloc_peak_bytes', 0) / 1024:>10.1f}")
+
+def print_comparison(rows, regressions, baseline):
+    print(f"\nvs baseline {baseline['meta'].get('git_commit')} ({baseline['meta'].get('created_at')}):")
+    flagged = set((row[0], row[1]) for row in regressions)
+    for name, metric, old, new, change in rows:
+        marker = "  REGRESSION" if (name, metric) in flagged else ""
+        print(f"  {name:<34} {metric:<18} {old:>12.3f} -> {new:>12.3f} ({change:+.1%}){marker}")
@@ -0,0 +1,247 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import os
+import time
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with an optional TTL per entry.
+    Keeps hit/miss/eviction counters so callers can report cache efficiency.
+    """
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl  # Default time-to-live in seconds (None = never expires)
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            self._evict()
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def resize(self, maxsize):
+        """Changes the size limit at runtime, evicting LRU entries if needed."""
+        with self._lock:
+            self.maxsize = max(0, int(maxsize))
+            self._evict()
+
+    def invalidate(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def invalidate_where(self, predicate):
+        """Removes every entry whose key matches the predicate."""
+        with self._lock:
+            stale = [key for key in self._data if predicate(key)]
+            for key in stale:
+                del self._data[key]
+            return len(stale)
+
+    def purge_expired(self):
+        """Drops every expired entry now instead of on its next lookup."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (_, expires_at) in self._data.items()
+                       if expires_at is not None and expires_at <= now]
+            for key in expired:
+                del self._data[key]
+            self.expirations += len(expired)
+            return len(expired)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and (entry[1] is None or entry[1] > time.monotonic())
+
+    def get_stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0
+            }
+
+class TieredCache:
+    """
+    Two-tier cache: an LRUCache in front of an optional SQLite table (path),
+    so entries survive restarts. Entries are JSON-serializable dicts, each
+    with its own TTL; the table is trimmed to max_disk_entries by last
+    access. Subclasses define their keys and count what hits saved in
+    _record_hit.
+    """
+    # Writes between trims of the disk tier
+    TRIM_EVERY = 50
+
+    def __init__(self, path, table, memory_size=256, max_disk_entries=5000, ttl=None):
+        self.table = table
+        self.memory = LRUCache(maxsize=memory_size, ttl=ttl)
+        self.max_disk_entries = max_disk_entries
+        self._lock = threading.Lock()
+        self._writes_since_trim = 0
+        self.disk_hits = 0
+
+        self.conn = None
+        if path is None:
+            return
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = sqlite3.connect(path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    key TEXT PRIMARY KEY,
+                    entry TEXT NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self.conn.execute(f"CREATE INDEX IF NOT EXISTS idx_{table}_last_access ON {table} (last_access)")
+            self.conn.commit()
+        except Exception as e:
+            # Fall back to the memory tier only
+            self.conn = None
+
+    def get(self, key):
+        """
+        Returns (entry, tier) where tier is "memory" or "disk", or
+        (None, None) on a miss.
+        """
+        entry = self.memory.get(key)
+        if entry is not None:
+            self._record_hit(entry)
+            return entry, "memory"
+
+        if self.conn is None:
+            return None, None
+
+        now = time.time()
+        try:
+            with self._lock:
+                row = self.conn.execute(
+                    f"SELECT entry, expires_at FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    return None, None
+                if row[1] <= now:
+                    self.conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                    self.conn.commit()
+                    return None, None
+                self.conn.execute(f"UPDATE {self.table} SET last_access = ? WHERE key = ?", (now, key))
+                self.conn.commit()
+                self.disk_hits += 1
+
+            entry = json.loads(row[0])
+            self.memory.set(key, entry, ttl=row[1] - now)
+            self._record_hit(entry)
+            return entry, "disk"
+        except Exception as e:
+            return None, None
+
+    def _record_hit(self, entry):
+        pass
+
+    def set(self, key, entry, ttl=None):
+        """Stores entry in both tiers; ttl defaults to the cache's TTL."""
+        ttl = self.memory.ttl if ttl is None else ttl
+        self.memory.set(key, entry, ttl=ttl)
+
+        if self.conn is None:
+            return
+        now = time.time()
+        expires_at = now + ttl if ttl is not None else float("inf")
+        try:
+            with self._lock:
+                self.conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} (key, entry, expires_at, last_access) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(entry), expires_at, now)
+                )
+                self.conn.commit()
+                self._writes_since_trim += 1
+                if self._writes_since_trim >= self.TRIM_EVERY:
+                    self._trim(now)
+        except Exception as e:
+            pass
+
+    def _trim(self, now):
+        """Drops expired rows, then least recently used rows over the size limit."""
+        self._writes_since_trim = 0
+        self.conn.execute(f"DELETE FROM {self.table} WHERE expires_at <= ?", (now,))
+        self.conn.execute(f"""
+            DELETE FROM {self.table} WHERE key IN (
+                SELECT key FROM {self.table} ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_disk_entries,))
+        self.conn.commit()
+
+    def clear(self):
+        self.memory.clear()
+        if self.conn is not None:
+            with self._lock:
+                self.conn.execute(f"DELETE FROM {self.table}")
+                self.conn.commit()
+
+    def get_stats(self):
+        """Memory tier counters, disk tier size and hits."""
+        disk_entries = 0
+        if self.conn is not None:
+            try:
+                with self._lock:
+                    disk_entries = self.conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+            except Exception as e:
+                pass
+        return {
+            "memory": self.memory.get_stats(),
+            "disk_entries": disk_entries,
+            "disk_hits": self.disk_hits
+        }
@@ -0,0 +1,81 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Chat log record format shared by the storage backends. Each logged chat is
+split into a small summary (what history lists render) and a separately
+stored body holding the full request and the compressed response, which is
+only read when a single entry is opened.
+"""
+
+import uuid
+import zlib
+
+PREVIEW_CHARS = 200
+
+# The fields list views project; the body is never part of a history read
+SUMMARY_FIELDS = ('input_preview', 'agent_used', 'response_length', 'created_at', 'client_log_id')
+
+BODY_ENCODING = "zlib"
+
+def compress_body(text):
+    return zlib.compress((text or "").encode("utf-8"), 6)
+
+def decompress_body(data, encoding=BODY_ENCODING):
+    if data is None:
+        return ""
+    if encoding != BODY_ENCODING:
+        raise ValueError(f"Unsupported chat body encoding: {encoding}")
+    return zlib.decompress(bytes(data)).decode("utf-8")
+
+def preview(user_input):
+    return (user_input or "")[:PREVIEW_CHARS]
+
+def new_log_id():
+    """
+    ID for a chat, generated when it is queued. It is stored with the
+    chat, so a queued entry can be matched to the stored one exactly.
+    """
+    return uuid.uuid4().hex
+
+def build_records(user_input, agent_response, agent_used, client_log_id=None):
+    """Returns the (summary, body) field dicts for one chat, without timestamps or storage IDs."""
+    summary = {
+        'input_preview': preview(user_input),
+        'agent_used': agent_used,
+        'response_length': len(agent_response or "")
+    }
+    if client_log_id is not None:
+        summary['client_log_id'] = client_log_id
+    body = {
+        'user_input': user_input,
+        'response': compress_body(agent_response),
+        'encoding': BODY_ENCODING
+    }
+    return summary, body
+
+def summary_entry(log_id, data):
+    """Maps a stored summary to the dict history lists work with."""
+    return {
+        "id": log_id,
+        "input": data.get('input_preview') or preview(data.get('user_input')),
+        "agent": data.get('agent_used'),
+        "response_length": data.get('response_length'),
+        "timestamp": data.get('created_at'),
+        "client_log_id": data.get('client_log_id')
+    }
+
+def body_entry(data):
+    """Decodes a stored body into {"input", "response"}."""
+    return {
+        "input": data.get('user_input'),
+        "response": decompress_body(data.get('response'), data.get('encoding', BODY_ENCODING))
+    }
+
+def entry_key(entry):
+    """
+    Identifies a chat by its client_log_id, so a queued chat can be matched
+    to its stored summary; None for chats stored without one.
+    """
+    return entry.get("client_log_id")
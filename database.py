@@ -3,13 +3,81 @@
 # Project: Multi-Agent AI System (MVP)
 
 import os
+import copy
+import asyncio
+import threading
 import firebase_admin
-from firebase_admin import credentials, firestore
+from firebase_admin import credentials, firestore, firestore_async
+from google.cloud.firestore_v1 import _helpers
 from google.cloud.firestore_v1.base_query import FieldFilter
 
+import datetime
+
+import chat_log
+import rollups
+from cache import LRUCache
+from purge import FirestorePurger, OrphanSweeper
+from snapshot import DashboardSnapshot, build_snapshot
+
+_MISSING = object()
+
+def _transform_values(fields, write_result):
+    """
+    The post-write values of the server-side transforms (Increment,
+    Maximum, SERVER_TIMESTAMP) in a write's fields, nested like the fields.
+    Firestore returns one transform result per transformed field, in
+    field-path order. None if the write result carries none (some
+    emulators omit them).
+    """
+    paths = _helpers.DocumentExtractor(fields).transform_paths
+    results = list(getattr(write_result, 'transform_results', None) or [])
+    if not paths or len(results) != len(paths):
+        return None
+    values = {}
+    for path, value in zip(paths, results):
+        *parents, leaf = path.parts
+        target = values
+        for part in parents:
+            target = target.setdefault(part, {})
+        target[leaf] = _helpers.decode_value(value, None)
+    return values
+
+def _chat_records(user_input, agent_response, agent_used, metadata=None, client_log_id=None):
+    """
+    Splits a chat into its chat_logs summary and chat_bodies document
+    (same ID), so history lists never download the response.
+    """
+    summary, body = chat_log.build_records(user_input, agent_response, agent_used, client_log_id)
+    summary['created_at'] = firestore.SERVER_TIMESTAMP
+    body['created_at'] = firestore.SERVER_TIMESTAMP
+    # Cache/latency details, used to measure what the response cache saves
+    if metadata:
+        summary['metadata'] = metadata
+    return summary, body
+
 class Database:
-    def __init__(self, creds_dict):
+    # Seconds a cached read stays valid. Writes through this instance
+    # invalidate immediately; the TTL bounds staleness from other processes.
+    READ_CACHE_TTLS = {
+        "xp_progress": 30,
+        "agent_metrics": 60,
+        "chat_history": 30,
+        "chat_body": 600,  # Bodies never change once written
+        "task_history": 60,
+        "rollups": 60
+    }
+
+    def __init__(self, creds_dict, read_cache_size=512):
         self.available = False
+        self._async_db = None
+        
+        # Per-user read-through cache, keyed (user_id, kind, *args)
+        self.read_cache = LRUCache(maxsize=read_cache_size)
+        self._purger_instance = None
+        self._sweeper = None
+        # Bumped on every invalidation so a read that raced a write isn't cached
+        self._cache_generations = {}
+        self._cache_lock = threading.Lock()
         try:
             if not firebase_admin._apps:
                 cred = credentials.Certificate(creds_dict)
@@ -20,11 +88,126 @@ class Database:
         except Exception as e:
             self.available = False
 
+    @property
+    def async_db(self):
+        """
+        Async Firestore client, created lazily so its channel binds to the
+        shared event loop the async pipeline runs on.
+        """
+        if self._async_db is None:
+            self._async_db = firestore_async.client()
+        return self._async_db
+
+    def _generation(self, user_id):
+        with self._cache_lock:
+            return self._cache_generations.get(user_id, 0)
+
+    def _cache_lookup(self, user_id, kind, args):
+        value = self.read_cache.get((user_id, kind) + args, _MISSING)
+        return value if value is _MISSING else copy.deepcopy(value)
+
+    def _cache_store(self, user_id, kind, args, value, generation):
+        if self._generation(user_id) == generation:
+            self.read_cache.set((user_id, kind) + args, copy.deepcopy(value), ttl=self.READ_CACHE_TTLS[kind])
+        return value
+
+    def _read_through(self, user_id, kind, loader, *args):
+        """
+        Returns the cached value for (user_id, kind, args) or loads and caches
+        it. Loader errors propagate, so failures are never cached.
+        """
+        value = self._cache_lookup(user_id, kind, args)
+        if value is not _MISSING:
+            return value
+        generation = self._generation(user_id)
+        return self._cache_store(user_id, kind, args, loader(*args), generation)
+
+    async def _read_through_async(self, user_id, kind, loader, *args):
+        value = self._cache_lookup(user_id, kind, args)
+        if value is not _MISSING:
+            return value
+        generation = self._generation(user_id)
+        return self._cache_store(user_id, kind, args, await loader(*args), generation)
+
+    def invalidate_user_cache(self, user_id, *kinds):
+        """Drops cached reads for a user (all kinds if none are given)."""
+        with self._cache_lock:
+            self._cache_generations[user_id] = self._cache_generations.get(user_id, 0) + 1
+        self.read_cache.invalidate_where(
+            lambda key: key[0] == user_id and (not kinds or key[1] in kinds)
+        )
+
+    def get_dashboard_snapshot(self, user_id, chat_limit=10, task_limit=50):
+        """
+        Loads everything the dashboard renders in one round of concurrent
+        reads and returns it as an immutable DashboardSnapshot, so page
+        render time is the slowest read rather than the sum of them.
+        The reads are gathered on the async client over the shared event
+        loop, so concurrent sessions don't queue behind a thread pool.
+        Parts already in the read cache are not fetched again.
+        """
+        if not self.available or user_id is None:
+            return build_snapshot(user_id)
+
+        # Same cache keys as the single-read getters; a zero limit skips the part
+        requests = {
+            'xp_progress': (self._fetch_xp_progress_async, (user_id,)),
+            'agent_metrics': (self._fetch_agent_metrics_async, (user_id,)),
+            'chat_history': (self._fetch_chat_history_async, (user_id, chat_limit, None, None)),
+            'task_history': (self._fetch_task_history_async, (user_id, task_limit, None, None))
+        }
+        if not chat_limit:
+            del requests['chat_history']
+        if not task_limit:
+            del requests['task_history']
+        values = {}
+        for kind, (loader, args) in requests.items():
+            value = self._cache_lookup(user_id, kind, args)
+            if value is not _MISSING:
+                values[kind] = value
+        generation = self._generation(user_id)
+
+        missing = [kind for kind in requests if kind not in values]
+        if missing:
+            from agents.event_loop import run_sync
+
+            async def fetch_missing():
+                return await asyncio.gather(
+                    *(requests[kind][0](*requests[kind][1]) for kind in missing), return_exceptions=True
+                )
+
+            try:
+                results = run_sync(fetch_missing())
+            except Exception as e:
+                results = []
+            for kind, result in zip(missing, results):
+                # Failed parts fall back to the snapshot defaults
+                if not isinstance(result, Exception):
+                    values[kind] = self._cache_store(user_id, kind, requests[kind][1], result, generation)
+
+        return build_snapshot(user_id, **values)
+
+    def get_cache_stats(self):
+        return self.read_cache.get_stats()
+
     def init_tables(self):
         if self.available:
             pass
         pass
 
+    def warm_up(self):
+        """
+        Opens the Firestore channel ahead of the first request with one
+        cheap point read (the document doesn't need to exist).
+        """
+        if self.available:
+            self.db.collection('xp_progress').document('_warm_up').get()
+
+    async def warm_up_async(self):
+        """Same as warm_up for the async client; run it on the shared loop."""
+        if self.available:
+            await self.async_db.collection('xp_progress').document('_warm_up').get()
+
     def get_or_create_user(self, session_id):
         if not self.available:
             return None
@@ -67,18 +250,21 @@ class Database:
             return {"total_xp": 0, "level": 1, "tasks_completed": 0}
         
         try:
-            doc_ref = self.db.collection('xp_progress').document(user_id)
-            doc = doc_ref.get()
-            
-            if doc.exists:
-                return doc.to_dict()
-            else:
-                xp_data = {"total_xp": 0, "level": 1, "tasks_completed": 0}
-                doc_ref.set(xp_data)
-                return xp_data
+            return self._read_through(user_id, 'xp_progress', self._fetch_xp_progress, user_id)
         except Exception as e:
             return {"total_xp": 0, "level": 1, "tasks_completed": 0}
 
+    def _fetch_xp_progress(self, user_id):
+        doc_ref = self.db.collection('xp_progress').document(user_id)
+        doc = doc_ref.get()
+        
+        if doc.exists:
+            return doc.to_dict()
+        else:
+            xp_data = {"total_xp": 0, "level": 1, "tasks_completed": 0}
+            doc_ref.set(xp_data)
+            return xp_data
+
     def update_xp_progress(self, user_id, total_xp, level, tasks_completed):
         if not self.available or user_id is None:
             return
@@ -93,6 +279,8 @@ class Database:
             })
         except Exception as e:
             pass
+        finally:
+            self.invalidate_user_cache(user_id, 'xp_progress')
 
     def add_task_to_history(self, user_id, task_type, xp_earned, task_number):
         if not self.available or user_id is None:
@@ -108,80 +296,191 @@ class Database:
             })
         except Exception as e:
             pass
+        finally:
+            self.invalidate_user_cache(user_id, 'task_history')
 
-    def get_task_history(self, user_id, limit=50):
+    def get_task_history(self, user_id, limit=50, start_after=None, end_before=None):
+        """
+        Newest-first task history. The cursors take a created_at value from
+        a previous page: start_after pages to older tasks, end_before only
+        returns tasks newer than it.
+        """
         if not self.available or user_id is None:
             return []
             
         try:
-            docs = self.db.collection('users').document(user_id) \
-                         .collection('task_history') \
-                         .order_by('created_at', direction=firestore.Query.DESCENDING) \
-                         .limit(limit) \
-                         .stream()
-            
-            results = []
-            for doc in docs:
-                data = doc.to_dict()
-                results.append({
-                    "type": data.get('task_type'),
-                    "xp": data.get('xp_earned'),
-                    "task_number": data.get('task_number'),
-                    "created_at": data.get('created_at')
-                })
-            return results
+            return self._read_through(
+                user_id, 'task_history', self._fetch_task_history, user_id, limit, start_after, end_before
+            )
         except Exception as e:
             return []
 
-    def log_chat(self, user_id, user_input, agent_response, agent_used):
+    def _page(self, query, limit, start_after, end_before):
+        query = query.order_by('created_at', direction=firestore.Query.DESCENDING)
+        if start_after is not None:
+            query = query.start_after({'created_at': start_after})
+        if end_before is not None:
+            query = query.end_before({'created_at': end_before})
+        return query.limit(limit)
+
+    def _fetch_task_history(self, user_id, limit, start_after=None, end_before=None):
+        query = self.db.collection('users').document(user_id).collection('task_history')
+        docs = self._page(query, limit, start_after, end_before).stream()
+        return [self._task_row(doc.to_dict()) for doc in docs]
+
+    def _task_row(self, data):
+        return {
+            "type": data.get('task_type'),
+            "xp": data.get('xp_earned'),
+            "task_number": data.get('task_number'),
+            "created_at": data.get('created_at')
+        }
+
+    def log_chat(self, user_id, user_input, agent_response, agent_used, metadata=None, client_log_id=None):
+        """
+        Stores a chat. client_log_id (see chat_log.new_log_id) becomes the
+        document ID, so retrying the same chat overwrites instead of duplicating.
+        """
         if not self.available or user_id is None:
             return
             
         try:
+            summary, body = _chat_records(user_input, agent_response, agent_used, metadata, client_log_id)
             user_ref = self.db.collection('users').document(user_id)
-            user_ref.collection('chat_logs').add({
-                'user_input': user_input,
-                'agent_response': agent_response,
-                'agent_used': agent_used,
-                'created_at': firestore.SERVER_TIMESTAMP
-            })
+            chat_ref = user_ref.collection('chat_logs').document(client_log_id)
+            
+            batch = self.db.batch()
+            batch.set(chat_ref, summary)
+            batch.set(user_ref.collection('chat_bodies').document(chat_ref.id), body)
+            batch.commit()
         except Exception as e:
             pass
+        finally:
+            self.invalidate_user_cache(user_id, 'chat_history')
 
-    def get_chat_history(self, user_id, limit=20):
+    def get_chat_history(self, user_id, limit=20, start_after=None, end_before=None):
+        """
+        Newest-first chat history, paged by the created_at "timestamp" of
+        an entry from a previous page (see get_task_history).
+        """
         if not self.available or user_id is None:
             return []
         
         try:
-            docs = self.db.collection('users').document(user_id) \
-                         .collection('chat_logs') \
-                         .order_by('created_at', direction=firestore.Query.DESCENDING) \
+            return self._read_through(
+                user_id, 'chat_history', self._fetch_chat_history, user_id, limit, start_after, end_before
+            )
+        except Exception as e:
+            return []
+
+    def _fetch_chat_history(self, user_id, limit, start_after=None, end_before=None):
+        # Project the summary fields only; user_input is there for logs
+        # written before bodies were split out (newer summaries don't have it)
+        query = self.db.collection('users').document(user_id).collection('chat_logs') \
+                       .select(list(chat_log.SUMMARY_FIELDS) + ['user_input'])
+        docs = self._page(query, limit, start_after, end_before).stream()
+        return [chat_log.summary_entry(doc.id, doc.to_dict()) for doc in docs]
+
+    def get_chat_body(self, user_id, log_id):
+        """
+        Full request and response of one chat_logs entry, as
+        {"input", "response"}, or None if it can't be read.
+        """
+        if not self.available or user_id is None or not log_id:
+            return None
+
+        try:
+            return self._read_through(user_id, 'chat_body', self._fetch_chat_body, user_id, log_id)
+        except Exception as e:
+            return None
+
+    def _fetch_chat_body(self, user_id, log_id):
+        user_ref = self.db.collection('users').document(user_id)
+        doc = user_ref.collection('chat_bodies').document(log_id).get()
+        if doc.exists:
+            return chat_log.body_entry(doc.to_dict())
+
+        # Older logs kept the response inline
+        doc = user_ref.collection('chat_logs').document(log_id).get()
+        if not doc.exists:
+            return None
+        data = doc.to_dict()
+        return {"input": data.get('user_input'), "response": data.get('agent_response')}
+
+    def get_labeled_requests(self, limit=5000):
+        """
+        Returns {"input", "agent", "route"} for chats across all users'
+        chat_logs, used to train the local intent classifier. route is how
+        the chat was routed ({"source", "confidence"}), None for old logs.
+        """
+        if not self.available:
+            return []
+
+        try:
+            docs = self.db.collection_group('chat_logs') \
+                         .select(['input_preview', 'user_input', 'agent_used', 'metadata.route']) \
                          .limit(limit) \
                          .stream()
-            
+
             results = []
             for doc in docs:
                 data = doc.to_dict()
-                results.append({
-                    "input": data.get('user_input'),
-                    "response": data.get('agent_response'),
-                    "agent": data.get('agent_used'),
-                    "timestamp": data.get('created_at')
-                })
+                user_input = data.get('user_input') or data.get('input_preview')
+                if user_input and data.get('agent_used'):
+                    results.append({
+                        "input": user_input,
+                        "agent": data.get('agent_used'),
+                        "route": (data.get('metadata') or {}).get('route')
+                    })
             return results
         except Exception as e:
             return []
 
-    def clear_user_data(self, user_id):
+    def clear_user_data(self, user_id, progress=None):
+        """
+        Deletes the user and everything stored for them, including
+        subcollections and agent_metrics. Returns the purge result
+        ({"user_id", "deleted", "complete", "failures"}), or None when the
+        database is unavailable.
+        """
         if not self.available or user_id is None:
-            return
+            return None
             
         try:
-            self.db.collection('users').document(user_id).delete()
-            self.db.collection('xp_progress').document(user_id).delete()
-            
+            return self._purger().purge_user(user_id, progress)
         except Exception as e:
-            pass
+            return {"user_id": user_id, "deleted": {}, "complete": False, "failures": {"purge": str(e)}}
+        finally:
+            self.invalidate_user_cache(user_id)
+
+    def _purger(self):
+        if self._purger_instance is None:
+            self._purger_instance = FirestorePurger(self.db)
+        return self._purger_instance
+
+    def sweep_orphans(self, limit=20):
+        """
+        Finishes interrupted purges, then purges up to `limit` users whose
+        data outlived their users/{id} document.
+        """
+        if not self.available:
+            return {"resumed": 0, "purged": 0, "failed": 0}
+
+        purger = self._purger()
+        resumed = purger.resume_pending(limit)
+        orphans = purger.find_orphans(limit)
+        purged = 0
+        for user_id in orphans:
+            purged += purger.purge_user(user_id)["complete"]
+            self.invalidate_user_cache(user_id)
+        return {"resumed": len(resumed), "purged": purged, "failed": len(orphans) - purged}
+
+    def start_orphan_sweeper(self, interval=3600):
+        """Starts the background orphan sweeper once; returns it."""
+        with self._cache_lock:
+            if self._sweeper is None and self.available:
+                self._sweeper = OrphanSweeper(self, interval=interval).start()
+            return self._sweeper
 
     def update_agent_metrics(self, user_id, agent_name, xp_earned):
         if not self.available or user_id is None:
@@ -217,29 +516,379 @@ class Database:
             
         except Exception as e:
             pass
+        finally:
+            self.invalidate_user_cache(user_id, 'agent_metrics')
 
     def get_agent_metrics(self, user_id):
         if not self.available or user_id is None:
             return []
             
         try:
-            docs = self.db.collection('agent_metrics') \
-                         .where(filter=FieldFilter('user_id', '==', user_id)) \
-                         .stream()
-            
-            results = []
-            for doc in docs:
-                data = doc.to_dict()
-                results.append({
-                    "agent": data.get('agent_name'),
-                    "calls": data.get('call_count'),
-                    "xp_generated": data.get('total_xp_generated'),
-                    "last_used": data.get('last_used')
-                })
-            
-            # Sort results in Python instead of in the query
-            results.sort(key=lambda x: x['calls'], reverse=True)
-            
-            return results
+            return self._read_through(user_id, 'agent_metrics', self._fetch_agent_metrics, user_id)
+        except Exception as e:
+            return []
+
+    def _fetch_agent_metrics(self, user_id):
+        docs = self.db.collection('agent_metrics') \
+                     .where(filter=FieldFilter('user_id', '==', user_id)) \
+                     .stream()
+        
+        results = [self._agent_metric_row(doc.to_dict()) for doc in docs]
+        
+        # Sort results in Python instead of in the query
+        results.sort(key=lambda x: x['calls'], reverse=True)
+        
+        return results
+
+    def _agent_metric_row(self, data):
+        return {
+            "agent": data.get('agent_name'),
+            "calls": data.get('call_count'),
+            "xp_generated": data.get('total_xp_generated'),
+            "last_used": data.get('last_used')
+        }
+
+    def get_rollups(self, user_id, bucket="day", count=30):
+        """
+        The last `count` hourly or daily activity rollups, oldest first and
+        with empty buckets filled in. Reads at most `count` small documents
+        from users/{id}/rollups_{bucket}, whatever the range.
+        """
+        if not self.available or user_id is None:
+            return rollups.fill_range([], bucket, count)
+
+        try:
+            # The range start is part of the key, so a new bucket starts a new entry
+            start = rollups.range_start(bucket, count)
+            return self._read_through(user_id, 'rollups', self._fetch_rollups, user_id, bucket, count, start)
+        except Exception as e:
+            return rollups.fill_range([], bucket, count)
+
+    def _fetch_rollups(self, user_id, bucket, count, start):
+        docs = self.db.collection('users').document(user_id) \
+                     .collection(f'rollups_{bucket}') \
+                     .where(filter=FieldFilter('start', '>=', start)) \
+                     .order_by('start') \
+                     .stream()
+        end = start + rollups.BUCKETS[bucket] * (count - 1)
+        return rollups.fill_range([doc.to_dict() for doc in docs], bucket, count, now=end)
+
+    def unit_of_work(self, user_id):
+        """
+        Returns a UnitOfWork that batches the writes of one request into a
+        single atomic commit.
+        """
+        return UnitOfWork(self, user_id)
+
+    # --- Async variants (used by ParentAgent.handle_request_async) ---
+
+    async def get_xp_progress_async(self, user_id):
+        if not self.available or user_id is None:
+            return {"total_xp": 0, "level": 1, "tasks_completed": 0}
+
+        try:
+            return await self._read_through_async(user_id, 'xp_progress', self._fetch_xp_progress_async, user_id)
+        except Exception as e:
+            return {"total_xp": 0, "level": 1, "tasks_completed": 0}
+
+    async def _fetch_xp_progress_async(self, user_id):
+        doc_ref = self.async_db.collection('xp_progress').document(user_id)
+        doc = await doc_ref.get()
+
+        if doc.exists:
+            return doc.to_dict()
+        else:
+            xp_data = {"total_xp": 0, "level": 1, "tasks_completed": 0}
+            await doc_ref.set(xp_data)
+            return xp_data
+
+    async def get_agent_metrics_async(self, user_id):
+        if not self.available or user_id is None:
+            return []
+
+        try:
+            return await self._read_through_async(user_id, 'agent_metrics', self._fetch_agent_metrics_async, user_id)
+        except Exception as e:
+            return []
+
+    async def _fetch_agent_metrics_async(self, user_id):
+        query = self.async_db.collection('agent_metrics') \
+                             .where(filter=FieldFilter('user_id', '==', user_id))
+
+        results = [self._agent_metric_row(doc.to_dict()) async for doc in query.stream()]
+        results.sort(key=lambda x: x['calls'], reverse=True)
+        return results
+
+    async def _fetch_task_history_async(self, user_id, limit, start_after=None, end_before=None):
+        query = self.async_db.collection('users').document(user_id).collection('task_history')
+        docs = self._page(query, limit, start_after, end_before).stream()
+        return [self._task_row(doc.to_dict()) async for doc in docs]
+
+    async def _fetch_chat_history_async(self, user_id, limit, start_after=None, end_before=None):
+        query = self.async_db.collection('users').document(user_id).collection('chat_logs') \
+                             .select(list(chat_log.SUMMARY_FIELDS) + ['user_input'])
+        docs = self._page(query, limit, start_after, end_before).stream()
+        return [chat_log.summary_entry(doc.id, doc.to_dict()) async for doc in docs]
+
+
+class UnitOfWork:
+    """
+    Collects the writes produced by one handled request (XP progress, task
+    history, chat log, agent metrics, activity rollups, PAEI scores) and
+    commits them in one atomic batch, without reading anything first: every
+    counter is a server-side increment, so concurrent requests can't lose
+    an update. The new totals come back in the commit's transform results;
+    the level is derived from them and stored with a second write only when
+    this commit crossed a level threshold. commit() returns the assigned
+    document IDs and the resulting aggregates, so callers don't need to
+    read them back.
+    """
+    def __init__(self, database, user_id):
+        self.database = database
+        self.user_id = user_id
+        self._tasks = []    # (xp_earned, task_type, task_number)
+        self._level_for_xp = None
+        self._chats = []    # (client_log_id, chat_logs summary, chat_bodies body)
+        self._metrics = {}  # agent_name -> [calls, xp_earned]
+        self._rollups = []  # (agent_name, counter deltas)
+        self._stat_increments = {}  # field -> {key: amount}, e.g. the PAEI scores
+
+    def add_xp(self, xp_earned, task_type, level_for_xp=None, task_number=None):
+        """
+        Stages an XP gain plus its task_history entry. level_for_xp maps the
+        new total XP to the level stored in xp_progress. task_number is the
+        number shown for the entry (the caller's running count), since the
+        commit doesn't read the counters to derive it.
+        """
+        self._tasks.append((xp_earned, task_type, task_number))
+        if level_for_xp is not None:
+            self._level_for_xp = level_for_xp
+        return self
+
+    def log_chat(self, user_input, agent_response, agent_used, metadata=None, client_log_id=None):
+        summary, body = _chat_records(user_input, agent_response, agent_used, metadata, client_log_id)
+        self._chats.append((client_log_id, summary, body))
+        return self
+
+    def update_agent_metrics(self, agent_name, xp_earned):
+        calls_and_xp = self._metrics.setdefault(agent_name, [0, 0])
+        calls_and_xp[0] += 1
+        calls_and_xp[1] += xp_earned
+        return self
+
+    def update_rollups(self, agent_name, xp_earned, tasks=1, latency_ms=None):
+        """Stages the request's counts for the current hourly and daily rollups."""
+        self._rollups.append((agent_name, rollups.increments(agent_name, xp_earned, tasks, latency_ms)))
+        return self
+
+    def increment_user_stats(self, increments):
+        """
+        Stages server-side increments of derived maps in the user's
+        xp_progress document (e.g. the PAEI scores), given as
+        {field: {key: amount}}. Their new values are returned in the
+        "user_stats" aggregate.
+        """
+        for field, amounts in increments.items():
+            totals = self._stat_increments.setdefault(field, {})
+            for key, amount in amounts.items():
+                totals[key] = totals.get(key, 0) + amount
+        return self
+
+    def _empty_result(self):
+        return {"ids": {"task_history": [], "chat_logs": []}, "aggregates": {}}
+
+    def _writes(self, client, result):
+        """
+        Every staged write, as (aggregate key, ref, fields, merge). Writes
+        with an aggregate key carry the counters that commit() decodes from
+        their transform results. Document IDs are recorded in result.
+        """
+        writes = []
+        user_ref = client.collection('users').document(self.user_id)
+
+        xp_fields = {
+            field: {key: firestore.Increment(amount) for key, amount in amounts.items()}
+            for field, amounts in self._stat_increments.items()
+        }
+        if self._tasks:
+            xp_fields['total_xp'] = firestore.Increment(sum(xp_earned for xp_earned, _, _ in self._tasks))
+            xp_fields['tasks_completed'] = firestore.Increment(len(self._tasks))
+        if xp_fields:
+            xp_fields['updated_at'] = firestore.SERVER_TIMESTAMP
+            writes.append(('xp_progress', client.collection('xp_progress').document(self.user_id), xp_fields, True))
+
+        for xp_earned, task_type, task_number in self._tasks:
+            task_ref = user_ref.collection('task_history').document()
+            writes.append((None, task_ref, {
+                'task_type': task_type,
+                'xp_earned': xp_earned,
+                'task_number': task_number,
+                'created_at': firestore.SERVER_TIMESTAMP
+            }, False))
+            result["ids"]["task_history"].append(task_ref.id)
+
+        for client_log_id, summary, body in self._chats:
+            chat_ref = user_ref.collection('chat_logs').document(client_log_id)
+            writes.append((None, chat_ref, summary, False))
+            writes.append((None, user_ref.collection('chat_bodies').document(chat_ref.id), body, False))
+            result["ids"]["chat_logs"].append(chat_ref.id)
+
+        for agent_name, (calls, xp_earned) in self._metrics.items():
+            writes.append((('agent_metrics', agent_name),
+                client.collection('agent_metrics').document(f"{self.user_id}_{agent_name}"), {
+                    'user_id': self.user_id,
+                    'agent_name': agent_name,
+                    'call_count': firestore.Increment(calls),
+                    'total_xp_generated': firestore.Increment(xp_earned),
+                    'last_used': firestore.SERVER_TIMESTAMP
+                }, True))
+
+        writes.extend((None, ref, fields, True) for ref, fields in self._rollup_writes(user_ref))
+        return writes
+
+    def _rollup_writes(self, user_ref):
+        """
+        Adds the staged counts to the current bucket documents with
+        server-side increments, so concurrent requests need no read.
+        """
+        if not self._rollups:
+            return []
+        totals = {}
+        for agent_name, deltas in self._rollups:
+            agent_totals = totals.setdefault(agent_name, {})
+            for counter, delta in deltas.items():
+                agent_totals[counter] = agent_totals.get(counter, 0) + delta
+
+        writes = []
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for bucket in rollups.BUCKETS:
+            start = rollups.bucket_start(now, bucket)
+            fields = {
+                'bucket': bucket,
+                'start': start,
+                'updated_at': firestore.SERVER_TIMESTAMP,
+                'agents': {
+                    agent_name: {counter: firestore.Increment(delta) for counter, delta in deltas.items()}
+                    for agent_name, deltas in totals.items()
+                }
+            }
+            for counter in rollups.COUNTERS:
+                delta = sum(deltas.get(counter, 0) for deltas in totals.values())
+                if delta:
+                    fields[counter] = firestore.Increment(delta)
+            writes.append((user_ref.collection(f'rollups_{bucket}').document(rollups.bucket_id(start, bucket)), fields))
+        return writes
+
+    def _aggregate(self, result, values):
+        """
+        Fills result's aggregates from the decoded counters ({aggregate key:
+        values}). Returns the level to store when this commit crossed a
+        level threshold, else None; concurrent commits cover disjoint XP
+        ranges, so exactly one of them stores each new level.
+        """
+        level_up = None
+        xp_values = values.get('xp_progress')
+        if xp_values is not None:
+            if self._tasks:
+                total_xp = xp_values.get('total_xp', 0)
+                aggregate = {"total_xp": total_xp, "tasks_completed": xp_values.get('tasks_completed', 0)}
+                if self._level_for_xp:
+                    aggregate["level"] = self._level_for_xp(total_xp)
+                    xp_earned = sum(xp_earned for xp_earned, _, _ in self._tasks)
+                    if aggregate["level"] > self._level_for_xp(total_xp - xp_earned):
+                        level_up = aggregate["level"]
+                result["aggregates"]["xp_progress"] = aggregate
+            if self._stat_increments:
+                result["aggregates"]["user_stats"] = {field: xp_values.get(field) for field in self._stat_increments}
+
+        if self._metrics:
+            result["aggregates"]["agent_metrics"] = {}
+        for agent_name in self._metrics:
+            metrics = values.get(('agent_metrics', agent_name), {})
+            result["aggregates"]["agent_metrics"][agent_name] = {
+                "call_count": metrics.get('call_count'), "total_xp_generated": metrics.get('total_xp_generated')
+            }
+        return level_up
+
+    def _stage(self, batch, writes):
+        for _, ref, fields, merge in writes:
+            batch.set(ref, fields, merge=merge)
+
+    def commit(self):
+        if not self.database.available or self.user_id is None:
+            return self._empty_result()
+
+        try:
+            client = self.database.db
+            result = self._empty_result()
+            writes = self._writes(client, result)
+            if not writes:
+                return result
+            batch = client.batch()
+            self._stage(batch, writes)
+            write_results = batch.commit()
+
+            values = {}
+            for (key, ref, fields, _), write_result in zip(writes, write_results):
+                if key is not None:
+                    decoded = _transform_values(fields, write_result)
+                    # Without transform results, read the counters back
+                    values[key] = decoded if decoded is not None else (ref.get().to_dict() or {})
+
+            level = self._aggregate(result, values)
+            if level is not None:
+                client.collection('xp_progress').document(self.user_id).set(
+                    {'level': firestore.Maximum(level)}, merge=True
+                )
+            return result
         except Exception as e:
-            return []
\ No newline at end of file
+            return self._empty_result()
+        finally:
+            self._invalidate_cache()
+
+    async def commit_async(self):
+        """Async variant of commit, on the async Firestore client."""
+        if not self.database.available or self.user_id is None:
+            return self._empty_result()
+
+        try:
+            client = self.database.async_db
+            result = self._empty_result()
+            writes = self._writes(client, result)
+            if not writes:
+                return result
+            batch = client.batch()
+            self._stage(batch, writes)
+            write_results = await batch.commit()
+
+            values = {}
+            for (key, ref, fields, _), write_result in zip(writes, write_results):
+                if key is not None:
+                    decoded = _transform_values(fields, write_result)
+                    values[key] = decoded if decoded is not None else ((await ref.get()).to_dict() or {})
+
+            level = self._aggregate(result, values)
+            if level is not None:
+                await client.collection('xp_progress').document(self.user_id).set(
+                    {'level': firestore.Maximum(level)}, merge=True
+                )
+            return result
+        except Exception as e:
+            return self._empty_result()
+        finally:
+            self._invalidate_cache()
+
+    def _invalidate_cache(self):
+        kinds = []
+        if self._tasks:
+            kinds += ['xp_progress', 'task_history']
+        elif self._stat_increments:
+            kinds.append('xp_progress')
+        if self._chats:
+            kinds.append('chat_history')
+        if self._metrics:
+            kinds.append('agent_metrics')
+        if self._rollups:
+            kinds.append('rollups')
+        if kinds:
+            self.database.invalidate_user_cache(self.user_id, *kinds)
@@ -0,0 +1,84 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+class HistoryPager:
+    """
+    Newest-first history loaded a page at a time and kept between Streamlit
+    reruns (store the pager in st.session_state). Pages already seen are
+    never fetched again: refresh() only asks for entries newer than the
+    newest one held, and load_more() continues after the oldest.
+
+    fetch(limit=, start_after=, end_before=) must return entries newest
+    first, each carrying a sortable cursor value under `key`.
+    """
+
+    def __init__(self, fetch, page_size=5, key="timestamp", owner=None):
+        self.fetch = fetch
+        self.page_size = page_size
+        self.key = key
+        self.owner = owner  # e.g. the user_id, so callers can tell when to rebuild
+        self.entries = []
+        self.exhausted = False
+        self.loaded = False
+
+    def _newest(self):
+        for entry in self.entries:
+            if entry.get(self.key) is not None:
+                return entry[self.key]
+        return None
+
+    def _oldest(self):
+        for entry in reversed(self.entries):
+            if entry.get(self.key) is not None:
+                return entry[self.key]
+        return None
+
+    def _load_first_page(self):
+        page = self.fetch(limit=self.page_size, start_after=None, end_before=None)
+        self.entries = list(page)
+        self.exhausted = len(page) < self.page_size
+        self.loaded = True
+
+    def refresh(self):
+        """
+        Loads the first page, or afterwards only the entries newer than the
+        newest cached one. Returns the number of new entries.
+        """
+        try:
+            newest = self._newest()
+            if not self.loaded or newest is None:
+                self._load_first_page()
+                return len(self.entries)
+
+            newer = self.fetch(limit=self.page_size, start_after=None, end_before=newest)
+            if len(newer) >= self.page_size:
+                # More arrived than one page holds; there may be a gap between
+                # them and the cache, so start over from the newest page.
+                self._load_first_page()
+                return len(self.entries)
+
+            self.entries = list(newer) + self.entries
+            return len(newer)
+        except Exception as e:
+            return 0
+
+    def load_more(self):
+        """Appends the next older page. Returns the number of entries added."""
+        if self.exhausted:
+            return 0
+        if not self.loaded:
+            return self.refresh()
+
+        try:
+            page = self.fetch(limit=self.page_size, start_after=self._oldest(), end_before=None)
+            self.entries.extend(page)
+            self.exhausted = len(page) < self.page_size
+            return len(page)
+        except Exception as e:
+            return 0
+
+    def reset(self):
+        self.entries = []
+        self.exhausted = False
+        self.loaded = False
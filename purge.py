@@ -0,0 +1,228 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Marker documents for purges that have started but not finished
+PURGES_COLLECTION = '_purges'
+
+class FirestorePurger:
+    """
+    Deletes everything stored for a user: the subcollections under
+    users/{id} (task_history, chat_logs, chat_bodies, ...), their
+    agent_metrics documents, xp_progress/{id} and finally users/{id}.
+
+    Each collection is drained a page at a time through a BulkWriter, with
+    up to max_workers collections in flight at once. Deletion is
+    idempotent and a _purges/{id} marker is written before the first
+    delete and removed after the last, so an interrupted purge is simply
+    run again (see resume_pending).
+    """
+    # Where find_orphans looks for user IDs, in scan order
+    ORPHAN_SOURCES = ('agent_metrics', 'xp_progress', 'users')
+    # Tries per document before a drain gives up on it
+    MAX_DELETE_ATTEMPTS = 5
+
+    def __init__(self, client, max_workers=4, page_size=300):
+        self.client = client
+        self.max_workers = max_workers
+        self.page_size = page_size
+        # (source index, last document ID) where the last orphan scan stopped
+        self._orphan_position = (0, None)
+
+    def _user_targets(self, user_id):
+        """Queries whose documents belong to this user, drained in parallel."""
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        user_ref = self.client.collection('users').document(user_id)
+        # collections() also finds subcollections of an already-deleted user doc
+        targets = [(collection.id, collection) for collection in user_ref.collections()]
+        targets.append((
+            'agent_metrics',
+            self.client.collection('agent_metrics').where(filter=FieldFilter('user_id', '==', user_id))
+        ))
+        return targets
+
+    def _drain(self, name, query, progress=None):
+        """
+        Deletes every document matched by query. Returns the number deleted.
+        A delete that still fails after MAX_DELETE_ATTEMPTS stops the drain
+        with an error (purge_user reports it for this collection), since
+        re-querying the page would otherwise find the same document forever.
+        """
+        deleted = 0
+        failed = []
+        writer = self.client.bulk_writer()
+
+        def on_write_error(error, bulk_writer):
+            if error.attempts < self.MAX_DELETE_ATTEMPTS:
+                return True
+            failed.append(f"{error.operation.reference.path}: {error.message}")
+            return False
+
+        # flush() doesn't raise for failed writes; they are only reported here
+        writer.on_write_error(on_write_error)
+        try:
+            while True:
+                # Keys only; the page is re-queried after each flush, so
+                # a restarted drain picks up wherever the last one stopped
+                refs = [doc.reference for doc in query.select([]).limit(self.page_size).stream()]
+                if not refs:
+                    return deleted
+                for ref in refs:
+                    writer.delete(ref)
+                writer.flush()
+                if failed:
+                    raise RuntimeError(f"{len(failed)} deletes failed, e.g. {failed[0]}")
+                deleted += len(refs)
+                if progress:
+                    progress(name, deleted)
+        finally:
+            writer.close()
+
+    def purge_user(self, user_id, progress=None):
+        """
+        Deletes the user's data. progress(collection, deleted_so_far) is
+        called after every page. Returns {"user_id", "deleted", "complete",
+        "failures"}; failures maps each collection that couldn't be drained
+        to its error.
+        """
+        marker_ref = self.client.collection(PURGES_COLLECTION).document(user_id)
+        marker_ref.set({'user_id': user_id, 'started_at': time.time()}, merge=True)
+
+        deleted = {}
+        failures = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="purge") as pool:
+            futures = {
+                name: pool.submit(self._drain, name, query, progress)
+                for name, query in self._user_targets(user_id)
+            }
+            for name, future in futures.items():
+                try:
+                    deleted[name] = deleted.get(name, 0) + future.result()
+                except Exception as e:
+                    failures[name] = str(e)
+
+        if failures:
+            # Keep the top-level docs and the marker so the purge is retried
+            return {"user_id": user_id, "deleted": deleted, "complete": False, "failures": failures}
+
+        self.client.collection('xp_progress').document(user_id).delete()
+        self.client.collection('users').document(user_id).delete()
+        marker_ref.delete()
+        if progress:
+            progress('users', 1)
+        return {"user_id": user_id, "deleted": deleted, "complete": True, "failures": {}}
+
+    def resume_pending(self, limit=20, progress=None):
+        """Finishes purges that were interrupted. Returns their results."""
+        markers = self.client.collection(PURGES_COLLECTION).select([]).limit(limit).stream()
+        return [self.purge_user(marker.id, progress) for marker in markers]
+
+    def _id_pages(self, source, after=None):
+        """
+        Pages of (document ID, user ID) from one orphan source, in document
+        ID order, starting after the document ID `after`.
+        """
+        if source == 'users':
+            # list_documents() includes missing parents that still have
+            # subcollections; it can't start at a cursor, so skip up to it
+            page = []
+            for ref in self.client.collection('users').list_documents(page_size=self.page_size):
+                if after is not None and ref.id <= after:
+                    continue
+                page.append((ref.id, ref.id))
+                if len(page) == self.page_size:
+                    yield page
+                    page = []
+            if page:
+                yield page
+            return
+
+        fields = ['user_id'] if source == 'agent_metrics' else []
+        query = self.client.collection(source).select(fields).order_by('__name__').limit(self.page_size)
+        while True:
+            paged = query.start_after({'__name__': after}) if after is not None else query
+            docs = list(paged.stream())
+            if not docs:
+                return
+            if source == 'agent_metrics':
+                yield [(doc.id, (doc.to_dict() or {}).get('user_id')) for doc in docs]
+            else:
+                yield [(doc.id, doc.id) for doc in docs]
+            after = docs[-1].id
+
+    def find_orphans(self, limit=100, scan_limit=3000):
+        """
+        User IDs that still have data but no users/{id} document: users
+        deleted before purges were recursive, or rows written back by a
+        late write after a purge.
+
+        The sources are read a page at a time with a cursor, and at most
+        scan_limit documents are read per call; the next call carries on
+        from where this one stopped and wraps around once every source has
+        been scanned, so no single sweep reads whole collections.
+        """
+        orphans = []
+        seen = set()
+        scanned = 0
+        users = self.client.collection('users')
+
+        index, after = self._orphan_position
+        for step in range(len(self.ORPHAN_SOURCES)):
+            source_index = (index + step) % len(self.ORPHAN_SOURCES)
+            for page in self._id_pages(self.ORPHAN_SOURCES[source_index], after):
+                scanned += len(page)
+                candidates = []
+                for _, user_id in page:
+                    if user_id and user_id not in seen:
+                        seen.add(user_id)
+                        candidates.append(user_id)
+                if candidates:
+                    refs = [users.document(user_id) for user_id in candidates]
+                    orphans += [snapshot.id for snapshot in self.client.get_all(refs, field_paths=[]) if not snapshot.exists]
+                self._orphan_position = (source_index, page[-1][0])
+                if len(orphans) >= limit or scanned >= scan_limit:
+                    return orphans[:limit]
+            # Source exhausted: the next one starts from its beginning
+            after = None
+            self._orphan_position = ((source_index + 1) % len(self.ORPHAN_SOURCES), None)
+        return orphans[:limit]
+
+class OrphanSweeper:
+    """
+    Background thread that periodically calls db.sweep_orphans(), so data
+    left behind by interrupted purges or old deletes is cleaned up.
+    """
+    def __init__(self, db, interval=3600, name="orphan-sweeper"):
+        self.db = db
+        self.interval = interval
+        self.last_result = None
+        self.runs = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def run_once(self):
+        try:
+            self.last_result = self.db.sweep_orphans()
+        except Exception as e:
+            self.last_result = {"error": str(e)}
+        self.runs += 1
+        return self.last_result
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.run_once()
+            self._stop.wait(self.interval)
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout)
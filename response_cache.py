@@ -0,0 +1,67 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import os
+import json
+import hashlib
+
+from cache import TieredCache
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "response_cache.sqlite3")
+
+class ResponseCache(TieredCache):
+    """
+    Two-tier cache for generated responses: an in-memory LRU in front of a
+    SQLite file, so entries survive Streamlit restarts.
+    Each entry remembers the latency and tokens of the original call, which
+    lets hits report how much time and cost they saved.
+    """
+    # Seconds each agent's responses stay valid (0 disables caching for it)
+    DEFAULT_TTLS = {
+        "research": 24 * 3600,
+        "notion": 6 * 3600,
+        "email": 3600,
+        "slack": 3600,
+        "calendar": 600,
+        "general": 3600
+    }
+
+    def __init__(self, path=DEFAULT_CACHE_PATH, memory_size=256, max_disk_entries=5000, ttls=None):
+        super().__init__(path, "responses", memory_size=memory_size, max_disk_entries=max_disk_entries)
+        self.ttls = dict(self.DEFAULT_TTLS)
+        if ttls:
+            self.ttls.update(ttls)
+
+        self.saved_latency_ms = 0.0
+        self.saved_tokens = 0
+
+    @staticmethod
+    def make_key(agent, model_name, prompt, safety_settings=None):
+        """Hashes everything that determines the model's output."""
+        safety = sorted((str(k), str(v)) for k, v in (safety_settings or {}).items())
+        raw = json.dumps([agent, model_name, prompt, safety])
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get_ttl(self, agent):
+        return self.ttls.get(agent, 3600)
+
+    def _record_hit(self, entry):
+        with self._lock:
+            self.saved_latency_ms += entry.get("latency_ms", 0)
+            self.saved_tokens += entry.get("tokens", 0)
+
+    def set(self, key, agent, text, latency_ms=0, tokens=0):
+        ttl = self.get_ttl(agent)
+        if ttl <= 0:
+            return
+        entry = {"agent": agent, "text": text, "latency_ms": latency_ms, "tokens": tokens}
+        super().set(key, entry, ttl=ttl)
+
+    def get_stats(self):
+        stats = super().get_stats()
+        stats.update({
+            "saved_latency_ms": round(self.saved_latency_ms, 1),
+            "saved_tokens": self.saved_tokens
+        })
+        return stats
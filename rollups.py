@@ -0,0 +1,81 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+"""
+Time-bucketed activity rollups shared by the storage backends. Every
+handled request adds its call, XP, task and latency counts to one hourly
+and one daily bucket, in the same write as the task itself, so charts over
+any range read a handful of small rollup records instead of raw history.
+Buckets are aligned to UTC.
+"""
+
+import datetime
+
+BUCKETS = {
+    "hour": datetime.timedelta(hours=1),
+    "day": datetime.timedelta(days=1)
+}
+
+# Counters kept per bucket, both in total and per agent
+COUNTERS = ('calls', 'xp', 'tasks', 'latency_ms_sum', 'latency_count')
+
+def bucket_start(moment, bucket):
+    """Start of the UTC bucket containing moment (a datetime or epoch seconds)."""
+    if not isinstance(moment, datetime.datetime):
+        moment = datetime.datetime.fromtimestamp(moment, datetime.timezone.utc)
+    elif moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    moment = moment.astimezone(datetime.timezone.utc)
+    if bucket == "hour":
+        return moment.replace(minute=0, second=0, microsecond=0)
+    if bucket == "day":
+        return moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    raise ValueError(f"Unknown rollup bucket '{bucket}'. Expected one of: {', '.join(BUCKETS)}")
+
+def bucket_id(start, bucket):
+    """Stable document/row key for a bucket, e.g. day-20260117 or hour-2026011709."""
+    return f"{bucket}-{start.strftime('%Y%m%d%H' if bucket == 'hour' else '%Y%m%d')}"
+
+def range_start(bucket, count, now=None):
+    """Start of the oldest of the last `count` buckets, including the current one."""
+    current = bucket_start(now if now is not None else datetime.datetime.now(datetime.timezone.utc), bucket)
+    return current - BUCKETS[bucket] * (count - 1)
+
+def increments(agent_name, xp_earned, tasks=1, latency_ms=None):
+    """Counter deltas for one handled request, as {counter: delta}."""
+    deltas = {'calls': 1, 'xp': xp_earned, 'tasks': tasks}
+    if latency_ms is not None:
+        deltas['latency_ms_sum'] = float(latency_ms)
+        deltas['latency_count'] = 1
+    return deltas
+
+def empty_rollup(start, bucket):
+    rollup = {"bucket": bucket, "start": start, "agents": {}}
+    rollup.update({counter: 0 for counter in COUNTERS})
+    return rollup
+
+def add_to_rollup(rollup, agent_name, deltas):
+    """Adds counter deltas to a rollup dict, in total and for agent_name."""
+    agent = rollup["agents"].setdefault(agent_name, {counter: 0 for counter in COUNTERS})
+    for counter, delta in deltas.items():
+        rollup[counter] = rollup.get(counter, 0) + delta
+        agent[counter] = agent.get(counter, 0) + delta
+    return rollup
+
+def fill_range(rollups, bucket, count, now=None):
+    """
+    Returns exactly `count` consecutive rollups ending with the current
+    bucket, oldest first, with empty buckets filled in.
+    """
+    by_start = {bucket_start(rollup["start"], bucket): rollup for rollup in rollups}
+    start = range_start(bucket, count, now)
+    filled = []
+    for index in range(count):
+        moment = start + BUCKETS[bucket] * index
+        filled.append(by_start.get(moment) or empty_rollup(moment, bucket))
+    return filled
+
+def average_latency_ms(rollup):
+    count = rollup.get("latency_count", 0)
+    return round(rollup.get("latency_ms_sum", 0) / count, 1) if count else None
@@ -0,0 +1,73 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import time
+import threading
+
+from cache import LRUCache
+
+class SessionState:
+    """
+    What a browser session keeps between reruns. Everything heavier (the
+    ParentAgent and its sub-agents) lives in a SessionRegistry and can be
+    rebuilt from this.
+    """
+    __slots__ = ("session_id", "user_id", "context", "stats", "last_active")
+
+    def __init__(self, session_id, user_id=None):
+        self.session_id = session_id
+        self.user_id = user_id
+        self.context = {}   # ContextManager state, updated in place
+        self.stats = None   # Last confirmed XP totals, seeds a rebuilt agent
+        self.last_active = time.time()
+
+class SessionRegistry:
+    """
+    Process-wide ParentAgents keyed by session ID. Agents idle for longer
+    than idle_ttl seconds, or beyond max_sessions, are dropped; the next
+    rerun of that session rebuilds one from its SessionState.
+
+    build_agent(state) creates the agent, normally with the process's
+    SharedResources so a rebuild only allocates per-user state.
+    """
+    def __init__(self, build_agent, max_sessions=500, idle_ttl=1800, sweep_interval=60):
+        self.build_agent = build_agent
+        self.sweep_interval = sweep_interval
+        self._agents = LRUCache(maxsize=max_sessions, ttl=idle_ttl)
+        self._lock = threading.Lock()
+        self._last_sweep = time.monotonic()
+        self.rebuilds = 0
+
+    def get_agent(self, state):
+        """Returns the session's agent, building it if it was never made or was evicted."""
+        self._sweep()
+        state.last_active = time.time()
+
+        agent = self._agents.get(state.session_id)
+        if agent is None or agent.user_id != state.user_id:
+            agent = self.build_agent(state)
+            with self._lock:
+                self.rebuilds += 1
+        # set() again to refresh the idle TTL
+        self._agents.set(state.session_id, agent)
+        return agent
+
+    def save(self, state, agent):
+        """Copies the agent's cacheable stats back into the session state."""
+        state.stats = agent.xp_agent.get_baseline()
+
+    def evict(self, session_id):
+        return self._agents.invalidate(session_id)
+
+    def _sweep(self):
+        with self._lock:
+            if time.monotonic() - self._last_sweep < self.sweep_interval:
+                return
+            self._last_sweep = time.monotonic()
+        self._agents.purge_expired()
+
+    def get_stats(self):
+        stats = self._agents.get_stats()
+        stats["rebuilds"] = self.rebuilds
+        return stats
@@ -0,0 +1,32 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+from collections import namedtuple
+from types import MappingProxyType
+
+# Everything the Streamlit dashboard renders for one user, read together.
+# Shared by every storage backend, so it lives outside database.py.
+DashboardSnapshot = namedtuple(
+    'DashboardSnapshot', ['user_id', 'xp_progress', 'agent_metrics', 'chat_history', 'task_history']
+)
+
+DEFAULT_XP_PROGRESS = {"total_xp": 0, "level": 1, "tasks_completed": 0}
+
+def freeze(value):
+    """Read-only view of a loaded value: dicts become mapping proxies, lists tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+def build_snapshot(user_id, xp_progress=None, agent_metrics=None, chat_history=None, task_history=None):
+    """A frozen DashboardSnapshot; missing parts fall back to empty defaults."""
+    return DashboardSnapshot(
+        user_id,
+        freeze(xp_progress if xp_progress is not None else DEFAULT_XP_PROGRESS),
+        freeze(agent_metrics or []),
+        freeze(chat_history or []),
+        freeze(task_history or [])
+    )
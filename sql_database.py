@@ -0,0 +1,772 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import os
+import json
+import time
+import uuid
+import queue
+import asyncio
+import sqlite3
+import datetime
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+import chat_log
+import rollups
+from purge import OrphanSweeper
+from snapshot import build_snapshot, DEFAULT_XP_PROGRESS
+
+# Columns of xp_progress; any other field (e.g. paei_scores) lives in `extra`
+_XP_COLUMNS = ('total_xp', 'level', 'tasks_completed')
+
+def _timestamp(value):
+    return datetime.datetime.fromtimestamp(value) if value is not None else None
+
+# datetime only keeps microseconds, so a cursor read back from a row can sit
+# just below the stored float; compare with half a microsecond of slack.
+_CURSOR_SLACK = 5e-7
+
+def _epoch(value):
+    return value.timestamp() if isinstance(value, datetime.datetime) else value
+
+class SQLDatabase(ABC):
+    """
+    Relational storage backend with the same methods as the Firestore
+    Database class. Aggregates such as agent_metrics are plain indexed
+    tables updated with upserts, so reads are local SQL queries instead of
+    billed document reads.
+    Subclasses provide the connection handling (_transaction, optionally a
+    cheaper _read_transaction) and the few dialect differences
+    (placeholder, auto-increment id column).
+    """
+    placeholder = "?"
+    id_column = "INTEGER PRIMARY KEY AUTOINCREMENT"
+    blob_type = "BLOB"
+
+    def __init__(self):
+        self.available = False
+        self._sweeper = None
+        self._sweeper_lock = threading.Lock()
+
+    # --- Dialect / connection hooks ---
+
+    @abstractmethod
+    def _transaction(self):
+        """Context manager yielding a cursor inside a read-write transaction."""
+
+    def _read_transaction(self):
+        """
+        Context manager yielding a cursor for read-only queries. Defaults to
+        a normal transaction; backends override it when reads can avoid
+        the writers' locks.
+        """
+        return self._transaction()
+
+    def _sql(self, query):
+        return query if self.placeholder == "?" else query.replace("?", self.placeholder)
+
+    def _execute(self, cursor, query, params=()):
+        cursor.execute(self._sql(query), params)
+        return cursor
+
+    def _schema(self):
+        return [
+            """CREATE TABLE IF NOT EXISTS users (
+                id TEXT PRIMARY KEY,
+                session_id TEXT NOT NULL UNIQUE,
+                created_at DOUBLE PRECISION NOT NULL,
+                last_active DOUBLE PRECISION NOT NULL
+            )""",
+            """CREATE TABLE IF NOT EXISTS xp_progress (
+                user_id TEXT PRIMARY KEY,
+                total_xp INTEGER NOT NULL DEFAULT 0,
+                level INTEGER NOT NULL DEFAULT 1,
+                tasks_completed INTEGER NOT NULL DEFAULT 0,
+                extra TEXT,
+                updated_at DOUBLE PRECISION
+            )""",
+            f"""CREATE TABLE IF NOT EXISTS task_history (
+                id {self.id_column},
+                user_id TEXT NOT NULL,
+                task_type TEXT,
+                xp_earned INTEGER NOT NULL,
+                task_number INTEGER NOT NULL,
+                created_at DOUBLE PRECISION NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS idx_task_history_user ON task_history (user_id, created_at DESC)",
+            f"""CREATE TABLE IF NOT EXISTS chat_logs (
+                id {self.id_column},
+                user_id TEXT NOT NULL,
+                input_preview TEXT,
+                agent_used TEXT,
+                response_length INTEGER NOT NULL DEFAULT 0,
+                metadata TEXT,
+                client_log_id TEXT UNIQUE,
+                created_at DOUBLE PRECISION NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS idx_chat_logs_user ON chat_logs (user_id, created_at DESC)",
+            f"""CREATE TABLE IF NOT EXISTS chat_bodies (
+                log_id BIGINT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                user_input TEXT,
+                response {self.blob_type},
+                encoding TEXT NOT NULL
+            )""",
+            "CREATE INDEX IF NOT EXISTS idx_chat_bodies_user ON chat_bodies (user_id)",
+            """CREATE TABLE IF NOT EXISTS agent_metrics (
+                user_id TEXT NOT NULL,
+                agent_name TEXT NOT NULL,
+                call_count INTEGER NOT NULL DEFAULT 0,
+                total_xp_generated INTEGER NOT NULL DEFAULT 0,
+                last_used DOUBLE PRECISION,
+                PRIMARY KEY (user_id, agent_name)
+            )""",
+            "CREATE INDEX IF NOT EXISTS idx_agent_metrics_calls ON agent_metrics (user_id, call_count DESC)",
+            """CREATE TABLE IF NOT EXISTS rollups (
+                user_id TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                bucket_start DOUBLE PRECISION NOT NULL,
+                agent_name TEXT NOT NULL,
+                calls INTEGER NOT NULL DEFAULT 0,
+                xp INTEGER NOT NULL DEFAULT 0,
+                tasks INTEGER NOT NULL DEFAULT 0,
+                latency_ms_sum DOUBLE PRECISION NOT NULL DEFAULT 0,
+                latency_count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_id, bucket, bucket_start, agent_name)
+            )"""
+        ]
+
+    # --- Setup ---
+
+    def init_tables(self):
+        if not self.available:
+            return
+        with self._transaction() as cursor:
+            for statement in self._schema():
+                self._execute(cursor, statement)
+
+    def warm_up(self):
+        if self.available:
+            with self._read_transaction() as cursor:
+                self._execute(cursor, "SELECT 1")
+
+    async def warm_up_async(self):
+        await asyncio.to_thread(self.warm_up)
+
+    def invalidate_user_cache(self, user_id, *kinds):
+        """No read cache here; SQL reads are cheap. Kept for interface parity."""
+        pass
+
+    def get_cache_stats(self):
+        return {}
+
+    def get_or_create_user(self, session_id):
+        if not self.available:
+            return None
+
+        try:
+            now = time.time()
+            with self._transaction() as cursor:
+                row = self._execute(cursor, "SELECT id FROM users WHERE session_id = ?", (session_id,)).fetchone()
+                if row:
+                    self._execute(cursor, "UPDATE users SET last_active = ? WHERE id = ?", (now, row[0]))
+                    return row[0]
+
+                user_id = uuid.uuid4().hex
+                self._execute(cursor,
+                    "INSERT INTO users (id, session_id, created_at, last_active) VALUES (?, ?, ?, ?)",
+                    (user_id, session_id, now, now))
+                self._execute(cursor,
+                    "INSERT INTO xp_progress (user_id, total_xp, level, tasks_completed, updated_at) VALUES (?, 0, 1, 0, ?)",
+                    (user_id, now))
+                return user_id
+        except Exception as e:
+            return None
+
+    # --- xp_progress ---
+
+    def _xp_row_to_dict(self, row):
+        if row is None:
+            return dict(DEFAULT_XP_PROGRESS)
+        total_xp, level, tasks_completed, extra, updated_at = row
+        data = json.loads(extra) if extra else {}
+        data.update({
+            "total_xp": total_xp,
+            "level": level,
+            "tasks_completed": tasks_completed,
+            "updated_at": _timestamp(updated_at)
+        })
+        return data
+
+    def _read_xp_progress(self, cursor, user_id):
+        row = self._execute(cursor,
+            "SELECT total_xp, level, tasks_completed, extra, updated_at FROM xp_progress WHERE user_id = ?",
+            (user_id,)).fetchone()
+        return self._xp_row_to_dict(row)
+
+    def get_xp_progress(self, user_id):
+        if not self.available or user_id is None:
+            return dict(DEFAULT_XP_PROGRESS)
+
+        try:
+            with self._read_transaction() as cursor:
+                return self._read_xp_progress(cursor, user_id)
+        except Exception as e:
+            return dict(DEFAULT_XP_PROGRESS)
+
+    def update_xp_progress(self, user_id, total_xp, level, tasks_completed):
+        if not self.available or user_id is None:
+            return
+
+        try:
+            with self._transaction() as cursor:
+                self._execute(cursor,
+                    """INSERT INTO xp_progress (user_id, total_xp, level, tasks_completed, updated_at)
+                       VALUES (?, ?, ?, ?, ?)
+                       ON CONFLICT (user_id) DO UPDATE SET total_xp = excluded.total_xp, level = excluded.level,
+                           tasks_completed = excluded.tasks_completed, updated_at = excluded.updated_at""",
+                    (user_id, total_xp, level, tasks_completed, time.time()))
+        except Exception as e:
+            pass
+
+    def _increment(self, cursor, user_id, xp_earned, tasks_completed):
+        """
+        Atomic upsert-increment; returns the row after the update. On
+        Postgres the row stays locked until the transaction ends.
+        """
+        return self._execute(cursor,
+            """INSERT INTO xp_progress (user_id, total_xp, level, tasks_completed, updated_at)
+               VALUES (?, ?, 1, ?, ?)
+               ON CONFLICT (user_id) DO UPDATE SET total_xp = xp_progress.total_xp + excluded.total_xp,
+                   tasks_completed = xp_progress.tasks_completed + excluded.tasks_completed,
+                   updated_at = excluded.updated_at
+               RETURNING total_xp, level, tasks_completed, extra, updated_at""",
+            (user_id, xp_earned, tasks_completed, time.time())).fetchone()
+
+    # --- task_history ---
+
+    def add_task_to_history(self, user_id, task_type, xp_earned, task_number):
+        if not self.available or user_id is None:
+            return
+
+        try:
+            with self._transaction() as cursor:
+                self._insert_task(cursor, user_id, task_type, xp_earned, task_number)
+        except Exception as e:
+            pass
+
+    def _insert_task(self, cursor, user_id, task_type, xp_earned, task_number):
+        return self._execute(cursor,
+            """INSERT INTO task_history (user_id, task_type, xp_earned, task_number, created_at)
+               VALUES (?, ?, ?, ?, ?) RETURNING id""",
+            (user_id, task_type, xp_earned, task_number, time.time())).fetchone()[0]
+
+    def _page_filter(self, start_after, end_before):
+        """Extra WHERE terms and params for the created_at page cursors."""
+        clause, params = "", []
+        if start_after is not None:
+            clause += " AND created_at < ?"
+            params.append(_epoch(start_after) - _CURSOR_SLACK)
+        if end_before is not None:
+            clause += " AND created_at > ?"
+            params.append(_epoch(end_before) + _CURSOR_SLACK)
+        return clause, params
+
+    def _read_task_history(self, cursor, user_id, limit, start_after=None, end_before=None):
+        clause, params = self._page_filter(start_after, end_before)
+        rows = self._execute(cursor,
+            f"""SELECT task_type, xp_earned, task_number, created_at FROM task_history
+                WHERE user_id = ?{clause} ORDER BY created_at DESC, id DESC LIMIT ?""",
+            (user_id, *params, limit)).fetchall()
+        return [
+            {"type": task_type, "xp": xp, "task_number": number, "created_at": _timestamp(created_at)}
+            for task_type, xp, number, created_at in rows
+        ]
+
+    def get_task_history(self, user_id, limit=50, start_after=None, end_before=None):
+        """
+        Newest-first task history. start_after pages to tasks older than a
+        created_at value from a previous page; end_before returns only newer ones.
+        """
+        if not self.available or user_id is None:
+            return []
+
+        try:
+            with self._read_transaction() as cursor:
+                return self._read_task_history(cursor, user_id, limit, start_after, end_before)
+        except Exception as e:
+            return []
+
+    # --- chat_logs ---
+
+    def _insert_chat(self, cursor, user_id, user_input, agent_response, agent_used, metadata, client_log_id=None):
+        """Writes the chat_logs summary row and its compressed chat_bodies row."""
+        summary, body = chat_log.build_records(user_input, agent_response, agent_used, client_log_id)
+        log_id = self._execute(cursor,
+            """INSERT INTO chat_logs (user_id, input_preview, agent_used, response_length, metadata, client_log_id, created_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?) RETURNING id""",
+            (user_id, summary['input_preview'], agent_used, summary['response_length'],
+             json.dumps(metadata, default=str) if metadata else None, client_log_id, time.time())).fetchone()[0]
+        self._execute(cursor,
+            "INSERT INTO chat_bodies (log_id, user_id, user_input, response, encoding) VALUES (?, ?, ?, ?, ?)",
+            (log_id, user_id, body['user_input'], body['response'], body['encoding']))
+        return log_id
+
+    def log_chat(self, user_id, user_input, agent_response, agent_used, metadata=None, client_log_id=None):
+        if not self.available or user_id is None:
+            return
+
+        try:
+            with self._transaction() as cursor:
+                self._insert_chat(cursor, user_id, user_input, agent_response, agent_used, metadata, client_log_id)
+        except Exception as e:
+            pass
+
+    def _read_chat_history(self, cursor, user_id, limit, start_after=None, end_before=None):
+        clause, params = self._page_filter(start_after, end_before)
+        rows = self._execute(cursor,
+            f"""SELECT id, input_preview, agent_used, response_length, client_log_id, created_at FROM chat_logs
+                WHERE user_id = ?{clause} ORDER BY created_at DESC, id DESC LIMIT ?""",
+            (user_id, *params, limit)).fetchall()
+        return [
+            chat_log.summary_entry(log_id, {
+                'input_preview': input_preview, 'agent_used': agent,
+                'response_length': response_length, 'client_log_id': client_log_id,
+                'created_at': _timestamp(created_at)
+            })
+            for log_id, input_preview, agent, response_length, client_log_id, created_at in rows
+        ]
+
+    def get_chat_history(self, user_id, limit=20, start_after=None, end_before=None):
+        """Newest-first chat history, paged by "timestamp" like get_task_history."""
+        if not self.available or user_id is None:
+            return []
+
+        try:
+            with self._read_transaction() as cursor:
+                return self._read_chat_history(cursor, user_id, limit, start_after, end_before)
+        except Exception as e:
+            return []
+
+    def get_chat_body(self, user_id, log_id):
+        """Full request and response of one chat, as {"input", "response"}, or None."""
+        if not self.available or user_id is None or log_id is None:
+            return None
+
+        try:
+            with self._read_transaction() as cursor:
+                row = self._execute(cursor,
+                    "SELECT user_input, response, encoding FROM chat_bodies WHERE log_id = ? AND user_id = ?",
+                    (log_id, user_id)).fetchone()
+            if row is None:
+                return None
+            user_input, response, encoding = row
+            return chat_log.body_entry({'user_input': user_input, 'response': response, 'encoding': encoding})
+        except Exception as e:
+            return None
+
+    def get_labeled_requests(self, limit=5000):
+        """
+        Returns {"input", "agent", "route"} for chats across all users'
+        chat_logs, used to train the local intent classifier. route is how
+        the chat was routed ({"source", "confidence"}), None for old logs.
+        """
+        if not self.available:
+            return []
+
+        try:
+            with self._read_transaction() as cursor:
+                rows = self._execute(cursor,
+                    """SELECT b.user_input, c.agent_used, c.metadata FROM chat_logs c JOIN chat_bodies b ON b.log_id = c.id
+                       WHERE b.user_input IS NOT NULL AND c.agent_used IS NOT NULL LIMIT ?""",
+                    (limit,)).fetchall()
+            return [
+                {"input": user_input, "agent": agent, "route": (json.loads(metadata) if metadata else {}).get("route")}
+                for user_input, agent, metadata in rows if user_input and agent
+            ]
+        except Exception as e:
+            return []
+
+    # --- agent_metrics ---
+
+    def _upsert_metrics(self, cursor, user_id, agent_name, calls, xp_earned):
+        return self._execute(cursor,
+            """INSERT INTO agent_metrics (user_id, agent_name, call_count, total_xp_generated, last_used)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT (user_id, agent_name) DO UPDATE SET
+                   call_count = agent_metrics.call_count + excluded.call_count,
+                   total_xp_generated = agent_metrics.total_xp_generated + excluded.total_xp_generated,
+                   last_used = excluded.last_used
+               RETURNING call_count, total_xp_generated""",
+            (user_id, agent_name, calls, xp_earned, time.time())).fetchone()
+
+    def update_agent_metrics(self, user_id, agent_name, xp_earned):
+        if not self.available or user_id is None:
+            return
+
+        try:
+            with self._transaction() as cursor:
+                self._upsert_metrics(cursor, user_id, agent_name, 1, xp_earned)
+        except Exception as e:
+            pass
+
+    def _read_agent_metrics(self, cursor, user_id):
+        rows = self._execute(cursor,
+            """SELECT agent_name, call_count, total_xp_generated, last_used FROM agent_metrics
+               WHERE user_id = ? ORDER BY call_count DESC""",
+            (user_id,)).fetchall()
+        return [
+            {"agent": agent, "calls": calls, "xp_generated": xp, "last_used": _timestamp(last_used)}
+            for agent, calls, xp, last_used in rows
+        ]
+
+    def get_agent_metrics(self, user_id):
+        if not self.available or user_id is None:
+            return []
+
+        try:
+            with self._read_transaction() as cursor:
+                return self._read_agent_metrics(cursor, user_id)
+        except Exception as e:
+            return []
+
+    # --- rollups ---
+
+    def _upsert_rollup(self, cursor, user_id, bucket, start, agent_name, deltas):
+        counters = {counter: deltas.get(counter, 0) for counter in rollups.COUNTERS}
+        self._execute(cursor,
+            f"""INSERT INTO rollups (user_id, bucket, bucket_start, agent_name, {', '.join(counters)})
+               VALUES (?, ?, ?, ?, {', '.join('?' for _ in counters)})
+               ON CONFLICT (user_id, bucket, bucket_start, agent_name) DO UPDATE SET
+                   {', '.join(f'{counter} = rollups.{counter} + excluded.{counter}' for counter in counters)}""",
+            (user_id, bucket, start.timestamp(), agent_name) + tuple(counters.values()))
+
+    def get_rollups(self, user_id, bucket="day", count=30):
+        """
+        The last `count` hourly or daily activity rollups, oldest first and
+        with empty buckets filled in, in the same shape as the Firestore backend.
+        """
+        if not self.available or user_id is None:
+            return rollups.fill_range([], bucket, count)
+
+        try:
+            start = rollups.range_start(bucket, count)
+            with self._read_transaction() as cursor:
+                rows = self._execute(cursor,
+                    f"""SELECT bucket_start, agent_name, {', '.join(rollups.COUNTERS)} FROM rollups
+                       WHERE user_id = ? AND bucket = ? AND bucket_start >= ?""",
+                    (user_id, bucket, start.timestamp())).fetchall()
+        except Exception as e:
+            return rollups.fill_range([], bucket, count)
+
+        by_start = {}
+        for bucket_start, agent_name, *values in rows:
+            moment = datetime.datetime.fromtimestamp(bucket_start, datetime.timezone.utc)
+            rollup = by_start.setdefault(moment, rollups.empty_rollup(moment, bucket))
+            rollups.add_to_rollup(rollup, agent_name, dict(zip(rollups.COUNTERS, values)))
+        end = start + rollups.BUCKETS[bucket] * (count - 1)
+        return rollups.fill_range(list(by_start.values()), bucket, count, now=end)
+
+    # Every table holding per-user rows, with its user column; users goes last
+    USER_TABLES = (('task_history', 'user_id'), ('chat_bodies', 'user_id'), ('chat_logs', 'user_id'),
+                   ('agent_metrics', 'user_id'), ('rollups', 'user_id'), ('xp_progress', 'user_id'),
+                   ('users', 'id'))
+
+    def clear_user_data(self, user_id, progress=None):
+        """
+        Deletes the user and all their rows in one transaction, so a purge
+        either completes or leaves nothing behind. Returns the purge result.
+        """
+        if not self.available or user_id is None:
+            return None
+
+        try:
+            deleted = {}
+            with self._transaction() as cursor:
+                for table, column in self.USER_TABLES:
+                    deleted[table] = self._execute(cursor, f"DELETE FROM {table} WHERE {column} = ?", (user_id,)).rowcount
+                    if progress:
+                        progress(table, deleted[table])
+            return {"user_id": user_id, "deleted": deleted, "complete": True, "failures": {}}
+        except Exception as e:
+            # The transaction rolled back, so nothing was deleted
+            return {"user_id": user_id, "deleted": {}, "complete": False, "failures": {"transaction": str(e)}}
+
+    def sweep_orphans(self, limit=None):
+        """Deletes rows whose user no longer exists. limit is accepted for interface parity."""
+        if not self.available:
+            return {"resumed": 0, "purged": 0, "failed": 0}
+
+        purged = 0
+        with self._transaction() as cursor:
+            for table, column in self.USER_TABLES[:-1]:
+                purged += self._execute(cursor,
+                    f"DELETE FROM {table} WHERE {column} NOT IN (SELECT id FROM users)").rowcount
+        return {"resumed": 0, "purged": purged, "failed": 0}
+
+    def start_orphan_sweeper(self, interval=3600):
+        """Starts the background orphan sweeper once; returns it."""
+        with self._sweeper_lock:
+            if self._sweeper is None and self.available:
+                self._sweeper = OrphanSweeper(self, interval=interval).start()
+            return self._sweeper
+
+    def get_dashboard_snapshot(self, user_id, chat_limit=10, task_limit=50):
+        """
+        Everything the dashboard renders, read in one transaction so the
+        parts are consistent with each other. Returns a DashboardSnapshot.
+        """
+        if not self.available or user_id is None:
+            return build_snapshot(user_id)
+
+        try:
+            with self._read_transaction() as cursor:
+                return build_snapshot(
+                    user_id,
+                    xp_progress=self._read_xp_progress(cursor, user_id),
+                    agent_metrics=self._read_agent_metrics(cursor, user_id),
+                    chat_history=self._read_chat_history(cursor, user_id, chat_limit) if chat_limit else [],
+                    task_history=self._read_task_history(cursor, user_id, task_limit) if task_limit else []
+                )
+        except Exception as e:
+            return build_snapshot(user_id)
+
+    def unit_of_work(self, user_id):
+        """
+        Returns a unit of work that commits the writes of one request in a
+        single SQL transaction.
+        """
+        return SQLUnitOfWork(self, user_id)
+
+    # --- Async variants; the drivers are blocking, so they run in a worker thread ---
+
+    async def get_xp_progress_async(self, user_id):
+        return await asyncio.to_thread(self.get_xp_progress, user_id)
+
+    async def get_agent_metrics_async(self, user_id):
+        return await asyncio.to_thread(self.get_agent_metrics, user_id)
+
+
+class SQLiteDatabase(SQLDatabase):
+    """
+    SQLite backend for single-node deployments. Writes are serialized
+    through one connection; read-only queries run on a pool of reader
+    connections, where WAL mode lets them proceed alongside the writer.
+    """
+    def __init__(self, path=os.path.join(".data", "multi_agent.sqlite3")):
+        super().__init__()
+        self.path = path
+        self._lock = threading.RLock()
+        self._readers = queue.SimpleQueue()  # Idle reader connections
+        self.conn = None
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.conn = self._connect()
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.available = True
+            self.init_tables()
+        except Exception as e:
+            self.available = False
+
+    def _connect(self):
+        # Autocommit mode; transactions are opened explicitly below
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            cursor = self.conn.cursor()
+            # IMMEDIATE takes the write lock up front, so read-modify-write
+            # units of work can't interleave with another process
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                yield cursor
+                cursor.execute("COMMIT")
+            except Exception as e:
+                cursor.execute("ROLLBACK")
+                raise
+            finally:
+                cursor.close()
+
+    @contextmanager
+    def _read_transaction(self):
+        """
+        A deferred transaction on a reader connection: it reads one
+        consistent WAL snapshot and takes no write lock, so reads neither
+        wait for nor block the writer.
+        """
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        cursor = conn.cursor()
+        cursor.execute("BEGIN")
+        try:
+            yield cursor
+        finally:
+            cursor.execute("COMMIT")
+            cursor.close()
+            self._readers.put(conn)
+
+
+class PostgresDatabase(SQLDatabase):
+    """
+    Postgres backend for multi-node deployments, using a thread-safe
+    connection pool. psycopg2 is imported only when this backend is used.
+    """
+    placeholder = "%s"
+    id_column = "BIGSERIAL PRIMARY KEY"
+    blob_type = "BYTEA"
+
+    def __init__(self, dsn, min_connections=1, max_connections=10):
+        super().__init__()
+        self.pool = None
+        try:
+            from psycopg2.pool import ThreadedConnectionPool
+
+            self.pool = ThreadedConnectionPool(min_connections, max_connections, dsn)
+            self.available = True
+            self.init_tables()
+        except Exception as e:
+            self.available = False
+
+    @contextmanager
+    def _transaction(self):
+        conn = self.pool.getconn()
+        try:
+            # The connection context commits on success and rolls back on error
+            with conn:
+                with conn.cursor() as cursor:
+                    yield cursor
+        finally:
+            self.pool.putconn(conn)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.closeall()
+
+
+class SQLUnitOfWork:
+    """
+    Same staging API as database.UnitOfWork, committed as one SQL
+    transaction. Counters use upsert-increments, so concurrent requests
+    can't lose updates, and the task numbers follow from the returned total
+    (the counter row stays locked until the commit), so a task_number passed
+    to add_xp is not needed here.
+    """
+    def __init__(self, database, user_id):
+        self.database = database
+        self.user_id = user_id
+        self._tasks = []    # (xp_earned, task_type)
+        self._level_for_xp = None
+        self._chats = []    # (user_input, agent_response, agent_used, metadata, client_log_id)
+        self._metrics = {}  # agent_name -> [calls, xp_earned]
+        self._rollups = []  # (agent_name, counter deltas)
+        self._stat_increments = {}  # field -> {key: amount}
+
+    def add_xp(self, xp_earned, task_type, level_for_xp=None, task_number=None):
+        self._tasks.append((xp_earned, task_type))
+        if level_for_xp is not None:
+            self._level_for_xp = level_for_xp
+        return self
+
+    def log_chat(self, user_input, agent_response, agent_used, metadata=None, client_log_id=None):
+        self._chats.append((user_input, agent_response, agent_used, metadata, client_log_id))
+        return self
+
+    def update_agent_metrics(self, agent_name, xp_earned):
+        calls_and_xp = self._metrics.setdefault(agent_name, [0, 0])
+        calls_and_xp[0] += 1
+        calls_and_xp[1] += xp_earned
+        return self
+
+    def update_rollups(self, agent_name, xp_earned, tasks=1, latency_ms=None):
+        self._rollups.append((agent_name, rollups.increments(agent_name, xp_earned, tasks, latency_ms)))
+        return self
+
+    def increment_user_stats(self, increments):
+        for field, amounts in increments.items():
+            totals = self._stat_increments.setdefault(field, {})
+            for key, amount in amounts.items():
+                totals[key] = totals.get(key, 0) + amount
+        return self
+
+    def _empty_result(self):
+        return {"ids": {"task_history": [], "chat_logs": []}, "aggregates": {}}
+
+    def _apply(self, cursor):
+        db = self.database
+        result = self._empty_result()
+
+        if self._tasks or self._stat_increments:
+            xp_total = sum(xp for xp, _ in self._tasks)
+            row = db._increment(cursor, self.user_id, xp_total, len(self._tasks))
+            current = db._xp_row_to_dict(row)
+
+            if self._tasks:
+                task_number = current['tasks_completed'] - len(self._tasks)
+                for xp_earned, task_type in self._tasks:
+                    task_number += 1
+                    result["ids"]["task_history"].append(
+                        db._insert_task(cursor, self.user_id, task_type, xp_earned, task_number)
+                    )
+                if self._level_for_xp:
+                    current['level'] = self._level_for_xp(current['total_xp'])
+                result["aggregates"]["xp_progress"] = {
+                    "total_xp": current['total_xp'], "level": current['level'],
+                    "tasks_completed": current['tasks_completed']
+                }
+
+            for field, amounts in self._stat_increments.items():
+                values = dict(current.get(field) or {})
+                for key, amount in amounts.items():
+                    values[key] = values.get(key, 0) + amount
+                current[field] = values
+                result["aggregates"].setdefault("user_stats", {})[field] = values
+
+            extra = {k: v for k, v in current.items() if k not in _XP_COLUMNS and k != 'updated_at'}
+            db._execute(cursor,
+                "UPDATE xp_progress SET level = ?, extra = ? WHERE user_id = ?",
+                (current['level'], json.dumps(extra, default=str) if extra else None, self.user_id))
+
+        for user_input, agent_response, agent_used, metadata, client_log_id in self._chats:
+            result["ids"]["chat_logs"].append(
+                db._insert_chat(cursor, self.user_id, user_input, agent_response, agent_used, metadata, client_log_id)
+            )
+
+        if self._metrics:
+            result["aggregates"]["agent_metrics"] = {}
+        for agent_name, (calls, xp_earned) in self._metrics.items():
+            call_count, total_xp_generated = db._upsert_metrics(cursor, self.user_id, agent_name, calls, xp_earned)
+            result["aggregates"]["agent_metrics"][agent_name] = {
+                "call_count": call_count, "total_xp_generated": total_xp_generated
+            }
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        for bucket in rollups.BUCKETS:
+            start = rollups.bucket_start(now, bucket)
+            for agent_name, deltas in self._rollups:
+                db._upsert_rollup(cursor, self.user_id, bucket, start, agent_name, deltas)
+
+        return result
+
+    def commit(self):
+        if not self.database.available or self.user_id is None:
+            return self._empty_result()
+
+        try:
+            with self.database._transaction() as cursor:
+                return self._apply(cursor)
+        except Exception as e:
+            return self._empty_result()
+
+    async def commit_async(self):
+        return await asyncio.to_thread(self.commit)
@@ -0,0 +1,37 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+BACKENDS = ("firestore", "sqlite", "postgres")
+
+def create_database(config=None):
+    """
+    Builds the storage backend named by config["backend"]:
+      firestore (default): config["credentials"] is the service-account dict
+      sqlite:   optional config["path"] to the database file
+      postgres: config["dsn"], optional min_connections / max_connections
+    Every backend exposes the same methods as database.Database. Only the
+    chosen backend's driver is imported.
+    """
+    config = dict(config or {})
+    backend = config.get("backend", "firestore")
+
+    if backend == "firestore":
+        from database import Database
+        return Database(config.get("credentials"), read_cache_size=config.get("read_cache_size", 512))
+
+    if backend == "sqlite":
+        from sql_database import SQLiteDatabase
+        if config.get("path"):
+            return SQLiteDatabase(config["path"])
+        return SQLiteDatabase()
+
+    if backend == "postgres":
+        from sql_database import PostgresDatabase
+        return PostgresDatabase(
+            config["dsn"],
+            min_connections=config.get("min_connections", 1),
+            max_connections=config.get("max_connections", 10)
+        )
+
+    raise ValueError(f"Unknown database backend '{backend}'. Expected one of: {', '.join(BACKENDS)}")
@@ -4,13 +4,16 @@
 
 import streamlit as st
 import uuid
-import tempfile
-import os
 import traceback
+from functools import partial
 from agents.parent_agent import ParentAgent
-from agents.whisper_agent import WhisperAgent
-from database import Database
-from st_audiorec import st_audiorec
+from agents.shared_resources import SharedResources
+from agents.model_registry import start_warm_up
+from storage import create_database
+from pagination import HistoryPager
+from sessions import SessionState, SessionRegistry
+from rollups import range_start
+import analytics
 
 st.set_page_config(
     page_title="Multi-Agent AI System", 
@@ -20,8 +23,9 @@ st.set_page_config(
 
 # --- Wrapper to catch all startup errors ---
 try:
-    # 1. Check for Firebase Credentials
-    if "firebase_credentials" not in st.secrets:
+    # 1. Check for Firebase Credentials (only the Firestore backend uses them)
+    db_backend = st.secrets.get("database", {}).get("backend", "firestore")
+    if db_backend == "firestore" and "firebase_credentials" not in st.secrets:
         st.error("🔥 CRITICAL STARTUP ERROR: Firebase credentials not found.")
         st.info("Please add [firebase_credentials] section to .streamlit/secrets.toml")
         st.stop()
@@ -39,35 +43,93 @@ try:
         st.stop()
 
 
-    # --- Initialize Session State ---
-    if 'session_id' not in st.session_state:
-        st.session_state.session_id = str(uuid.uuid4())
+    # --- Process-wide Resources ---
+    # Built once per server process and shared by every session
+    @st.cache_resource(show_spinner=False)
+    def get_database():
+        # Storage backend from the optional [database] section (Firestore by default)
+        db_config = dict(st.secrets.get("database", {}))
+        if db_backend == "firestore":
+            # Convert the Streamlit Secrets object to a standard Python dict
+            db_config["credentials"] = dict(st.secrets["firebase_credentials"])
+        db = create_database(db_config)
+        db.init_tables()
+        # Open Gemini/Firestore connections in the background
+        start_warm_up(api_key=st.secrets["google_api_key"], db=db)
+        # Hourly cleanup of data left behind by deleted users
+        db.start_orphan_sweeper(interval=3600)
+        return db
+
+    @st.cache_resource(show_spinner=False)
+    def get_shared_resources():
+        return SharedResources(google_api_key=st.secrets["google_api_key"])
+
+    @st.cache_resource(show_spinner=False)
+    def get_session_registry():
+        # Agents of sessions idle for 30 minutes are dropped and rebuilt on return
+        return SessionRegistry(build_session_agent, max_sessions=500, idle_ttl=1800)
+
+    @st.cache_resource(show_spinner=False)
+    def get_figure_cache():
+        # Serialized Plotly figures, shared by all sessions (keys include the user)
+        return analytics.FigureCache(maxsize=512)
+
+    @st.cache_resource(show_spinner=False)
+    def get_whisper_agent():
+        # Voice input only; keeps the OpenAI SDK out of text-only sessions
+        from agents.whisper_agent import WhisperAgent
+        return WhisperAgent(api_key=st.secrets["openai_api_key"])
+
+    def build_session_agent(session):
+        return ParentAgent(
+            db=get_database(),
+            user_id=session.user_id,
+            resources=get_shared_resources(),
+            context=session.context,
+            xp_baseline=session.stats
+        )
 
     # --- Initialize Database ---
-    if 'db' not in st.session_state:
-        try:
-            # Convert the Streamlit Secrets object to a standard Python dict
-            firebase_creds_dict = dict(st.secrets["firebase_credentials"])
-            st.session_state.db = Database(firebase_creds_dict)
-            st.session_state.db.init_tables()
-        except Exception as e:
-            st.error(f"Failed to initialize database. Is your secrets.toml file correct? Error: {e}")
-            st.stop()
+    try:
+        db = get_database()
+    except Exception as e:
+        st.error(f"Failed to initialize database. Is your secrets.toml file correct? Error: {e}")
+        st.stop()
+
+    # --- Initialize Session State ---
+    # Only a small SessionState lives in the session; agents are process-wide
+    if 'session' not in st.session_state:
+        st.session_state.session = SessionState(str(uuid.uuid4()))
+    session = st.session_state.session
 
     # --- Get or Create User ---
-    if 'user_id' not in st.session_state:
-        st.session_state.user_id = st.session_state.db.get_or_create_user(st.session_state.session_id)
-        if st.session_state.user_id is None:
+    if session.user_id is None:
+        session.user_id = db.get_or_create_user(session.session_id)
+        if session.user_id is None:
             st.error("Failed to get or create a user. Check database connection and IAM permissions (needs 'Cloud Datastore User' role).")
             st.stop()
 
-    # --- Initialize ParentAgent ---
-    if 'parent_agent' not in st.session_state:
-        st.session_state.parent_agent = ParentAgent(
-            db=st.session_state.db, 
-            user_id=st.session_state.user_id,
-            google_api_key=st.secrets["google_api_key"]
-        )
+    # --- ParentAgent for this session ---
+    registry = get_session_registry()
+    parent_agent = registry.get_agent(session)
+
+    # --- Load Dashboard Data ---
+    # One concurrent snapshot per rerun; every tab renders from it.
+    # Chat history is paged separately below, so it's left out here.
+    # Charts over time read the hourly/daily rollups, so only the recent
+    # tasks listed in the XP tab are loaded here.
+    dashboard = parent_agent.get_dashboard(chat_limit=0, task_limit=10)
+    registry.save(session, parent_agent)
+    figure_cache = get_figure_cache()
+
+    # --- Chat History Pager ---
+    # Pages already loaded stay in session state; a rerun only fetches
+    # conversations newer than the newest one cached.
+    pager = st.session_state.get('chat_pager')
+    if pager is None or pager.owner != session.user_id:
+        pager = HistoryPager(partial(db.get_chat_history, session.user_id), page_size=5, owner=session.user_id)
+        st.session_state.chat_pager = pager
+    pager.refresh()
 
     # --- Main App UI ---
     tab1, tab2, tab3, tab4 = st.tabs(["🤖 Agent Console", "📊 Analytics Dashboard", "📈 XP Progress", "🎭 PAEI Personality"])
@@ -80,8 +142,8 @@ try:
         st.sidebar.header("📊 System Status")
         try:
             # This now fetches the latest data on every rerun
-            xp_stats = st.session_state.parent_agent.get_xp_stats()
-            context = st.session_state.parent_agent.get_context()
+            xp_stats = dashboard.xp_stats
+            context = dashboard.context
             
             st.sidebar.metric("Level", xp_stats['level'])
             st.sidebar.metric("Total XP", xp_stats['total_xp'])
@@ -104,17 +166,31 @@ try:
         st.sidebar.subheader("Dev Controls")
         if st.sidebar.button("⚠️ Reset My Data"):
             try:
-                # 1. Clear the user from the database
-                st.session_state.db.clear_user_data(st.session_state.user_id)
-                
-                # 2. Clear stale items from session state
-                if 'user_id' in st.session_state:
-                    del st.session_state.user_id
-                if 'parent_agent' in st.session_state:
-                    del st.session_state.parent_agent
-                
-                st.success("User data cleared! Rerunning to create a new session...")
-                st.rerun()
+                # 1. Let queued writes land, then clear the user from the database
+                parent_agent.flush_writes(timeout=10)
+                purge_status = st.sidebar.empty()
+                purge_result = db.clear_user_data(
+                    session.user_id,
+                    progress=lambda name, deleted: purge_status.caption(f"Deleted {deleted} from {name}...")
+                )
+                if purge_result is None:
+                    st.sidebar.warning("Reset failed: the database is unavailable.")
+                elif not purge_result.get("complete"):
+                    # The session is kept so the reset can be retried; the orphan sweeper also finishes it
+                    failures = "; ".join(f"{name}: {error}" for name, error in purge_result.get("failures", {}).items())
+                    st.sidebar.warning(f"Reset did not finish, some data may remain. {failures}".strip())
+                else:
+                    # 2. Clear stale items from session state
+                    registry.evict(session.session_id)
+                    if 'session' in st.session_state:
+                        del st.session_state.session
+                    if 'chat_pager' in st.session_state:
+                        del st.session_state.chat_pager
+                    if 'opened_chats' in st.session_state:
+                        del st.session_state.opened_chats
+
+                    st.success("User data cleared! Rerunning to create a new session...")
+                    st.rerun()
                 
             except Exception as e:
                 st.sidebar.error(f"Error resetting: {e}")
@@ -154,31 +230,40 @@ try:
                  st.error("OpenAI API key is a placeholder. Please add your real key to .streamlit/secrets.toml to enable voice input.")
                  st.stop()
 
+            from st_audiorec import st_audiorec  # Only loaded once voice input is chosen
             audio_bytes = st_audiorec()
             
             if audio_bytes:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=".wav") as tmp_file:
-                    tmp_file.write(audio_bytes)
-                    tmp_audio_path = tmp_file.name
-                
+                # Preprocessed and uploaded straight from memory. st_audiorec
+                # returns the same recording on every rerun; the agent's
+                # transcription cache makes those reruns free.
                 try:
-                    if 'whisper_agent' not in st.session_state:
-                        st.session_state.whisper_agent = WhisperAgent(api_key=st.secrets["openai_api_key"])
-                    
                     with st.spinner("🎧 Transcribing audio..."):
-                        result = st.session_state.whisper_agent.transcribe_audio(tmp_audio_path)
+                        result = get_whisper_agent().transcribe_audio(audio_bytes)
                     
                     if result["status"] == "success":
                         user_input = result["transcription"]
                         st.success(f"Transcribed: {user_input}")
                     else:
                         st.error(result["message"])
-                    
-                    os.unlink(tmp_audio_path)
+
+                    prepared = result.get("preprocessing")
+                    chunks = result.get("chunks")
+                    if result.get("cached"):
+                        st.caption("Transcript reused for this recording (no Whisper call)")
+                    elif chunks:
+                        st.caption(
+                            f"Long recording: {len(chunks['chunks'])} chunks transcribed in parallel in "
+                            f"{chunks['wall_ms'] / 1000:.1f}s ({chunks['serial_ms'] / 1000:.1f}s one after another)"
+                        )
+                    elif prepared and prepared["preprocessed"]:
+                        st.caption(
+                            f"Upload: {prepared['output_bytes'] / 1024:.0f} KB instead of "
+                            f"{prepared['input_bytes'] / 1024:.0f} KB "
+                            f"({prepared['trimmed_s']:.1f}s of silence trimmed)"
+                        )
                 except Exception as e:
                     st.error(f"Error processing audio: {str(e)}")
-                    if os.path.exists(tmp_audio_path):
-                        os.unlink(tmp_audio_path)
             # --- End Voice Input ---
 
         col1, col2 = st.columns([1, 1])
@@ -193,89 +278,120 @@ try:
             del st.session_state.last_response # Clear it so it doesn't show again
 
         if run_button and user_input:
-            with st.spinner("🤖 Agents working..."):
-                try:
-                    response = st.session_state.parent_agent.handle_request(user_input)
-                    st.session_state.last_response = response # Save response for after the rerun
-                    st.rerun() # Force a rerun to update the sidebar
-                    
-                except Exception as e:
-                    st.error(f"❌ Error: {str(e)}")
+            try:
+                # Render the answer as it streams in; XP footer arrives last
+                response = st.write_stream(parent_agent.stream_request(user_input))
+                st.session_state.last_response = response # Save response for after the rerun
+                st.rerun() # Force a rerun to update the sidebar
+                
+            except Exception as e:
+                st.error(f"❌ Error: {str(e)}")
 
         # --- Chat History ---
-        chat_history = st.session_state.db.get_chat_history(st.session_state.user_id, limit=10)
+        # Includes answers whose log write is still queued
+        chat_history = parent_agent.with_pending_chats(pager.entries)
         
         if chat_history:
             st.divider()
             st.subheader("📜 Recent Conversation History")
+            opened_chats = st.session_state.setdefault('opened_chats', set())
             
-            for i, entry in enumerate(reversed(chat_history[:5]), 1):
+            for i, entry in enumerate(chat_history, 1):
                 if entry.get('timestamp'):
                     time_str = entry['timestamp'].strftime('%H:%M:%S')
                 else:
                     time_str = "just now"
                     
-                with st.expander(f"Task: {entry['input'][:60]}... ({time_str})"):
-                    st.markdown(f"**Your Request:** {entry['input']}")
+                with st.expander(f"Task: {entry['input'][:60]}... ({time_str})",
+                                 expanded=entry.get('id') in opened_chats):
                     st.markdown(f"**Agent Used:** {entry['agent']}")
+                    # History holds summaries; the full body is fetched only when asked for
+                    if entry.get('id') is not None and entry['id'] not in opened_chats:
+                        st.button("Show response", key=f"chat_body_{entry['id']}",
+                                  on_click=opened_chats.add, args=(entry['id'],))
+                        continue
+                    body = parent_agent.get_chat_body(entry)
+                    if body is None:
+                        st.warning("Couldn't load this conversation.")
+                        continue
+                    st.markdown(f"**Your Request:** {body['input']}")
                     st.markdown("**Response:**")
-                    st.markdown(entry['response'])
+                    st.markdown(body['response'])
+
+            if not pager.exhausted:
+                st.button("Load older conversations", on_click=pager.load_more)
+
+    # Figures are reused across reruns until this changes (see analytics.py)
+    version = analytics.data_version(session.user_id, dashboard.xp_stats, dashboard.agent_metrics)
 
     with tab2:
         # --- Analytics Dashboard ---
         st.header("📊 Agent Performance Analytics")
         
-        agent_metrics = st.session_state.db.get_agent_metrics(st.session_state.user_id)
+        agent_metrics = dashboard.agent_metrics
         
         if agent_metrics:
-            import plotly.graph_objects as go
-            import plotly.express as px
+            metrics_frame = analytics.agent_frame(agent_metrics)
             
             col1, col2 = st.columns(2)
             
             with col1:
                 st.subheader("Agent Usage Distribution")
-                agent_names = [m['agent'] for m in agent_metrics]
-                call_counts = [m['calls'] for m in agent_metrics]
-                
-                fig_pie = px.pie(
-                    values=call_counts,
-                    names=agent_names,
-                    title="Agent Calls by Type"
-                )
+                fig_pie = figure_cache.get_or_build(('usage_pie', version), lambda: analytics.usage_pie(metrics_frame))
                 st.plotly_chart(fig_pie, width = 'stretch')
             
             with col2:
                 st.subheader("XP Generation by Agent")
-                xp_generated = [m['xp_generated'] for m in agent_metrics]
-                
-                fig_bar = go.Figure(data=[
-                    go.Bar(x=agent_names, y=xp_generated, marker_color='lightblue')
-                ])
-                fig_bar.update_layout(
-                    title="Total XP Generated per Agent",
-                    xaxis_title="Agent Type",
-                    yaxis_title="XP Generated"
-                )
+                fig_bar = figure_cache.get_or_build(('xp_bar', version), lambda: analytics.xp_bar(metrics_frame))
                 st.plotly_chart(fig_bar, width = 'stretch')
             
             st.divider()
             st.subheader("📋 Detailed Agent Metrics")
             
-            for metric in agent_metrics:
+            for metric in metrics_frame.itertuples():
                 col1, col2, col3, col4 = st.columns(4)
                 with col1:
-                    st.metric("Agent", metric['agent'].upper())
+                    st.metric("Agent", metric.agent.upper())
                 with col2:
-                    st.metric("Total Calls", metric['calls'])
+                    st.metric("Total Calls", int(metric.calls))
                 with col3:
-                    st.metric("XP Generated", metric['xp_generated'])
+                    st.metric("XP Generated", int(metric.xp_generated))
                 with col4:
-                    if metric['calls'] > 0:
-                        avg_xp = round(metric['xp_generated'] / metric['calls'], 1)
-                    else:
-                        avg_xp = 0
-                    st.metric("Avg XP/Call", avg_xp)
+                    st.metric("Avg XP/Call", metric.avg_xp)
+
+            st.divider()
+            st.subheader("🕒 Activity Over Time")
+
+            # label -> (rollup bucket, number of buckets)
+            activity_ranges = {
+                "Last 24 hours": ("hour", 24),
+                "Last 7 days": ("day", 7),
+                "Last 30 days": ("day", 30),
+                "Last 90 days": ("day", 90)
+            }
+            range_label = st.selectbox("Range", list(activity_ranges), index=1, key="activity_range")
+            bucket, count = activity_ranges[range_label]
+
+            def build_activity_figures():
+                # Rollups are only read when the figures have to be rebuilt
+                activity = parent_agent.get_activity(bucket=bucket, count=count)
+                calls = analytics.activity_frame(activity)
+                latency = analytics.latency_frame(activity)
+                return {
+                    "calls": analytics.calls_over_time(calls, f"Agent Calls ({range_label})").to_dict() if len(calls) else None,
+                    "latency": analytics.latency_over_time(latency).to_dict() if len(latency) else None
+                }
+
+            # The range start moves with the clock, so it is part of the key
+            activity_figures = figure_cache.get_or_build(
+                ('activity', version, bucket, count, range_start(bucket, count)), build_activity_figures
+            )
+            if activity_figures["calls"]:
+                st.plotly_chart(activity_figures["calls"], width = 'stretch')
+                if activity_figures["latency"]:
+                    st.plotly_chart(activity_figures["latency"], width = 'stretch')
+            else:
+                st.info("No activity in this range.")
         else:
             st.info("No agent activity yet. Start using the system to see analytics!")
 
@@ -283,8 +399,8 @@ try:
         # --- XP Progress Tab ---
         st.header("📈 XP Progress & Task History")
         
-        xp_stats = st.session_state.parent_agent.get_xp_stats()
-        task_history = st.session_state.db.get_task_history(st.session_state.user_id, limit=50)
+        xp_stats = dashboard.xp_stats
+        task_history = dashboard.task_history
         
         col1, col2, col3 = st.columns(3)
         
@@ -298,31 +414,14 @@ try:
         st.divider()
         
         if task_history:
-            import plotly.express as px
-            import pandas as pd
-            
             st.subheader("XP Accumulation Over Time")
-            
-            cumulative_xp = []
-            current_xp = 0
-            task_numbers = []
-            
-            for task in reversed(task_history):
-                current_xp += task['xp']
-                cumulative_xp.append(current_xp)
-                task_numbers.append(task['task_number'])
-            
-            df = pd.DataFrame({
-                'Task Number': task_numbers,
-                'Cumulative XP': cumulative_xp
-            })
-            
-            fig_line = px.line(
-                df, 
-                x='Task Number', 
-                y='Cumulative XP',
-                title="XP Growth Curve",
-                markers=True
+
+            xp_days = st.selectbox("Days", [7, 30, 90], index=1, key="xp_range_days")
+            fig_line = figure_cache.get_or_build(
+                ('xp_curve', version, xp_days, range_start("day", xp_days)),
+                lambda: analytics.xp_curve(analytics.xp_curve_frame(
+                    parent_agent.get_activity(bucket="day", count=xp_days), xp_stats['total_xp']
+                ))
             )
             st.plotly_chart(fig_line, width = 'stretch')
             
@@ -362,9 +461,10 @@ try:
         st.divider()
         
         try:
-            profile = st.session_state.parent_agent.get_personality_profile()
-            badge = st.session_state.parent_agent.get_personality_badge()
-            recommendations = st.session_state.parent_agent.get_personality_recommendations()
+            summary = dashboard.personality
+            profile = summary["profile"]
+            badge = summary["badge"]
+            recommendations = summary["recommendations"]
             
             col1, col2 = st.columns([2, 3])
             
@@ -378,29 +478,10 @@ try:
             with col2:
                 st.subheader("PAEI Score Breakdown")
                 
-                import plotly.graph_objects as go
-                
-                traits = list(profile['scores'].keys())
-                scores = list(profile['scores'].values())
-                
-                fig_radar = go.Figure()
-                
-                fig_radar.add_trace(go.Scatterpolar(
-                    r=scores,
-                    theta=traits,
-                    fill='toself',
-                    name='Your Profile'
-                ))
-                
-                fig_radar.update_layout(
-                    polar=dict(
-                        radialaxis=dict(
-                            visible=True,
-                            range=[0, 50]
-                        )
-                    ),
-                    showlegend=False,
-                    height=400
+                # Keyed on the scores themselves; they only change with new tasks
+                scores = dict(profile['scores'])
+                fig_radar = figure_cache.get_or_build(
+                    ('paei_radar', tuple(scores.items())), lambda: analytics.paei_radar(scores)
                 )
                 
                 st.plotly_chart(fig_radar, width = 'stretch')
@@ -0,0 +1,87 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import io
+import wave
+
+import numpy as np
+import pytest
+
+from agents.audio_preprocessing import decode_wav, resample, speech_bounds, preprocess_audio, PAD_MS
+from agents.whisper_agent import WhisperAgent
+from transcription_cache import TranscriptionCache
+
+def _wav(frames, rate, width):
+    """frames: int array shaped (n, channels) already in the sample width's range."""
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as writer:
+        writer.setnchannels(frames.shape[1])
+        writer.setsampwidth(width)
+        writer.setframerate(rate)
+        if width == 1:
+            raw = (frames + 128).astype(np.uint8).tobytes()
+        elif width == 3:
+            raw = b"".join(int(v).to_bytes(3, "little", signed=True) for v in frames.reshape(-1))
+        else:
+            raw = frames.astype(f"<i{width}").tobytes()
+        writer.writeframes(raw)
+    return buffer.getvalue()
+
+def _tone(seconds, rate, frequency=440.0, amplitude=0.5):
+    t = np.arange(int(seconds * rate)) / rate
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+def _dominant_frequency(samples, rate):
+    spectrum = np.abs(np.fft.rfft(samples))
+    return np.fft.rfftfreq(len(samples), 1 / rate)[np.argmax(spectrum)]
+
+@pytest.mark.parametrize("width, full_scale", [(1, 128), (2, 32768), (3, 8388608), (4, 2147483648)])
+def test_decode_wav_scales_every_sample_width(width, full_scale):
+    frames = np.array([[0, -full_scale], [full_scale // 2, -(full_scale // 2)]])
+    samples, rate = decode_wav(_wav(frames, 8000, width))
+    assert rate == 8000 and samples.shape == (2, 2)
+    assert samples == pytest.approx(np.array([[0.0, -1.0], [0.5, -0.5]]), abs=1e-2)
+
+def test_resampling_keeps_duration_and_pitch():
+    samples = _tone(1.0, 44100, frequency=440.0)
+    resampled = resample(samples, 44100)
+    assert len(resampled) == 16000
+    assert _dominant_frequency(resampled, 16000) == pytest.approx(440.0, abs=2.0)
+
+def test_downsampling_filters_what_would_alias():
+    # 12 kHz is above the 8 kHz Nyquist limit of 16 kHz audio
+    resampled = resample(_tone(1.0, 48000, frequency=12000.0), 48000)
+    assert np.sqrt(np.mean(resampled ** 2)) < 0.05
+
+def test_vad_trims_silence_around_speech():
+    rate = 16000
+    silence = np.zeros(rate, dtype=np.float32)
+    samples = np.concatenate([silence, _tone(0.5, rate), silence])
+    start, end = speech_bounds(samples, rate)
+    pad = rate * PAD_MS // 1000
+    assert abs(start - (rate - pad)) <= rate // 100
+    assert abs(end - (rate + rate // 2 + pad)) <= rate // 100
+    assert speech_bounds(silence, rate) == (0, 0)
+
+def test_preprocess_resamples_downmixes_and_trims():
+    rate = 44100
+    tone = np.concatenate([np.zeros(rate, dtype=np.float32), _tone(1.0, rate)])
+    frames = (np.stack([tone, tone], axis=1) * 32767).astype(np.int32)
+    prepared = preprocess_audio(_wav(frames, rate, 2))
+    assert prepared["preprocessed"] and prepared["speech"] and prepared["filename"] == "audio.wav"
+    assert prepared["duration_s"] == pytest.approx(2.0, abs=0.01)
+    assert prepared["trimmed_s"] == pytest.approx(1.0 - PAD_MS / 1000, abs=0.05)
+    assert prepared["output_bytes"] < prepared["input_bytes"] / 5
+
+def test_compressed_files_keep_their_own_filename(tmp_path):
+    path = tmp_path / "memo.mp3"
+    path.write_bytes(b"ID3 not a wav file")
+    uploads = []
+    agent = WhisperAgent(transcriber=lambda filename, data: uploads.append(filename) or "hello",
+                         transcription_cache=TranscriptionCache())
+
+    result = agent.transcribe_audio(str(path))
+
+    assert result["status"] == "success" and result["preprocessing"]["preprocessed"] is False
+    assert uploads == ["memo.mp3"]
@@ -0,0 +1,54 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+from cache import TieredCache
+from response_cache import ResponseCache
+from transcription_cache import TranscriptionCache
+
+def test_entries_survive_a_restart(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TieredCache(path, "entries").set("k", {"text": "hello"}, ttl=60)
+
+    entry, tier = TieredCache(path, "entries").get("k")
+    assert entry == {"text": "hello"} and tier == "disk"
+
+def test_expired_disk_entries_are_misses(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TieredCache(path, "entries").set("k", {"text": "old"}, ttl=-1)
+    assert TieredCache(path, "entries").get("k") == (None, None)
+
+def test_disk_tier_is_trimmed_to_its_limit(tmp_path):
+    cache = TieredCache(str(tmp_path / "cache.sqlite3"), "entries", max_disk_entries=10)
+    for index in range(TieredCache.TRIM_EVERY):
+        cache.set(f"k{index}", {"index": index}, ttl=60)
+    assert cache.get_stats()["disk_entries"] == 10
+
+def test_memory_only_without_a_path():
+    cache = TieredCache(None, "entries", ttl=60)
+    cache.set("k", {"text": "hi"})
+    assert cache.get("k") == ({"text": "hi"}, "memory")
+    assert cache.get_stats()["disk_entries"] == 0
+
+def test_response_and_transcription_caches_share_the_tiers(tmp_path):
+    responses = ResponseCache(path=str(tmp_path / "responses.sqlite3"))
+    key = ResponseCache.make_key("research", "gemini", "prompt")
+    responses.set(key, "research", "answer", latency_ms=120, tokens=30)
+    restarted = ResponseCache(path=str(tmp_path / "responses.sqlite3"))
+    entry, tier = restarted.get(key)
+    assert (entry["text"], tier) == ("answer", "disk")
+    stats = restarted.get_stats()
+    assert (stats["disk_hits"], stats["saved_latency_ms"], stats["saved_tokens"]) == (1, 120, 30)
+
+    transcripts = TranscriptionCache(path=str(tmp_path / "transcripts.sqlite3"))
+    key = TranscriptionCache.make_key(b"audio")
+    transcripts.set(key, "hello there", audio_seconds=4.0, latency_ms=800)
+    entry, tier = TranscriptionCache(path=str(tmp_path / "transcripts.sqlite3")).get(key)
+    assert (entry["text"], tier) == ("hello there", "disk")
+    transcripts.get(key)
+    assert transcripts.get_stats()["saved_calls"] == 1
+
+def test_zero_ttl_agents_are_not_cached(tmp_path):
+    responses = ResponseCache(path=str(tmp_path / "responses.sqlite3"), ttls={"calendar": 0})
+    responses.set("k", "calendar", "busy at 3")
+    assert responses.get("k") == (None, None)
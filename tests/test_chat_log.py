@@ -0,0 +1,39 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import pytest
+
+import chat_log
+from benchmarks.fakes import InMemoryDatabase
+from sql_database import SQLiteDatabase
+
+@pytest.fixture(params=["sqlite", "memory"])
+def db(request, tmp_path):
+    if request.param == "sqlite":
+        database = SQLiteDatabase(str(tmp_path / "chats.sqlite3"))
+        database.init_tables()
+        return database
+    return InMemoryDatabase()
+
+def test_client_log_id_is_stored_through_the_unit_of_work(db):
+    client_log_id = chat_log.new_log_id()
+    db.unit_of_work("user-1").log_chat("hello", "hi there", "general", client_log_id=client_log_id).commit()
+
+    [entry] = db.get_chat_history("user-1", limit=5)
+    assert entry["client_log_id"] == client_log_id
+    assert chat_log.entry_key(entry) == client_log_id
+
+def test_identical_chats_keep_distinct_keys(db):
+    # Same input and same response length: only the generated ID tells them apart
+    stored_id, queued_id = chat_log.new_log_id(), chat_log.new_log_id()
+    db.log_chat("user-1", "status?", "ok", "general", client_log_id=stored_id)
+    queued = {"input": "status?", "response": "ok", "agent": "general", "client_log_id": queued_id}
+
+    history = db.get_chat_history("user-1", limit=5)
+    pending_keys = {chat_log.entry_key(queued)}
+    assert [entry for entry in history if chat_log.entry_key(entry) not in pending_keys] == history
+
+def test_chats_without_an_id_are_never_matched():
+    stored = chat_log.summary_entry("log-1", {"input_preview": "hi", "response_length": 2})
+    assert chat_log.entry_key(stored) is None
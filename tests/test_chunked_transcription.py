@@ -0,0 +1,44 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+from agents.chunked_transcription import stitch, overlap_words
+
+# Natural speech with phrases that repeat within a few seconds of each other
+DICTATION = (
+    "we need to look at the budget for next quarter and then I think we should look at the "
+    "hiring plan before we look at the budget again on Friday. Let's look at the budget first, "
+    "then the hiring plan, and after the hiring plan we can look at the budget for next quarter."
+).split()
+
+def _chunks(words, size, shared):
+    """Splits words into chunks of `size` whose neighbours share `shared` words."""
+    chunks = []
+    start = 0
+    while start < len(words):
+        chunks.append(" ".join(words[max(0, start - shared):start + size]))
+        start += size
+    return chunks
+
+def test_repeated_phrase_outside_overlap_is_not_matched():
+    first = "we need to look at the budget for next quarter and then I think we should look at the hiring plan"
+    second = "hiring plan before we look at the budget again on Friday"
+    assert stitch([first, second]) == (
+        "we need to look at the budget for next quarter and then I think we should look at the "
+        "hiring plan before we look at the budget again on Friday"
+    )
+
+def test_overlapping_chunks_of_natural_text_round_trip():
+    max_overlap = overlap_words(1.0)
+    for size in (5, 7, 11):
+        for shared in (2, 3, 4):
+            assert stitch(_chunks(DICTATION, size, shared), max_overlap=max_overlap).split() == DICTATION
+
+def test_clipped_edge_word_is_dropped_once():
+    # The last word of the first chunk was cut off mid-word
+    assert stitch(["look at the hiring pl", "the hiring plan before Friday"]) == "look at the hiring plan before Friday"
+
+def test_chunks_that_do_not_line_up_are_joined_unchanged():
+    assert stitch(["look at the budget", "again on Friday"]) == "look at the budget again on Friday"
+    # A single shared word is not enough evidence of an overlap
+    assert stitch(["look at the budget", "budget again on Friday"]) == "look at the budget budget again on Friday"
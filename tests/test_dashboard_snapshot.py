@@ -0,0 +1,200 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import copy
+import time
+import asyncio
+import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import database
+from snapshot import build_snapshot
+
+READ_LATENCY = 0.05
+SESSIONS = 8
+
+class FakeSnapshot:
+    def __init__(self, path, data):
+        self.id = path.rsplit('/', 1)[-1]
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return copy.deepcopy(self._data)
+
+class FakeQuery:
+    """Collection query supporting the filters, ordering and cursors Database uses."""
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self.filters = []
+        self.descending = False
+        self.after = None
+        self.before = None
+        self.count = None
+
+    def _with(self, **changes):
+        query = copy.copy(self)
+        query.filters = list(self.filters)
+        for name, value in changes.items():
+            setattr(query, name, value)
+        return query
+
+    def where(self, filter):
+        return self._with(filters=self.filters + [filter])
+
+    def select(self, fields):
+        return self
+
+    def order_by(self, field, direction=None):
+        return self._with(descending=direction == "DESCENDING")
+
+    def start_after(self, values):
+        return self._with(after=values['created_at'])
+
+    def end_before(self, values):
+        return self._with(before=values['created_at'])
+
+    def limit(self, count):
+        return self._with(count=count)
+
+    def _matches(self):
+        prefix = self.path + "/"
+        rows = [(path, data) for path, data in self.client.store.docs.items()
+                if path.startswith(prefix) and "/" not in path[len(prefix):]]
+        for condition in self.filters:
+            rows = [(path, data) for path, data in rows if data.get(condition.field_path) == condition.value]
+        if self.descending:
+            rows.sort(key=lambda row: row[1]['created_at'], reverse=True)
+        if self.after is not None:
+            rows = [(path, data) for path, data in rows if data['created_at'] < self.after]
+        if self.before is not None:
+            rows = [(path, data) for path, data in rows if data['created_at'] > self.before]
+        return [FakeSnapshot(path, data) for path, data in rows[:self.count]]
+
+    def stream(self):
+        time.sleep(READ_LATENCY)
+        return iter(self._matches())
+
+class FakeAsyncQuery(FakeQuery):
+    async def _stream(self):
+        await asyncio.sleep(READ_LATENCY)
+        for snapshot in self._matches():
+            yield snapshot
+
+    def stream(self):
+        return self._stream()
+
+class FakeRef:
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+
+    def collection(self, name):
+        return self.client.query_class(self.client, f"{self.path}/{name}")
+
+    def get(self):
+        time.sleep(READ_LATENCY)
+        return FakeSnapshot(self.path, self.client.store.docs.get(self.path))
+
+    def set(self, data):
+        self.client.store.docs[self.path] = dict(data)
+
+class FakeAsyncRef(FakeRef):
+    async def get(self):
+        await asyncio.sleep(READ_LATENCY)
+        return FakeSnapshot(self.path, self.client.store.docs.get(self.path))
+
+    async def set(self, data):
+        self.client.store.docs[self.path] = dict(data)
+
+class FakeStore:
+    def __init__(self):
+        self.docs = {}
+
+class FakeClient:
+    """Sync or async Firestore client over a shared FakeStore; every read sleeps READ_LATENCY."""
+    def __init__(self, store, asynchronous=False):
+        self.store = store
+        self.query_class = FakeAsyncQuery if asynchronous else FakeQuery
+        self.ref_class = FakeAsyncRef if asynchronous else FakeRef
+
+    def collection(self, name):
+        client = self
+
+        class Collection(self.query_class):
+            def document(self, document_id):
+                return client.ref_class(client, f"{self.path}/{document_id}")
+        return Collection(self, name)
+
+def _seed(store, user_id):
+    start = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    store.docs[f"xp_progress/{user_id}"] = {"total_xp": 240, "level": 3, "tasks_completed": 6}
+    for number, agent in enumerate(["email", "research", "email", "general", "email", "research"], start=1):
+        created_at = start + datetime.timedelta(minutes=number)
+        store.docs[f"users/{user_id}/task_history/task-{number}"] = {
+            "task_type": agent, "xp_earned": 40, "task_number": number, "created_at": created_at
+        }
+        store.docs[f"users/{user_id}/chat_logs/log-{number}"] = {
+            "input_preview": f"request {number}", "agent_used": agent, "response_length": 100 + number,
+            "created_at": created_at, "client_log_id": f"log-{number}"
+        }
+    for agent, calls in {"email": 3, "research": 2, "general": 1}.items():
+        store.docs[f"agent_metrics/{user_id}_{agent}"] = {
+            "user_id": user_id, "agent_name": agent, "call_count": calls,
+            "total_xp_generated": 40 * calls, "last_used": start
+        }
+
+@pytest.fixture
+def db(monkeypatch):
+    store = FakeStore()
+    monkeypatch.setattr(database.firebase_admin, "_apps", {"[DEFAULT]": object()})
+    monkeypatch.setattr(database.firestore, "client", lambda: FakeClient(store))
+    monkeypatch.setattr(database.firestore_async, "client", lambda: FakeClient(store, asynchronous=True))
+    instance = database.Database({})
+    assert instance.available
+    instance.store = store
+    return instance
+
+def test_snapshot_matches_the_individual_getters(db):
+    _seed(db.store, "user-1")
+
+    snapshot = db.get_dashboard_snapshot("user-1", chat_limit=4, task_limit=5)
+    db.invalidate_user_cache("user-1")
+
+    assert snapshot == build_snapshot(
+        "user-1",
+        xp_progress=db.get_xp_progress("user-1"),
+        agent_metrics=db.get_agent_metrics("user-1"),
+        chat_history=db.get_chat_history("user-1", limit=4),
+        task_history=db.get_task_history("user-1", limit=5)
+    )
+    assert [task["task_number"] for task in snapshot.task_history] == [6, 5, 4, 3, 2]
+    assert [metric["agent"] for metric in snapshot.agent_metrics] == ["email", "research", "general"]
+
+def test_snapshot_serves_cached_parts_without_reading(db):
+    _seed(db.store, "user-1")
+    db.get_dashboard_snapshot("user-1")
+    db.store.docs["xp_progress/user-1"]["total_xp"] = 999
+
+    assert db.get_dashboard_snapshot("user-1").xp_progress["total_xp"] == 240
+
+def test_concurrent_sessions_do_not_queue_behind_each_other(db):
+    user_ids = [f"user-{index}" for index in range(SESSIONS)]
+    for user_id in user_ids:
+        _seed(db.store, user_id)
+    # Starts the shared loop and the async client outside the timing
+    db.get_dashboard_snapshot("warm-up")
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=SESSIONS) as pool:
+        snapshots = list(pool.map(db.get_dashboard_snapshot, user_ids))
+    elapsed = time.perf_counter() - start
+
+    assert [snapshot.xp_progress["total_xp"] for snapshot in snapshots] == [240] * SESSIONS
+    # Every read of every session overlaps: about one read latency in total,
+    # where a fixed 3-thread pool needed SESSIONS of them
+    assert elapsed < READ_LATENCY * 3
@@ -0,0 +1,34 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import asyncio
+import threading
+
+import pytest
+
+from agents import event_loop
+from agents.parent_agent import ParentAgent
+
+def test_handle_request_runs_the_async_pipeline_on_the_shared_loop(tmp_path):
+    agent = ParentAgent(intent_model_path=str(tmp_path / "no_intent_model.json"), write_behind=False)
+    calls = []
+
+    async def handle_request_async(user_input):
+        calls.append((user_input, asyncio.get_running_loop(), threading.current_thread()))
+        return f"answer to {user_input}"
+    agent.handle_request_async = handle_request_async
+
+    assert agent.handle_request("first") == "answer to first"
+    assert agent.handle_request("second") == "answer to second"
+
+    loop = event_loop.get_loop()
+    assert [(user_input, running) for user_input, running, _ in calls] == [("first", loop), ("second", loop)]
+    assert all(thread.name == "agents-event-loop" for _, _, thread in calls)
+
+def test_run_sync_refuses_to_block_the_loop_thread():
+    async def nested():
+        event_loop.run_sync(asyncio.sleep(0))
+
+    with pytest.raises(RuntimeError):
+        event_loop.run_sync(nested())
@@ -0,0 +1,62 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+from agents.intent_classifier import IntentClassifier, confident_examples, _database_config
+from sql_database import SQLiteDatabase
+
+def _example(agent, source, confidence):
+    return {"input": f"{agent} request", "agent": agent, "route": {"source": source, "confidence": confidence}}
+
+def test_only_confident_llm_labels_are_kept():
+    examples = [
+        _example("email", "llm", 0.95),
+        _example("research", "llm", 0.6),
+        _example("general", "fallback", 0.0),
+        _example("slack", "classifier", 0.99),
+        _example("notion", "llm", None),
+        {"input": "old log", "agent": "report", "route": None}
+    ]
+    assert [e["agent"] for e in confident_examples(examples, min_confidence=0.8)] == ["email"]
+
+def test_labeled_requests_carry_the_route(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "labels.sqlite3"))
+    db.init_tables()
+    db.log_chat("user-1", "email the team", "Sent", "email", metadata={"route": {"source": "llm", "confidence": 0.9}})
+    db.log_chat("user-1", "hello", "Hi", "general")
+
+    labeled = db.get_labeled_requests()
+    assert {e["input"]: e["route"] for e in labeled} == {
+        "email the team": {"source": "llm", "confidence": 0.9},
+        "hello": None
+    }
+    assert [e["input"] for e in confident_examples(labeled)] == ["email the team"]
+
+def test_classifier_routes_report_their_confidence():
+    texts = ["send an email to bob", "email the team", "research quantum computing", "research new frameworks"]
+    classifier = IntentClassifier(confidence_threshold=0.0).fit(texts, ["email", "email", "research", "research"])
+    intent = classifier.route("email the design team")
+    assert intent["source"] == "classifier" and 0.0 < intent["confidence"] <= 1.0
+
+def test_credentials_are_read_from_streamlit_secrets(tmp_path):
+    secrets = tmp_path / "secrets.toml"
+    secrets.write_text('[firebase_credentials]\nproject_id = "demo"\n')
+    assert _database_config(None, str(secrets)) == {"credentials": {"project_id": "demo"}}
+
+def test_sql_backends_need_no_firebase_credentials(tmp_path):
+    secrets = tmp_path / "secrets.toml"
+    secrets.write_text('[database]\nbackend = "sqlite"\npath = "chats.sqlite3"\n')
+    assert _database_config(None, str(secrets)) == {"backend": "sqlite", "path": "chats.sqlite3"}
+
+def test_missing_model_loads_untrained_quietly(tmp_path, caplog):
+    classifier = IntentClassifier.load(str(tmp_path / "missing.json"))
+    assert not classifier.trained and caplog.records == []
+
+def test_unreadable_model_is_logged(tmp_path, caplog):
+    path = tmp_path / "intent_classifier.json"
+    path.write_text('{"bias": {}}')
+
+    classifier = IntentClassifier.load(str(path))
+
+    assert not classifier.trained
+    assert "Could not load the intent model" in caplog.text and "n_features" in caplog.text
@@ -0,0 +1,58 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import numpy as np
+import pytest
+
+from agents.level_curve import LevelCurve
+from agents.xp_agent import XPAgent
+from benchmarks.bench_level_curve import legacy_level_progress
+
+LEVELS = range(2, 60)
+
+def _around_thresholds(curve):
+    values = []
+    for level in LEVELS:
+        threshold = curve.total_xp_for_level(level)
+        values.extend([threshold - 1, threshold, threshold + 1])
+    return values
+
+def test_thresholds_match_the_original_loop():
+    curve = LevelCurve(initial_levels=4)
+    for level in LEVELS:
+        threshold = curve.total_xp_for_level(level)
+        assert legacy_level_progress(threshold - 1)[0] == level - 1
+        assert legacy_level_progress(threshold)[0] == level
+
+def test_binary_search_matches_the_original_loop_at_every_boundary():
+    curve = LevelCurve(initial_levels=4)
+    for total_xp in _around_thresholds(curve):
+        assert curve.level_progress(total_xp) == legacy_level_progress(total_xp)
+
+def test_bulk_lookup_matches_binary_search_at_every_boundary():
+    curve = LevelCurve(initial_levels=4)
+    values = _around_thresholds(curve)
+
+    levels, xp_into_level, xp_for_next, progress_percent = curve.bulk_level_progress(values)
+
+    expected = [curve.level_progress(total_xp) for total_xp in values]
+    assert levels.tolist() == [level for level, _, _ in expected]
+    assert xp_into_level.tolist() == [into for _, into, _ in expected]
+    assert xp_for_next.tolist() == [step for _, _, step in expected]
+    assert progress_percent.tolist() == [into * 100 // step for _, into, step in expected]
+
+@pytest.mark.parametrize("level", LEVELS)
+def test_xp_for_level_is_the_step_into_that_level(level):
+    agent = XPAgent()
+    threshold = agent.get_total_xp_for_level(level)
+
+    assert agent.get_xp_for_level(level) == threshold - agent.get_total_xp_for_level(level - 1)
+    assert agent.get_current_level_progress(threshold - 1)[2] == agent.get_xp_for_level(level)
+    assert agent.get_current_level_progress(threshold) == (level, 0, agent.get_xp_for_level(level + 1))
+    assert agent.get_current_level_progress(threshold + 1)[:2] == (level, 1)
+
+def test_negative_totals_are_level_one():
+    curve = LevelCurve()
+    assert curve.level_progress(-5) == (1, 0, 100)
+    assert curve.bulk_level_progress(np.array([-5]))[0].tolist() == [1]
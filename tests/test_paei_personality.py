@@ -0,0 +1,48 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import pytest
+
+from agents.paei_personality import PAEIPersonality
+from sql_database import SQLiteDatabase
+
+class NoReads:
+    def __getattr__(self, name):
+        raise AssertionError(f"score_increments read the database ({name})")
+
+def _fail_read(*args):
+    raise AssertionError("agent metrics were read")
+
+def test_score_increments_never_read_the_database():
+    personality = PAEIPersonality(db=NoReads(), user_id="user-1")
+    fields = personality.score_increments("email", now=0, seed_metrics=[{"agent": "research", "calls": 2}])
+    assert fields["paei_scores"] == {"P": 2, "A": 1, "E": 0, "I": 0}
+    assert personality.score_increments("slack", now=0) == {"paei_scores": {"I": 1}}
+
+def test_forward_decay_matches_decaying_the_stored_scores():
+    personality = PAEIPersonality(half_life_days=1)
+    start = PAEIPersonality.DECAY_EPOCH
+    old = personality.score_increments("email", now=start)["paei_scores"]["A"]
+    new = personality.score_increments("slack", now=start + 86400)["paei_scores"]["I"]
+    # One half-life later a request counts twice as much as the older one
+    assert new == pytest.approx(2 * old)
+
+def test_scores_are_seeded_from_metrics_loaded_before_the_commit(tmp_path):
+    db = SQLiteDatabase(str(tmp_path / "paei.sqlite3"))
+    db.init_tables()
+    user_id = db.get_or_create_user("session-1")
+    for agent_name in ("research", "research", "report", "slack"):
+        db.update_agent_metrics(user_id, agent_name, 10)
+
+    personality = PAEIPersonality(db=db, user_id=user_id)
+    unit_of_work = personality.stage_update(db.unit_of_work(user_id), "email")
+    result = unit_of_work.commit()
+
+    assert result["aggregates"]["user_stats"]["paei_scores"] == {"P": 3, "A": 1, "E": 0, "I": 1}
+
+    # Once stored scores have been seen, updates stop loading the metrics
+    personality.stage_update(db.unit_of_work(user_id), "email").commit()
+    db.get_agent_metrics = _fail_read
+    result = personality.stage_update(db.unit_of_work(user_id), "email").commit()
+    assert result["aggregates"]["user_stats"]["paei_scores"]["A"] == 3
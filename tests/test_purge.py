@@ -0,0 +1,209 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+from types import SimpleNamespace
+
+from purge import FirestorePurger, PURGES_COLLECTION
+
+class FakeDoc:
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+        self.reference = self
+
+    @property
+    def exists(self):
+        return self.path in self.client.docs
+
+    def to_dict(self):
+        return dict(self.client.docs.get(self.path) or {})
+
+    def collection(self, name):
+        return FakeQuery(self.client, f"{self.path}/{name}")
+
+    def collections(self):
+        prefix = self.path + '/'
+        names = sorted({path[len(prefix):].split('/')[0] for path in self.client.docs if path.startswith(prefix)})
+        return [self.collection(name) for name in names]
+
+    def set(self, fields, merge=False):
+        self.client.docs[self.path] = dict(fields)
+
+    def delete(self):
+        self.client.docs.pop(self.path, None)
+
+class FakeQuery:
+    def __init__(self, client, path, filters=(), after=None, limit_to=None):
+        self.client = client
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+        self.filters = filters
+        self.after = after
+        self.limit_to = limit_to
+
+    def _copy(self, **changes):
+        options = {"filters": self.filters, "after": self.after, "limit_to": self.limit_to}
+        options.update(changes)
+        return FakeQuery(self.client, self.path, **options)
+
+    def document(self, document_id):
+        return FakeDoc(self.client, f"{self.path}/{document_id}")
+
+    def where(self, filter):
+        return self._copy(filters=self.filters + ((filter.field_path, filter.value),))
+
+    def select(self, fields):
+        return self
+
+    def order_by(self, field):
+        return self
+
+    def limit(self, count):
+        return self._copy(limit_to=count)
+
+    def start_after(self, cursor):
+        return self._copy(after=cursor['__name__'])
+
+    def stream(self):
+        self.client.streamed.append(self.path)
+        if self.path in self.client.failing:
+            raise RuntimeError(f"{self.id} unavailable")
+        prefix = self.path + '/'
+        docs = [
+            FakeDoc(self.client, path) for path in sorted(self.client.docs)
+            if path.startswith(prefix) and '/' not in path[len(prefix):]
+        ]
+        docs = [doc for doc in docs if all(doc.to_dict().get(field) == value for field, value in self.filters)]
+        docs = [doc for doc in docs if self.after is None or doc.id > self.after]
+        return iter(docs[:self.limit_to])
+
+    def list_documents(self, page_size=None):
+        prefix = self.path + '/'
+        ids = sorted({path[len(prefix):].split('/')[0] for path in self.client.docs if path.startswith(prefix)})
+        return iter(self.document(document_id) for document_id in ids)
+
+class FakeBulkWriter:
+    """Retries a failing delete for as long as the error callback asks to."""
+    def __init__(self, client):
+        self.client = client
+        self.on_error = lambda error, writer: error.attempts < 15
+
+    def on_write_error(self, callback):
+        self.on_error = callback
+
+    def delete(self, ref):
+        attempts = 0
+        while self.client.delete_failures.get(ref.path, 0) > 0:
+            self.client.delete_failures[ref.path] -= 1
+            attempts += 1
+            failure = SimpleNamespace(operation=SimpleNamespace(reference=ref), attempts=attempts,
+                                      code=14, message="unavailable")
+            if not self.on_error(failure, self):
+                return
+        ref.delete()
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class FakeFirestore:
+    def __init__(self):
+        self.docs = {}
+        self.failing = set()
+        self.streamed = []
+        self.delete_failures = {}  # path -> number of attempts that fail
+
+    def collection(self, name):
+        return FakeQuery(self, name)
+
+    def bulk_writer(self):
+        return FakeBulkWriter(self)
+
+    def get_all(self, refs, field_paths=None):
+        return list(refs)
+
+def _seed_user(client, user_id, chats=3):
+    client.docs[f"users/{user_id}"] = {}
+    client.docs[f"xp_progress/{user_id}"] = {"total_xp": 10}
+    client.docs[f"agent_metrics/{user_id}_task"] = {"user_id": user_id}
+    for index in range(chats):
+        client.docs[f"users/{user_id}/chat_logs/c{index}"] = {}
+        client.docs[f"users/{user_id}/task_history/t{index}"] = {}
+
+def test_purge_deletes_everything_for_the_user():
+    client = FakeFirestore()
+    _seed_user(client, "u1")
+    _seed_user(client, "u2")
+
+    result = FirestorePurger(client, page_size=2).purge_user("u1")
+
+    assert result["complete"] and result["failures"] == {}
+    assert result["deleted"] == {"chat_logs": 3, "task_history": 3, "agent_metrics": 1}
+    assert not [path for path in client.docs if "u1" in path]
+    assert "users/u2" in client.docs
+
+def test_failed_collection_is_reported_and_purge_kept_pending():
+    client = FakeFirestore()
+    _seed_user(client, "u1")
+    client.failing.add("users/u1/chat_logs")
+
+    result = FirestorePurger(client).purge_user("u1")
+
+    assert result["complete"] is False
+    assert result["failures"] == {"chat_logs": "chat_logs unavailable"}
+    assert result["deleted"]["task_history"] == 3
+    # Marker and top-level docs stay so the sweeper retries
+    assert f"{PURGES_COLLECTION}/u1" in client.docs
+    assert "users/u1" in client.docs
+
+def test_delete_that_keeps_failing_stops_the_drain():
+    client = FakeFirestore()
+    _seed_user(client, "u1")
+    client.delete_failures["users/u1/chat_logs/c1"] = 1000
+
+    result = FirestorePurger(client).purge_user("u1")
+
+    assert result["complete"] is False
+    assert list(result["failures"]) == ["chat_logs"]
+    assert "users/u1/chat_logs/c1: unavailable" in result["failures"]["chat_logs"]
+    # Only the stuck document's attempts were spent, not an endless loop
+    assert client.delete_failures["users/u1/chat_logs/c1"] == 1000 - FirestorePurger.MAX_DELETE_ATTEMPTS
+    assert result["deleted"]["task_history"] == 3
+
+def test_transient_delete_failures_are_retried():
+    client = FakeFirestore()
+    _seed_user(client, "u1")
+    client.delete_failures["users/u1/chat_logs/c1"] = 2
+
+    result = FirestorePurger(client).purge_user("u1")
+
+    assert result["complete"] and result["failures"] == {}
+    assert not [path for path in client.docs if "u1" in path]
+
+def test_find_orphans_pages_with_a_cursor_across_calls():
+    client = FakeFirestore()
+    for index in range(6):
+        user_id = f"u{index}"
+        _seed_user(client, user_id, chats=0)
+        if index % 2:
+            del client.docs[f"users/{user_id}"]
+
+    purger = FirestorePurger(client, page_size=2)
+    first = purger.find_orphans(limit=100, scan_limit=4)
+    # Two pages of agent_metrics only, not whole collections
+    assert first == ["u1", "u3"]
+    assert client.streamed == ["agent_metrics", "agent_metrics"]
+
+    second = purger.find_orphans(limit=100, scan_limit=4)
+    # Finishes agent_metrics, then one page of xp_progress
+    assert second == ["u5", "u1"]
+
+    # Every source is scanned before the cursor wraps around
+    found = set(first + second)
+    for _ in range(5):
+        found.update(purger.find_orphans(limit=100, scan_limit=4))
+    assert found == {"u1", "u3", "u5"}
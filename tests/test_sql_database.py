@@ -0,0 +1,124 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import threading
+
+import pytest
+
+from sql_database import SQLDatabase, SQLiteDatabase
+
+@pytest.fixture
+def db(tmp_path):
+    database = SQLiteDatabase(str(tmp_path / "app.sqlite3"))
+    assert database.available
+    return database
+
+def _level_for_xp(total_xp):
+    return total_xp // 100 + 1
+
+def test_backend_hooks_are_abstract():
+    with pytest.raises(TypeError):
+        SQLDatabase()
+
+def test_schema_is_created_with_its_indexes(db):
+    with db._read_transaction() as cursor:
+        names = {name for (name,) in cursor.execute("SELECT name FROM sqlite_master")}
+    assert {"users", "xp_progress", "task_history", "chat_logs", "chat_bodies", "agent_metrics", "rollups"} <= names
+    assert {"idx_task_history_user", "idx_chat_logs_user", "idx_agent_metrics_calls"} <= names
+    # Creating the tables again is a no-op
+    db.init_tables()
+
+def test_history_pages_with_created_at_cursors(db):
+    user_id = db.get_or_create_user("session-1")
+    for number in range(1, 6):
+        db.add_task_to_history(user_id, "simple", 10, number)
+
+    first = db.get_task_history(user_id, limit=2)
+    assert [task["task_number"] for task in first] == [5, 4]
+    older = db.get_task_history(user_id, limit=2, start_after=first[-1]["created_at"])
+    assert [task["task_number"] for task in older] == [3, 2]
+    newer = db.get_task_history(user_id, limit=10, end_before=older[0]["created_at"])
+    assert [task["task_number"] for task in newer] == [5, 4]
+
+def test_unit_of_work_commits_every_write_together(db):
+    user_id = db.get_or_create_user("session-1")
+
+    result = (
+        db.unit_of_work(user_id)
+        .add_xp(120, "research", level_for_xp=_level_for_xp)
+        .log_chat("find papers", "Here they are", "research", client_log_id="log-1")
+        .update_agent_metrics("research", 120)
+        .update_rollups("research", 120, latency_ms=80)
+        .increment_user_stats({"paei_scores": {"P": 1}})
+        .commit()
+    )
+
+    assert result["aggregates"]["xp_progress"] == {"total_xp": 120, "level": 2, "tasks_completed": 1}
+    assert result["aggregates"]["agent_metrics"] == {"research": {"call_count": 1, "total_xp_generated": 120}}
+    assert result["aggregates"]["user_stats"] == {"paei_scores": {"P": 1}}
+    stored = db.get_xp_progress(user_id)
+    assert (stored["total_xp"], stored["level"], stored["paei_scores"]) == (120, 2, {"P": 1})
+    assert [task["task_number"] for task in db.get_task_history(user_id)] == [1]
+    assert [chat["client_log_id"] for chat in db.get_chat_history(user_id)] == ["log-1"]
+    assert db.get_rollups(user_id, bucket="day", count=1)[0]["calls"] == 1
+
+def test_failed_unit_of_work_rolls_back(db):
+    user_id = db.get_or_create_user("session-1")
+    db.log_chat(user_id, "hi", "hello", "general", client_log_id="log-1")
+
+    # The duplicate client_log_id fails the commit after the XP was added
+    result = db.unit_of_work(user_id).add_xp(50, "simple").log_chat("hi", "hello", "general", client_log_id="log-1").commit()
+
+    assert result["ids"]["task_history"] == []
+    assert db.get_xp_progress(user_id)["total_xp"] == 0
+    assert db.get_task_history(user_id) == []
+
+def test_clear_user_data_deletes_every_row(db):
+    user_id = db.get_or_create_user("session-1")
+    other_id = db.get_or_create_user("session-2")
+    for owner in (user_id, other_id):
+        db.unit_of_work(owner).add_xp(10, "simple").log_chat("hi", "hello", "general") \
+            .update_agent_metrics("general", 10).update_rollups("general", 10).commit()
+
+    result = db.clear_user_data(user_id)
+
+    assert result["complete"] and result["failures"] == {}
+    assert result["deleted"]["users"] == 1 and result["deleted"]["chat_logs"] == 1
+    assert db.get_chat_history(user_id) == [] and db.get_agent_metrics(user_id) == []
+    assert len(db.get_chat_history(other_id)) == 1
+
+def test_sweep_orphans_removes_rows_without_a_user(db):
+    user_id = db.get_or_create_user("session-1")
+    db.update_agent_metrics("deleted-user", "general", 10)
+    db.update_agent_metrics(user_id, "general", 10)
+
+    assert db.sweep_orphans() == {"resumed": 0, "purged": 1, "failed": 0}
+    assert len(db.get_agent_metrics(user_id)) == 1
+
+def test_reads_do_not_wait_for_an_open_write(db):
+    user_id = db.get_or_create_user("session-1")
+    writing = threading.Event()
+    release = threading.Event()
+
+    def hold_write_transaction():
+        with db._transaction() as cursor:
+            db._execute(cursor, "UPDATE xp_progress SET total_xp = 99 WHERE user_id = ?", (user_id,))
+            writing.set()
+            release.wait(timeout=10)
+
+    writer = threading.Thread(target=hold_write_transaction)
+    writer.start()
+    try:
+        assert writing.wait(timeout=10)
+        reads = []
+        reader = threading.Thread(target=lambda: reads.append(db.get_xp_progress(user_id)))
+        reader.start()
+        reader.join(timeout=2)
+        # The read finished while the write was still open, and saw the last commit
+        assert not reader.is_alive()
+        assert reads[0]["total_xp"] == 0
+    finally:
+        release.set()
+        writer.join()
+    assert db.get_xp_progress(user_id)["total_xp"] == 99
@@ -0,0 +1,115 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from agents import model_registry
+from agents.generation import _cache_key
+from agents.parent_agent import ParentAgent
+from agents.shared_resources import SharedResources
+from benchmarks.fakes import FakeGenerativeModel, FakeResponse, _AsyncChunks
+from response_cache import ResponseCache
+
+FOOTER_SEPARATOR = "\n\n---\n"
+REQUEST = "send an email to the team about the release"
+
+class OfflineResources(SharedResources):
+    """SharedResources without the google.generativeai settings objects."""
+    @property
+    def safety_settings(self):
+        return {}
+
+    @property
+    def json_generation_config(self):
+        return {"response_mime_type": "application/json"}
+
+class BlockedModel(FakeGenerativeModel):
+    """Streams one chunk with no text whose prompt was blocked for safety."""
+    async def generate_content_async(self, prompt, generation_config=None, safety_settings=None, stream=False):
+        if generation_config is not None or not stream:
+            return await super().generate_content_async(prompt, generation_config, safety_settings, stream)
+        chunk = FakeResponse("")
+        chunk.prompt_feedback = SimpleNamespace(block_reason=SimpleNamespace(name="SAFETY"))
+        return _AsyncChunks([chunk], [0])
+
+class FailingModel(FakeGenerativeModel):
+    """Routes requests but fails every answer."""
+    async def generate_content_async(self, prompt, generation_config=None, safety_settings=None, stream=False):
+        if generation_config is not None:
+            return await super().generate_content_async(prompt, generation_config, safety_settings, stream)
+        raise RuntimeError("quota exceeded")
+
+@pytest.fixture
+def make_agent(tmp_path):
+    def make(model_class=FakeGenerativeModel):
+        model_registry.set_model_factory(
+            lambda model_name, system_instruction=None: model_class(
+                model_name, system_instruction=system_instruction, latency=0.002, ttft=0.001, chunk_chars=100
+            )
+        )
+        resources = OfflineResources(
+            response_cache=ResponseCache(path=str(tmp_path / "responses.sqlite3")),
+            intent_model_path=str(tmp_path / "no_intent_model.json")
+        )
+        return ParentAgent(resources=resources, write_behind=False)
+    yield make
+    model_registry.set_model_factory(None)
+
+def _stream(agent, user_input):
+    async def collect():
+        return [chunk async for chunk in agent.stream_request_async(user_input)]
+    return asyncio.run(collect())
+
+def _cached(agent, user_input):
+    email_agent = agent.email_agent
+    key = _cache_key(email_agent.model, "email", email_agent._build_prompt(user_input), agent.safety_settings)
+    return agent.response_cache.get(key)[0]
+
+def test_footer_follows_the_streamed_answer(make_agent):
+    agent = make_agent()
+
+    chunks = _stream(agent, REQUEST)
+
+    assert chunks[0] == "📧 **Email Agent:**\n\n"
+    answer = "".join(chunks[1:-1])
+    assert len(chunks) > 3 and FOOTER_SEPARATOR not in answer
+    assert chunks[-1].startswith(FOOTER_SEPARATOR) and "XP Earned" in chunks[-1]
+    assert _cached(agent, REQUEST)["text"] == answer
+
+def test_stream_metadata_records_time_to_first_chunk(make_agent):
+    agent = make_agent()
+
+    _stream(agent, REQUEST)
+    metadata = agent.get_last_response_metadata()
+
+    assert metadata["agent"] == "email" and metadata["cache_hit"] is False
+    assert 0 < metadata["ttft_ms"] <= metadata["latency_ms"]
+    # Measured from the start of the request, so it includes routing
+    assert metadata["first_chunk_ms"] > 0
+
+    _stream(agent, REQUEST)
+    cached = agent.get_last_response_metadata()
+    assert cached["cache_hit"] is True and cached["ttft_ms"] == 0
+
+def test_blocked_stream_reports_an_error_and_is_not_cached(make_agent):
+    agent = make_agent(BlockedModel)
+
+    chunks = _stream(agent, REQUEST)
+
+    assert chunks[0].startswith("❌ Error in Email Agent: The model returned no usable answer (SAFETY)")
+    assert chunks[-1].startswith(FOOTER_SEPARATOR) and len(chunks) == 2
+    assert agent.get_last_response_metadata()["blocked"] == "SAFETY"
+    assert _cached(agent, REQUEST) is None
+
+def test_failed_stream_reports_an_error_and_is_not_cached(make_agent):
+    agent = make_agent(FailingModel)
+
+    chunks = _stream(agent, REQUEST)
+
+    assert chunks[0] == "❌ Error in Email Agent: quota exceeded"
+    assert chunks[-1].startswith(FOOTER_SEPARATOR) and len(chunks) == 2
+    assert _cached(agent, REQUEST) is None
@@ -0,0 +1,49 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import asyncio
+
+from agents.xp_agent import XPAgent
+
+class StoredProgress:
+    """Returns the same xp_progress record on every read."""
+    def __init__(self, total_xp, tasks_completed):
+        self.record = {"total_xp": total_xp, "level": 1, "tasks_completed": tasks_completed}
+        self.reads = 0
+
+    def get_xp_progress(self, user_id):
+        self.reads += 1
+        return dict(self.record)
+
+    async def get_xp_progress_async(self, user_id):
+        self.reads += 1
+        return dict(self.record)
+
+def test_async_stats_include_queued_xp():
+    db = StoredProgress(total_xp=40, tasks_completed=2)
+    agent = XPAgent(db=db, user_id="user-1")
+
+    reserved = agent.reserve_xp(75)
+    reads = db.reads
+
+    sync_stats = agent.get_stats()
+    async_stats = asyncio.run(agent.get_stats_async())
+
+    assert sync_stats == async_stats
+    assert async_stats["total_xp"] == 115 and async_stats["tasks_completed"] == 3
+    assert async_stats["level"] == reserved["level"]
+    # The overlay answers without reading the database
+    assert db.reads == reads
+
+def test_async_stats_read_and_confirm_once_settled():
+    db = StoredProgress(total_xp=40, tasks_completed=2)
+    agent = XPAgent(db=db, user_id="user-1")
+
+    agent.reserve_xp(10)
+    db.record.update(total_xp=50, tasks_completed=3)
+    agent.settle_xp(10)
+
+    stats = asyncio.run(agent.get_stats_async())
+    assert stats["total_xp"] == 50
+    assert agent.get_baseline() == {"total_xp": 50, "tasks_completed": 3}
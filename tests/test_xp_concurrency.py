@@ -0,0 +1,199 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import uuid
+import datetime
+import threading
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from google.cloud.firestore_v1 import _helpers, transforms
+
+import database
+
+WORKERS = 8
+
+class FakeSnapshot:
+    def __init__(self, reference, data):
+        self.reference = reference
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data) if self._data is not None else None
+
+class FakeRef:
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+
+    def collection(self, name):
+        return FakeCollection(self.client, f"{self.path}/{name}")
+
+    def get(self, transaction=None):
+        with self.client.lock:
+            self.client.reads += 1
+        return FakeSnapshot(self, self.client.read(self.path))
+
+    def set(self, fields, merge=False):
+        return self.client.commit_writes([(self.path, fields, merge)])[0]
+
+class FakeCollection:
+    def __init__(self, client, path):
+        self.client = client
+        self.path = path
+
+    def document(self, document_id=None):
+        return FakeRef(self.client, f"{self.path}/{document_id or uuid.uuid4().hex}")
+
+class FakeBatch:
+    def __init__(self, client):
+        self.client = client
+        self.writes = []
+
+    def set(self, ref, fields, merge=False):
+        self.writes.append((ref.path, fields, merge))
+
+    def commit(self):
+        return self.client.commit_writes(self.writes)
+
+class FakeFirestore:
+    """
+    In-memory Firestore client that applies Increment/Maximum transforms
+    atomically on commit and, like the server, returns their post-write
+    values as transform results in field-path order. With
+    transform_results=False it omits them, like some emulators. Counts
+    document reads and records every level write.
+    """
+    def __init__(self, transform_results=True):
+        self.docs = {}
+        self.lock = threading.RLock()
+        self.transform_results = transform_results
+        self.reads = 0
+        self.level_writes = []
+
+    def collection(self, name):
+        return FakeCollection(self, name)
+
+    def batch(self):
+        return FakeBatch(self)
+
+    def get_all(self, refs, transaction=None):
+        raise AssertionError("the unit of work read documents before writing")
+
+    def read(self, path):
+        with self.lock:
+            data = self.docs.get(path)
+            return dict(data) if data is not None else None
+
+    def write(self, path, fields, merge):
+        with self.lock:
+            current = dict(self.docs.get(path) or {}) if merge else {}
+            self.docs[path] = _merge(current, fields)
+
+    def commit_writes(self, writes):
+        results = []
+        with self.lock:
+            for path, fields, merge in writes:
+                self.write(path, fields, merge)
+                if path.startswith("xp_progress/") and "level" in fields:
+                    self.level_writes.append(fields["level"].value)
+                results.append(self._write_result(path, fields))
+        return results
+
+    def _write_result(self, path, fields):
+        if not self.transform_results:
+            return SimpleNamespace(transform_results=[])
+        stored = self.docs[path]
+        values = []
+        for field_path in _helpers.DocumentExtractor(fields).transform_paths:
+            value = stored
+            for part in field_path.parts:
+                value = value[part]
+            values.append(_helpers.encode_value(value))
+        return SimpleNamespace(transform_results=values)
+
+def _merge(current, fields):
+    for key, value in fields.items():
+        if isinstance(value, transforms.Increment):
+            current[key] = current.get(key, 0) + value.value
+        elif isinstance(value, transforms.Maximum):
+            current[key] = max(current.get(key, value.value), value.value)
+        elif value is transforms.SERVER_TIMESTAMP:
+            current[key] = datetime.datetime.now(datetime.timezone.utc)
+        elif isinstance(value, dict):
+            current[key] = _merge(dict(current.get(key) or {}), value)
+        else:
+            current[key] = value
+    return current
+
+@pytest.fixture
+def make_db(monkeypatch):
+    def make(transform_results=True):
+        client = FakeFirestore(transform_results)
+        monkeypatch.setattr(database.firebase_admin, "_apps", {"[DEFAULT]": object()})
+        monkeypatch.setattr(database.firestore, "client", lambda: client)
+        db = database.Database({})
+        assert db.available
+        return db, client
+    return make
+
+def _level_for_xp(total_xp):
+    return total_xp // 100 + 1
+
+def test_concurrent_unit_of_work_commits_keep_every_increment(make_db):
+    db, client = make_db()
+    start = threading.Barrier(WORKERS)
+
+    def handle_request(_):
+        unit_of_work = db.unit_of_work("user-1").add_xp(30, "general", level_for_xp=_level_for_xp)
+        start.wait(timeout=10)
+        return unit_of_work.commit()
+
+    with ThreadPoolExecutor(max_workers=WORKERS) as pool:
+        results = list(pool.map(handle_request, range(WORKERS)))
+
+    stored = client.docs["xp_progress/user-1"]
+    assert stored["total_xp"] == 30 * WORKERS
+    assert stored["tasks_completed"] == WORKERS
+    assert stored["level"] == _level_for_xp(stored["total_xp"])
+    assert client.reads == 0
+    # Each commit got its own post-increment totals back
+    totals = sorted(result["aggregates"]["xp_progress"]["total_xp"] for result in results)
+    assert totals == [30 * (index + 1) for index in range(WORKERS)]
+    assert all(len(result["ids"]["task_history"]) == 1 for result in results)
+
+def test_level_is_written_only_when_a_threshold_is_crossed(make_db):
+    db, client = make_db()
+    client.write("xp_progress/user-1", {"total_xp": 90, "tasks_completed": 3, "level": 1}, merge=False)
+
+    result = (
+        db.unit_of_work("user-1")
+        .add_xp(20, "general", level_for_xp=_level_for_xp, task_number=4)
+        .increment_user_stats({"paei_scores": {"A": 1}})
+        .update_agent_metrics("general", 20)
+        .commit()
+    )
+    db.unit_of_work("user-1").add_xp(10, "general", level_for_xp=_level_for_xp, task_number=5).commit()
+
+    assert result["aggregates"]["xp_progress"] == {"total_xp": 110, "level": 2, "tasks_completed": 4}
+    assert result["aggregates"]["user_stats"] == {"paei_scores": {"A": 1}}
+    assert result["aggregates"]["agent_metrics"] == {"general": {"call_count": 1, "total_xp_generated": 20}}
+    assert client.level_writes == [2]
+    stored = client.docs["xp_progress/user-1"]
+    assert (stored["total_xp"], stored["tasks_completed"], stored["level"]) == (120, 5, 2)
+    [task_id] = result["ids"]["task_history"]
+    assert client.docs[f"users/user-1/task_history/{task_id}"]["task_number"] == 4
+    assert client.reads == 0
+
+def test_counters_are_read_back_without_transform_results(make_db):
+    db, client = make_db(transform_results=False)
+
+    result = db.unit_of_work("user-1").add_xp(150, "general", level_for_xp=_level_for_xp).commit()
+
+    assert result["aggregates"]["xp_progress"] == {"total_xp": 150, "level": 2, "tasks_completed": 1}
+    assert client.docs["xp_progress/user-1"]["level"] == 2
+    assert client.reads == 1
@@ -0,0 +1,51 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import os
+import json
+import hashlib
+
+from cache import TieredCache
+
+DEFAULT_CACHE_PATH = os.path.join(".cache", "transcription_cache.sqlite3")
+
+class TranscriptionCache(TieredCache):
+    """
+    Whisper transcripts keyed by a hash of the recorded audio bytes, so a
+    recording that Streamlit hands back on every rerun is transcribed once.
+    An in-memory LRU, optionally backed by a SQLite file (path) so entries
+    survive restarts. Hits count the API calls, seconds of audio and
+    latency they avoided.
+    """
+    def __init__(self, path=None, memory_size=64, max_disk_entries=1000, ttl=7 * 24 * 3600):
+        super().__init__(path, "transcriptions", memory_size=memory_size, max_disk_entries=max_disk_entries, ttl=ttl)
+        self.ttl = ttl
+        self.saved_calls = 0
+        self.saved_audio_seconds = 0.0
+        self.saved_latency_ms = 0.0
+
+    @staticmethod
+    def make_key(audio_bytes, model="whisper-1", options=None):
+        """Hashes the audio content plus everything else that shapes the transcript."""
+        digest = hashlib.sha256(audio_bytes)
+        digest.update(json.dumps([model, sorted((options or {}).items())], default=str).encode("utf-8"))
+        return digest.hexdigest()
+
+    def _record_hit(self, entry):
+        with self._lock:
+            self.saved_calls += 1
+            self.saved_audio_seconds += entry.get("audio_seconds") or 0
+            self.saved_latency_ms += entry.get("latency_ms", 0)
+
+    def set(self, key, text, audio_seconds=None, latency_ms=0):
+        super().set(key, {"text": text, "audio_seconds": audio_seconds, "latency_ms": latency_ms})
+
+    def get_stats(self):
+        stats = super().get_stats()
+        stats.update({
+            "saved_calls": self.saved_calls,
+            "saved_audio_seconds": round(self.saved_audio_seconds, 1),
+            "saved_latency_ms": round(self.saved_latency_ms, 1)
+        })
+        return stats
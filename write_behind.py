@@ -0,0 +1,119 @@
+# Developed by Shreyash Chougule
+# Email: shreyash.v.chougule1903@gmail.com
+# Project: Multi-Agent AI System (MVP)
+
+import time
+import queue
+import atexit
+import threading
+
+class WriteBehindQueue:
+    """
+    Runs persistence jobs on a background thread so requests can return
+    before their database writes finish.
+    The queue is bounded: when it stays full for `put_timeout` seconds, the
+    job runs inline in the caller instead, which slows producers down to the
+    speed of the database (backpressure) rather than dropping writes.
+    Pending jobs are flushed when the process exits.
+    """
+    def __init__(self, maxsize=100, put_timeout=0.5, name="write-behind"):
+        self.put_timeout = put_timeout
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._closed = False
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.ran_inline = 0
+        self.max_depth = 0
+
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        Enqueues fn(*args, **kwargs). Returns True if it was queued, False
+        if it had to run inline because the queue was full or closed.
+        """
+        with self._lock:
+            self.submitted += 1
+
+        if not self._closed:
+            try:
+                self._queue.put((fn, args, kwargs), timeout=self.put_timeout)
+                with self._lock:
+                    self.max_depth = max(self.max_depth, self._queue.qsize())
+                return True
+            except queue.Full:
+                pass
+
+        with self._lock:
+            self.ran_inline += 1
+        self._execute(fn, args, kwargs)
+        return False
+
+    def _execute(self, fn, args, kwargs):
+        try:
+            fn(*args, **kwargs)
+            with self._lock:
+                self.completed += 1
+        except Exception as e:
+            with self._lock:
+                self.failed += 1
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is None:
+                    return
+                self._execute(*job)
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout=None):
+        """
+        Blocks until every queued job has run. Returns False on timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self, timeout=10):
+        """Flushes pending jobs and stops the worker thread."""
+        if self._closed:
+            return
+        self._closed = True
+        self.flush(timeout)
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                "depth": self._queue.qsize(),
+                "max_depth": self.max_depth,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "ran_inline": self.ran_inline
+            }
+
+
+_shared_queue = None
+_shared_lock = threading.Lock()
+
+def get_shared_queue():
+    """Returns the process-wide write-behind queue, creating it on first use."""
+    global _shared_queue
+    with _shared_lock:
+        if _shared_queue is None:
+            _shared_queue = WriteBehindQueue()
+        return _shared_queue